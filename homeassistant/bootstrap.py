@@ -19,13 +19,19 @@ from homeassistant import config as conf_util, config_entries, core, loader
 from homeassistant.components import http
 from homeassistant.const import REQUIRED_NEXT_PYTHON_DATE, REQUIRED_NEXT_PYTHON_VER
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import area_registry, device_registry, entity_registry
+from homeassistant.helpers import (
+    area_registry,
+    device_registry,
+    entity_registry,
+    template,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
     DATA_SETUP,
     DATA_SETUP_STARTED,
     DATA_SETUP_TIME,
+    async_get_startup_timeline,
     async_set_domains_to_be_loaded,
     async_setup_component,
 )
@@ -436,12 +442,38 @@ async def async_setup_multi_components(
         )
 
 
+async def _async_preimport_integrations(
+    hass: core.HomeAssistant,
+    integration_cache: dict[str, loader.Integration],
+    domains: set[str],
+) -> None:
+    """Import the built-in integrations in parallel in the executor.
+
+    Failing imports are ignored here, the requirements of the integration
+    may not be installed yet. The import is retried and the error reported
+    when the integration is set up. Custom integrations are imported when
+    they are set up.
+    """
+    integrations = [
+        integration_cache[domain]
+        for domain in domains
+        if domain in integration_cache and integration_cache[domain].is_built_in
+    ]
+    results = await asyncio.gather(
+        *(integration.async_get_component() for integration in integrations),
+        return_exceptions=True,
+    )
+    for integration, result in zip(integrations, results):
+        if isinstance(result, BaseException):
+            _LOGGER.debug("Unable to preimport %s: %s", integration.domain, result)
+
+
 async def _async_set_up_integrations(
     hass: core.HomeAssistant, config: dict[str, Any]
 ) -> None:
     """Set up all the integrations."""
     hass.data[DATA_SETUP_STARTED] = {}
-    setup_time = hass.data[DATA_SETUP_TIME] = {}
+    hass.data[DATA_SETUP_TIME] = {}
 
     watch_task = asyncio.create_task(_async_watch_pending_setups(hass))
 
@@ -527,11 +559,16 @@ async def _async_set_up_integrations(
 
     stage_2_domains = domains_to_setup - logging_domains - debuggers - stage_1_domains
 
-    # Load the registries
+    # Load the registries and the code of the templates compiled before,
+    # meanwhile import the integrations in the executor
     await asyncio.gather(
         device_registry.async_load(hass),
         entity_registry.async_load(hass),
         area_registry.async_load(hass),
+        template.async_load_code_cache(hass),
+        _async_preimport_integrations(
+            hass, integration_cache, stage_1_domains | stage_2_domains
+        ),
     )
 
     # Start setup
@@ -561,15 +598,15 @@ async def _async_set_up_integrations(
     watch_task.cancel()
     async_dispatcher_send(hass, SIGNAL_BOOTSTRAP_INTEGRATONS, {})
 
-    _LOGGER.debug(
-        "Integration setup times: %s",
-        {
-            integration: timedelta.total_seconds()
-            for integration, timedelta in sorted(
-                setup_time.items(), key=lambda item: item[1].total_seconds()  # type: ignore
-            )
-        },
-    )
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        # The slowest integrations are reported by system health
+        _LOGGER.debug(
+            "Integration startup timeline (import/setup seconds): %s",
+            ", ".join(
+                f"{integration} {times['import']:.2f}/{times['setup']:.2f}"
+                for integration, times in async_get_startup_timeline(hass).items()
+            ),
+        )
 
     # Wrap up startup
     _LOGGER.debug("Waiting for startup to wrap up")
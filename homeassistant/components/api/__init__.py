@@ -39,6 +39,7 @@ from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.network import NoURLAvailableError, get_url
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.system_info import async_get_system_info
+from homeassistant.util.json import json_dumps
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -120,7 +121,7 @@ class APIEventStream(HomeAssistantView):
             if event.event_type == EVENT_HOMEASSISTANT_STOP:
                 data = stop_obj
             else:
-                data = json.dumps(event, cls=JSONEncoder)
+                data = json_dumps(event, encoder=JSONEncoder)
 
             await to_write.put(data)
 
@@ -225,7 +226,11 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            return self.json_raw(f"[{','.join(state.as_json() for state in states)}]")
+        except (ValueError, TypeError):
+            # Let the regular encoder log the bad data
+            return self.json(states)
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -242,9 +247,12 @@ class APIEntityStateView(HomeAssistantView):
             raise Unauthorized(entity_id=entity_id)
 
         state = request.app["hass"].states.get(entity_id)
-        if state:
+        if not state:
+            return self.json_message("Entity not found.", HTTP_NOT_FOUND)
+        try:
+            return self.json_raw(state.as_json())
+        except (ValueError, TypeError):
             return self.json(state)
-        return self.json_message("Entity not found.", HTTP_NOT_FOUND)
 
     async def post(self, request, entity_id):
         """Update state of entity."""
@@ -204,6 +204,19 @@ class DSMREntity(SensorEntity):
 
     entity_description: DSMRSensorEntityDescription
     _attr_should_poll = False
+    # Telegrams arrive every few seconds. All properties but the unit come from
+    # the entity description, the unit is read from the telegram.
+    _static_properties = frozenset(
+        {
+            "assumed_state",
+            "capability_attributes",
+            "device_class",
+            "entity_picture",
+            "icon",
+            "name",
+            "supported_features",
+        }
+    )
 
     def __init__(
         self, entity_description: DSMRSensorEntityDescription, entry: ConfigEntry
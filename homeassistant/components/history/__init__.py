@@ -3,9 +3,10 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import datetime as dt, timedelta
+from functools import lru_cache, partial
 import logging
+import re
 import time
-from typing import cast
 
 from aiohttp import web
 from sqlalchemy import not_, or_
@@ -26,7 +27,7 @@ from homeassistant.const import (
     CONF_INCLUDE,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, split_entity_id
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.deprecation import deprecated_class, deprecated_function
 from homeassistant.helpers.entityfilter import (
@@ -35,6 +36,8 @@ from homeassistant.helpers.entityfilter import (
 )
 import homeassistant.util.dt as dt_util
 
+from .downsample import MIN_POINTS, downsample_states
+
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
 _LOGGER = logging.getLogger(__name__)
@@ -47,6 +50,14 @@ GLOB_TO_SQL_CHARS = {
     46: "_",  # .
 }
 
+# The wildcards of the LIKE pattern built from a glob
+GLOB_TO_RE_CHARS = {
+    "*": ".*",
+    "%": ".*",
+    ".": ".",
+    "_": ".",
+}
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
@@ -124,6 +135,7 @@ class LazyState(history_models.LazyState):
         vol.Required("start_time"): str,
         vol.Optional("end_time"): str,
         vol.Optional("statistic_ids"): [str],
+        vol.Optional("period", default="hourly"): vol.Any("5minute", "hourly"),
     }
 )
 @websocket_api.async_response
@@ -157,6 +169,7 @@ async def ws_get_statistics_during_period(
         start_time,
         end_time,
         msg.get("statistic_ids"),
+        msg.get("period"),
     )
     connection.send_result(msg["id"], statistics)
 
@@ -194,7 +207,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: str | None = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
         datetime_ = None
         if datetime:
@@ -234,6 +247,13 @@ class HistoryPeriodView(HomeAssistantView):
 
         minimal_response = "minimal_response" in request.query
 
+        # Downsample the numeric entities to about max_points states each
+        max_points = None
+        if (max_points_str := request.query.get("max_points")) is not None:
+            if not max_points_str.isdigit() or int(max_points_str) < MIN_POINTS:
+                return self.json_message("Invalid max_points", HTTP_BAD_REQUEST)
+            max_points = int(max_points_str)
+
         hass = request.app["hass"]
 
         if (
@@ -243,10 +263,10 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
-        return cast(
-            web.Response,
-            await hass.async_add_executor_job(
-                self._sorted_significant_states_json,
+        return await self.json_stream(
+            request,
+            partial(
+                self._iter_sorted_significant_states,
                 hass,
                 start_time,
                 end_time,
@@ -254,10 +274,11 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
             ),
         )
 
-    def _sorted_significant_states_json(
+    def _iter_sorted_significant_states(
         self,
         hass,
         start_time,
@@ -266,44 +287,60 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        max_points,
     ):
-        """Fetch significant stats from the database as json."""
+        """Fetch significant stats from the database and yield them per entity.
+
+        The states of each entity are read from the query while they are
+        sent, unless the included entities have to come first in their
+        configured order.
+        """
         timer_start = time.perf_counter()
+        state_count = 0
 
         with session_scope(hass=hass) as session:
-            result = (
-                history._get_significant_states(  # pylint: disable=protected-access
-                    hass,
-                    session,
-                    start_time,
-                    end_time,
-                    entity_ids,
-                    self.filters,
-                    include_start_time_state,
-                    significant_changes_only,
-                    minimal_response,
-                )
+            result = history.iter_significant_states(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
             )
 
-        result = list(result.values())
-        if _LOGGER.isEnabledFor(logging.DEBUG):
-            elapsed = time.perf_counter() - timer_start
-            _LOGGER.debug("Extracted %d states in %fs", sum(map(len, result)), elapsed)
+            # Optionally reorder the result to respect the ordering given
+            # by any entities explicitly included in the configuration.
+            if self.filters and self.use_include_order:
+                result = self._include_ordered(list(result))
 
-        # Optionally reorder the result to respect the ordering given
-        # by any entities explicitly included in the configuration.
-        if self.filters and self.use_include_order:
-            sorted_result = []
-            for order_entity in self.filters.included_entities:
-                for state_list in result:
-                    if state_list[0].entity_id == order_entity:
-                        sorted_result.append(state_list)
-                        result.remove(state_list)
-                        break
-            sorted_result.extend(result)
-            result = sorted_result
+            for state_list in result:
+                state_count += len(state_list)
+                if max_points is None:
+                    yield state_list
+                else:
+                    yield downsample_states(state_list, max_points)
 
-        return self.json(result)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Extracted %d states in %fs", state_count, elapsed)
+
+    def _include_ordered(self, result):
+        """Return the state lists with the included entities first in order."""
+        sorted_result = []
+        for order_entity in self.filters.included_entities:
+            for state_list in result:
+                if state_list[0].entity_id == order_entity:
+                    sorted_result.append(state_list)
+                    result.remove(state_list)
+                    break
+        sorted_result.extend(result)
+        # Drop the states of each entity once they are sent
+        sorted_result.reverse()
+        while sorted_result:
+            yield sorted_result.pop()
 
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
@@ -397,12 +434,48 @@ class Filters:
 
         return or_(*includes) & not_(or_(*excludes))
 
+    def entity_matches(self, entity_id):
+        """Check if an entity id passes the filter, the same way entity_filter does."""
+        domain = split_entity_id(entity_id)[0]
+        included = (
+            domain in self.included_domains
+            or entity_id in self.included_entities
+            or any(
+                _glob_to_re(glob).fullmatch(entity_id)
+                for glob in self.included_entity_globs
+            )
+        )
+        excluded = (
+            domain in self.excluded_domains
+            or entity_id in self.excluded_entities
+            or any(
+                _glob_to_re(glob).fullmatch(entity_id)
+                for glob in self.excluded_entity_globs
+            )
+        )
+        has_includes = (
+            self.included_domains
+            or self.included_entities
+            or self.included_entity_globs
+        )
+        return (included or not has_includes) and not excluded
+
 
 def _glob_to_like(glob_str):
     """Translate glob to sql."""
     return history_models.States.entity_id.like(glob_str.translate(GLOB_TO_SQL_CHARS))
 
 
+@lru_cache(maxsize=None)
+def _glob_to_re(glob_str):
+    """Translate glob to a regex matching the same entity ids as _glob_to_like."""
+    return re.compile(
+        "".join(
+            GLOB_TO_RE_CHARS.get(char) or re.escape(char) for char in glob_str.lower()
+        )
+    )
+
+
 def _entities_may_have_state_changes_after(
     hass: HomeAssistant, entity_ids: Iterable, start_time: dt
 ) -> bool:
@@ -0,0 +1,134 @@
+"""Downsample the numeric history of entities for graphs."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.recorder.history import LAST_CHANGED_KEY, STATE_KEY
+from homeassistant.components.recorder.models import LazyState
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+
+# Fewer points than this can not keep the first and the last point
+# of a series and still select anything in-between
+MIN_POINTS = 3
+
+
+def downsample_states(
+    states: list[LazyState | dict[str, Any]], max_points: int
+) -> list[LazyState | dict[str, Any]]:
+    """Reduce the states of a numeric entity to about max_points.
+
+    Only entities with a unit of measurement are drawn as a line graph,
+    the states of other entities are returned unchanged. States that are
+    not numbers, like unavailable, are always kept since they are gaps in
+    the graph. The numeric runs between them share the remaining points
+    and are downsampled with largest-triangle-three-buckets, which keeps
+    the peaks that a plain average or stride would lose.
+    """
+    if len(states) <= max_points or not _is_graphed(states[0]):
+        return states
+
+    runs: list[tuple[int, list[float], list[float]]] = []
+    times: list[float] = []
+    values: list[float] = []
+    gaps: list[int] = []
+    for idx, state in enumerate(states):
+        if (value := _numeric_value(state)) is None:
+            gaps.append(idx)
+            if values:
+                runs.append((idx - len(values), times, values))
+                times, values = [], []
+            continue
+        times.append(_timestamp(state))
+        values.append(value)
+    if values:
+        runs.append((len(states) - len(values), times, values))
+
+    num_numeric = len(states) - len(gaps)
+    points_left = max(max_points - len(gaps), 0)
+    keep = list(gaps)
+    for offset, run_times, run_values in runs:
+        threshold = max(points_left * len(run_values) // num_numeric, 2)
+        keep.extend(
+            offset + idx for idx in lttb_indices(run_times, run_values, threshold)
+        )
+    keep.sort()
+    return [states[idx] for idx in keep]
+
+
+def lttb_indices(
+    times: Sequence[float], values: Sequence[float], threshold: int
+) -> list[int]:
+    """Return the indices of the points selected by largest-triangle-three-buckets.
+
+    The first and the last point are always selected. The points
+    in-between are split in threshold - 2 buckets and from each bucket
+    the point forming the largest triangle with the previous selected
+    point and the average of the next bucket is selected.
+    """
+    length = len(values)
+    if threshold >= length:
+        return list(range(length))
+    if threshold < MIN_POINTS:
+        return [0, length - 1]
+
+    bucket_size = (length - 2) / (threshold - 2)
+    selected = [0]
+    prev = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # The average of the next bucket, for the last bucket that is the last point
+        next_end = min(int((bucket + 2) * bucket_size) + 1, length)
+        next_start = min(end, next_end - 1)
+        num_next = next_end - next_start
+        avg_time = sum(times[next_start:next_end]) / num_next
+        avg_value = sum(values[next_start:next_end]) / num_next
+
+        prev_time = times[prev]
+        prev_value = values[prev]
+        max_area = -1.0
+        max_idx = start
+        for idx in range(start, end):
+            # Twice the area of the triangle, only used for comparing
+            area = abs(
+                (prev_time - avg_time) * (values[idx] - prev_value)
+                - (prev_time - times[idx]) * (avg_value - prev_value)
+            )
+            if area > max_area:
+                max_area = area
+                max_idx = idx
+        selected.append(max_idx)
+        prev = max_idx
+
+    selected.append(length - 1)
+    return selected
+
+
+def _is_graphed(state: LazyState | dict[str, Any]) -> bool:
+    """Return if the entity of the state is drawn as a line graph."""
+    return isinstance(state, LazyState) and ATTR_UNIT_OF_MEASUREMENT in (
+        state.attributes
+    )
+
+
+def _numeric_value(state: LazyState | dict[str, Any]) -> float | None:
+    """Return the state as a number or None if it is not a number."""
+    value = state[STATE_KEY] if isinstance(state, dict) else state.state
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    # NaN and infinity can not be drawn and do not compare
+    if number - number != 0:
+        return None
+    return number
+
+
+def _timestamp(state: LazyState | dict[str, Any]) -> float:
+    """Return the time the state changed as a timestamp."""
+    if isinstance(state, dict):
+        return datetime.fromisoformat(state[LAST_CHANGED_KEY]).timestamp()
+    return state.last_changed.timestamp()
@@ -2,6 +2,10 @@
 from homeassistant.components import system_health
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import system_info
+from homeassistant.setup import async_get_startup_timeline
+
+# Number of the slowest integrations to start listed
+SLOWEST_INTEGRATIONS = 5
 
 
 @callback
@@ -15,6 +19,7 @@ def async_register(
 async def system_health_info(hass):
     """Get info for the info page."""
     info = await system_info.async_get_system_info(hass)
+    timeline = async_get_startup_timeline(hass)
 
     return {
         "version": f"core-{info.get('version')}",
@@ -29,4 +34,14 @@ async def system_health_info(hass):
         "os_version": info.get("os_version"),
         "arch": info.get("arch"),
         "timezone": info.get("timezone"),
+        "startup_import_time": round(
+            sum(times["import"] for times in timeline.values()), 2
+        ),
+        "startup_setup_time": round(
+            sum(times["setup"] for times in timeline.values()), 2
+        ),
+        "slowest_integrations": ", ".join(
+            f"{integration} ({times['import']:.2f}s import, {times['setup']:.2f}s setup)"
+            for integration, times in list(timeline.items())[:SLOWEST_INTEGRATIONS]
+        ),
     }
@@ -7,7 +7,14 @@ import voluptuous as vol
 
 from homeassistant.components.automation import AutomationActionType
 from homeassistant.const import CONF_EVENT_DATA, CONF_PLATFORM
-from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventDataFilter,
+    HassJob,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.helpers import config_validation as cv, template
 from homeassistant.helpers.typing import ConfigType
 
@@ -52,6 +59,7 @@ async def async_attach_trigger(
     removes = []
 
     event_data_schema = None
+    event_filter = None
     if CONF_EVENT_DATA in config:
         # Render the schema input
         template.attach(hass, config[CONF_EVENT_DATA])
@@ -64,6 +72,12 @@ async def async_attach_trigger(
             {vol.Required(key): value for key, value in event_data.items()},
             extra=vol.ALLOW_EXTRA,
         )
+        # Let the event bus skip most events that do not match, like the
+        # events of other devices, the schema still checks all the data
+        for key, value in event_data.items():
+            if isinstance(value, str):
+                event_filter = EventDataFilter(key, value)
+                break
 
     event_context_schema = None
     if CONF_EVENT_CONTEXT in config:
@@ -112,7 +126,8 @@ async def async_attach_trigger(
         )
 
     removes = [
-        hass.bus.async_listen(event_type, handle_event) for event_type in event_types
+        hass.bus.async_listen(event_type, handle_event, event_filter=event_filter)
+        for event_type in event_types
     ]
 
     @callback
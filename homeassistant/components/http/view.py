@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable
-import json
+from collections.abc import Awaitable, Callable, Iterable
 import logging
+import threading
 from typing import Any
 
 from aiohttp import web
@@ -20,12 +20,18 @@ import voluptuous as vol
 from homeassistant import exceptions
 from homeassistant.const import CONTENT_TYPE_JSON, HTTP_OK, HTTP_SERVICE_UNAVAILABLE
 from homeassistant.core import Context, is_callback
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 from .const import KEY_AUTHENTICATED, KEY_HASS
 
 _LOGGER = logging.getLogger(__name__)
 
+# Size in bytes of the chunks a streamed JSON response is written in
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+# Number of encoded chunks that can wait to be written
+# before the executor job producing them is paused
+JSON_STREAM_MAX_CHUNKS = 4
+
 
 class HomeAssistantView:
     """Base view for all views."""
@@ -53,12 +59,21 @@ class HomeAssistantView:
     ) -> web.Response:
         """Return a JSON response."""
         try:
-            msg = json.dumps(result, cls=JSONEncoder, allow_nan=False).encode("UTF-8")
+            msg = json_dumps(result)
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
             raise HTTPInternalServerError from err
+        return HomeAssistantView.json_raw(msg, status_code, headers)
+
+    @staticmethod
+    def json_raw(
+        msg: str,
+        status_code: int = HTTP_OK,
+        headers: LooseHeaders | None = None,
+    ) -> web.Response:
+        """Return a response with an already serialized JSON body."""
         response = web.Response(
-            body=msg,
+            body=msg.encode("UTF-8"),
             content_type=CONTENT_TYPE_JSON,
             status=status_code,
             headers=headers,
@@ -66,6 +81,81 @@ class HomeAssistantView:
         response.enable_compression()
         return response
 
+    @staticmethod
+    async def json_stream(
+        request: web.Request,
+        iter_items: Callable[[], Iterable[Any]],
+        status_code: int = HTTP_OK,
+    ) -> web.StreamResponse:
+        """Return a JSON array response that is streamed as it is generated.
+
+        iter_items is called in the executor and may do blocking I/O. The
+        items it yields are encoded there and written in chunks, so only a
+        few chunks are held in memory instead of the whole response.
+        """
+        hass = request.app[KEY_HASS]
+        chunks: asyncio.Queue[bytes | None] = asyncio.Queue(JSON_STREAM_MAX_CHUNKS)
+        cancelled = threading.Event()
+
+        def put_chunk(chunk: bytes | None) -> None:
+            """Wait for room in the queue and put a chunk in it."""
+            if not cancelled.is_set():
+                asyncio.run_coroutine_threadsafe(chunks.put(chunk), hass.loop).result()
+
+        def encode_items() -> None:
+            """Encode the items in chunks."""
+            try:
+                parts = ["["]
+                size = 1
+                separator = ""
+                for item in iter_items():
+                    part = separator + json_dumps(item)
+                    separator = ","
+                    parts.append(part)
+                    size += len(part)
+                    if size >= JSON_STREAM_CHUNK_SIZE:
+                        put_chunk("".join(parts).encode("UTF-8"))
+                        if cancelled.is_set():
+                            return
+                        parts = []
+                        size = 0
+                parts.append("]")
+                put_chunk("".join(parts).encode("UTF-8"))
+            finally:
+                put_chunk(None)
+
+        producer = hass.async_add_executor_job(encode_items)
+        response = web.StreamResponse(status=status_code)
+        response.content_type = CONTENT_TYPE_JSON
+        response.enable_compression()
+        try:
+            while (chunk := await chunks.get()) is not None:
+                if not response.prepared:
+                    await response.prepare(request)
+                await response.write(chunk)
+            await producer
+        except Exception as err:  # pylint: disable=broad-except
+            if not response.prepared:
+                if not isinstance(err, (ValueError, TypeError)):
+                    raise
+                _LOGGER.error("Unable to serialize to JSON: %s", err)
+                raise HTTPInternalServerError from err
+            # The status was already sent, the client can
+            # only find out from the connection being closed
+            _LOGGER.exception("Error while streaming %s", request.path)
+            if request.transport is not None:
+                request.transport.close()
+            return response
+        finally:
+            if not producer.done():
+                # The client went away, let the producer finish
+                # without waiting for room in the queue
+                cancelled.set()
+                while not chunks.empty():
+                    chunks.get_nowait()
+        await response.write_eof()
+        return response
+
     def json_message(
         self,
         message: str,
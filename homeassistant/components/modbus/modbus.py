@@ -3,11 +3,16 @@ from __future__ import annotations
 
 import asyncio
 from collections import namedtuple
+from dataclasses import dataclass
+from itertools import groupby
 import logging
+from operator import attrgetter
+from timeit import default_timer as timer
 
 from pymodbus.client.sync import ModbusSerialClient, ModbusTcpClient, ModbusUdpClient
 from pymodbus.constants import Defaults
 from pymodbus.exceptions import ModbusException
+from pymodbus.pdu import ExceptionResponse
 from pymodbus.transaction import ModbusRtuFramer
 
 from homeassistant.const import (
@@ -59,9 +64,22 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Most registers and bits a single read request may return
+MAX_READ_REGISTERS = 125
+MAX_READ_BITS = 2000
+# Most unused addresses a block read may span to merge two reads
+MAX_READ_GAP = 8
+
+READ_CALL_TYPES = {
+    CALL_TYPE_COIL: MAX_READ_BITS,
+    CALL_TYPE_DISCRETE: MAX_READ_BITS,
+    CALL_TYPE_REGISTER_HOLDING: MAX_READ_REGISTERS,
+    CALL_TYPE_REGISTER_INPUT: MAX_READ_REGISTERS,
+}
 
 ConfEntry = namedtuple("ConfEntry", "call_type attr func_name")
 RunEntry = namedtuple("RunEntry", "attr func")
+ReadResult = namedtuple("ReadResult", "registers bits")
 PYMODBUS_CALL = [
     ConfEntry(
         CALL_TYPE_COIL,
@@ -184,8 +202,25 @@ async def async_modbus_setup(
     return True
 
 
+@dataclass
+class _ReadRequest:
+    """A read requested by an entity."""
+
+    unit: int
+    address: int
+    count: int
+    use_call: str
+    future: asyncio.Future
+
+
 class ModbusHub:
-    """Thread safe wrapper class for pymodbus."""
+    """Thread safe wrapper class for pymodbus.
+
+    Reads requested while the hub is busy, or in the same event loop
+    iteration, are planned together: reads of the same slave and
+    register type with nearby addresses are merged into block reads
+    and the values are handed out to the entities that requested them.
+    """
 
     name: str
 
@@ -202,6 +237,15 @@ class ModbusHub:
         self._config_type = client_config[CONF_TYPE]
         self._config_delay = client_config[CONF_DELAY]
         self._pb_call = {}
+        self._pending_reads: list[_ReadRequest] = []
+        self._read_task: asyncio.Task | None = None
+        # Slave and register types whose block reads failed while
+        # the single reads succeeded, they span invalid addresses
+        self._no_merge: set[tuple[int, str]] = set()
+        self._started = timer()
+        self._busy_time = 0.0
+        self._requests = 0
+        self._calls = 0
         self._pb_class = {
             SERIAL: ModbusSerialClient,
             TCP: ModbusTcpClient,
@@ -303,7 +347,9 @@ class ModbusHub:
             self._log_error(str(exception_error), error_state=False)
             return False
 
-    def _pymodbus_call(self, unit, address, value, use_call):
+    def _pymodbus_call(
+        self, unit, address, value, use_call, return_exception_response=False
+    ):
         """Call sync. pymodbus."""
         kwargs = {"unit": unit} if unit else {}
         entry = self._pb_call[use_call]
@@ -313,6 +359,8 @@ class ModbusHub:
             self._log_error(str(exception_error))
             return None
         if not hasattr(result, entry.attr):
+            if return_exception_response and isinstance(result, ExceptionResponse):
+                return result
             self._log_error(str(result))
             return None
         self._in_error = False
@@ -324,11 +372,158 @@ class ModbusHub:
             return None
         if not self._client:
             return None
+        self._requests += 1
+        if use_call in READ_CALL_TYPES:
+            return await self._async_read(unit, address, value, use_call)
+        return await self._async_pymodbus_call(unit, address, value, use_call)
+
+    async def _async_pymodbus_call(
+        self, unit, address, value, use_call, return_exception_response=False
+    ):
+        """Make a single request on the bus."""
         async with self._lock:
+            start = timer()
             result = await self.hass.async_add_executor_job(
-                self._pymodbus_call, unit, address, value, use_call
+                self._pymodbus_call,
+                unit,
+                address,
+                value,
+                use_call,
+                return_exception_response,
             )
             if self._msg_wait:
                 # small delay until next request/response
                 await asyncio.sleep(self._msg_wait)
+            self._busy_time += timer() - start
+            self._calls += 1
             return result
+
+    async def _async_read(self, unit, address, count, use_call):
+        """Queue a read for the next read plan and wait for the result."""
+        future = self.hass.loop.create_future()
+        self._pending_reads.append(_ReadRequest(unit, address, count, use_call, future))
+        if self._read_task is None:
+            self._read_task = self.hass.async_create_task(self._async_perform_reads())
+        return await future
+
+    async def _async_perform_reads(self):
+        """Read the queued reads, reads queued meanwhile go in the next plan."""
+        try:
+            while self._pending_reads:
+                requests = self._pending_reads
+                self._pending_reads = []
+                try:
+                    for block in self._plan_reads(requests):
+                        try:
+                            await self._async_read_block(block)
+                        except Exception as exception_error:  # pylint: disable=broad-except
+                            # Raise it in the updates of the entities, like a
+                            # read made by the entity itself
+                            for request in block:
+                                if not request.future.done():
+                                    request.future.set_exception(exception_error)
+                finally:
+                    # Do not leave the entities waiting if the task is cancelled
+                    for request in requests:
+                        request.future.cancel()
+        finally:
+            self._read_task = None
+
+    def _plan_reads(self, requests):
+        """Group the reads into blocks that can be read with a single request."""
+        blocks = []
+        for (unit, use_call), group in groupby(
+            sorted(requests, key=attrgetter("unit", "use_call", "address")),
+            attrgetter("unit", "use_call"),
+        ):
+            max_count = READ_CALL_TYPES[use_call]
+            merge = (unit, use_call) not in self._no_merge
+            block: list[_ReadRequest] = []
+            block_start = block_end = 0
+            for request in group:
+                end = request.address + request.count
+                if (
+                    block
+                    and merge
+                    and request.address <= block_end + MAX_READ_GAP
+                    and max(block_end, end) - block_start <= max_count
+                ):
+                    block.append(request)
+                    block_end = max(block_end, end)
+                    continue
+                if block:
+                    blocks.append(block)
+                block = [request]
+                block_start = request.address
+                block_end = end
+            blocks.append(block)
+        return blocks
+
+    async def _async_read_block(self, block):
+        """Read a block and hand out the values to the requests."""
+        first = block[0]
+        if len(block) == 1:
+            _set_read_result(
+                first,
+                await self._async_pymodbus_call(
+                    first.unit, first.address, first.count, first.use_call
+                ),
+            )
+            return
+
+        start = first.address
+        count = max(request.address + request.count for request in block) - start
+        result = await self._async_pymodbus_call(
+            first.unit, start, count, first.use_call, return_exception_response=True
+        )
+        if result is None:
+            # No answer, reading the registers one by one would not get one either
+            for request in block:
+                _set_read_result(request, None)
+            return
+        if isinstance(result, ExceptionResponse):
+            # The block may span addresses the slave does not have
+            results = [
+                await self._async_pymodbus_call(
+                    request.unit, request.address, request.count, request.use_call
+                )
+                for request in block
+            ]
+            if any(result is not None for result in results):
+                _LOGGER.debug(
+                    "%s: reading slave %s %s in blocks failed, reading them one by one",
+                    self.name,
+                    first.unit,
+                    first.use_call,
+                )
+                self._no_merge.add((first.unit, first.use_call))
+            for request, result in zip(block, results):
+                _set_read_result(request, result)
+            return
+
+        values = getattr(result, self._pb_call[first.use_call].attr)
+        for request in block:
+            offset = request.address - start
+            request_values = values[offset : offset + request.count]
+            _set_read_result(request, ReadResult(request_values, request_values))
+
+    @property
+    def bus_utilization(self) -> float:
+        """Return the fraction of the time the bus was busy since setup."""
+        if not (elapsed := timer() - self._started):
+            return 0.0
+        return min(self._busy_time / elapsed, 1.0)
+
+    def statistics(self) -> dict[str, float | int]:
+        """Return the requests of the entities and the calls made on the bus."""
+        return {
+            "requests": self._requests,
+            "calls": self._calls,
+            "bus_utilization": self.bus_utilization,
+        }
+
+
+def _set_read_result(request: _ReadRequest, result) -> None:
+    """Hand out the result of a read unless the entity stopped waiting."""
+    if not request.future.done():
+        request.future.set_result(result)
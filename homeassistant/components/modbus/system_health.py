@@ -0,0 +1,25 @@
+"""Provide info to system health."""
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+
+from .const import MODBUS_DOMAIN as DOMAIN
+
+
+@callback
+def async_register(
+    hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register system health callbacks."""
+    register.async_register_info(system_health_info)
+
+
+async def system_health_info(hass):
+    """Get info for the info page."""
+    info = {}
+    for name, hub in hass.data.get(DOMAIN, {}).items():
+        statistics = hub.statistics()
+        info[name] = (
+            f"{statistics['bus_utilization']:.1%} bus utilization, "
+            f"{statistics['calls']} calls for {statistics['requests']} requests"
+        )
+    return info
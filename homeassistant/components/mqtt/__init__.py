@@ -2,14 +2,16 @@
 from __future__ import annotations
 
 import asyncio
-from functools import lru_cache, partial, wraps
+from collections import deque
+from functools import partial, wraps
 import inspect
 from itertools import groupby
 import logging
 from operator import attrgetter
 import ssl
+import threading
 import time
-from typing import Any, Awaitable, Callable, Union, cast
+from typing import Any, Awaitable, Callable, Iterable, Union, cast
 import uuid
 
 import attr
@@ -73,6 +75,7 @@ from .const import (
     PROTOCOL_311,
 )
 from .discovery import LAST_DISCOVERY
+from .matcher import SubscriptionMatcher
 from .models import (
     AsyncMessageCallbackType,
     MessageCallbackType,
@@ -119,6 +122,12 @@ CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
 DISCOVERY_COOLDOWN = 2
 TIMEOUT_ACK = 10
 
+# Most received messages handled before the event loop gets to run other jobs
+MESSAGE_BATCH_SIZE = 500
+
+# Most topics sent in one SUBSCRIBE or UNSUBSCRIBE packet
+MAX_TOPICS_PER_PACKET = 500
+
 PLATFORMS = [
     "alarm_control_panel",
     "binary_sensor",
@@ -556,7 +565,6 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str | None = attr.ib(default="utf-8")
@@ -579,7 +587,7 @@ class MQTT:
         self.hass = hass
         self.config_entry = config_entry
         self.conf = conf
-        self.subscriptions: list[Subscription] = []
+        self.subscriptions: SubscriptionMatcher[Subscription] = SubscriptionMatcher()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -588,6 +596,17 @@ class MQTT:
 
         self._pending_operations: dict[str, asyncio.Event] = {}
 
+        # Topics to subscribe to and to unsubscribe from with the next packets
+        self._pending_subscriptions: dict[str, int] = {}
+        self._pending_unsubscribes: set[str] = set()
+        self._subscribe_waiters: list[asyncio.Future[None]] = []
+        self._subscriptions_task: asyncio.Task | None = None
+
+        # Messages received by the paho thread and not yet handled
+        self._received_messages: deque = deque()
+        self._received_messages_lock = threading.Lock()
+        self._received_messages_scheduled = False
+
         if self.hass.state == CoreState.running:
             self._ha_started.set()
         else:
@@ -755,11 +774,8 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
-        self.subscriptions.append(subscription)
-        self._matching_subscriptions.cache_clear()
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
+        self.subscriptions.add(topic, subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -769,45 +785,125 @@ class MQTT:
         @callback
         def async_remove() -> None:
             """Remove subscription."""
-            if subscription not in self.subscriptions:
-                raise HomeAssistantError("Can't remove subscription twice")
-            self.subscriptions.remove(subscription)
-            self._matching_subscriptions.cache_clear()
+            try:
+                self.subscriptions.remove(topic, subscription)
+            except KeyError as err:
+                raise HomeAssistantError("Can't remove subscription twice") from err
 
-            if any(other.topic == topic for other in self.subscriptions):
+            if self.subscriptions.has_topic(topic):
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
             # Only unsubscribe if currently connected.
             if self.connected:
-                self.hass.async_create_task(self._async_unsubscribe(topic))
+                self._async_queue_unsubscribe(topic)
 
         return async_remove
 
-    async def _async_unsubscribe(self, topic: str) -> None:
-        """Unsubscribe from a topic.
+    async def _async_perform_subscription(self, topic: str, qos: int) -> None:
+        """Subscribe to a topic with the next SUBSCRIBE and wait for the ACK."""
+        self._async_queue_subscriptions(((topic, qos),))
+        waiter: asyncio.Future[None] = self.hass.loop.create_future()
+        self._subscribe_waiters.append(waiter)
+        await waiter
 
-        This method is a coroutine.
-        """
-        async with self._paho_lock:
-            result: int | None = None
-            result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.unsubscribe, topic
+    @callback
+    def _async_queue_subscriptions(
+        self, subscriptions: Iterable[tuple[str, int]]
+    ) -> None:
+        """Queue topics to subscribe to with the next SUBSCRIBE."""
+        for topic, qos in subscriptions:
+            self._pending_unsubscribes.discard(topic)
+            self._pending_subscriptions[topic] = max(
+                qos, self._pending_subscriptions.get(topic, qos)
             )
-            _LOGGER.debug("Unsubscribing from %s, mid: %s", topic, mid)
-            _raise_on_error(result)
-        await self._wait_for_mid(mid)
+        self._async_schedule_subscriptions()
 
-    async def _async_perform_subscription(self, topic: str, qos: int) -> None:
-        """Perform a paho-mqtt subscription."""
-        async with self._paho_lock:
-            result: int | None = None
-            result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.subscribe, topic, qos
+    @callback
+    def _async_queue_unsubscribe(self, topic: str) -> None:
+        """Queue a topic to unsubscribe from with the next UNSUBSCRIBE."""
+        self._pending_subscriptions.pop(topic, None)
+        self._pending_unsubscribes.add(topic)
+        self._async_schedule_subscriptions()
+
+    @callback
+    def _async_schedule_subscriptions(self) -> None:
+        """Send the queued topics if they are not being sent already."""
+        if self._subscriptions_task is None:
+            self._subscriptions_task = self.hass.async_create_task(
+                self._async_perform_subscriptions()
             )
-            _LOGGER.debug("Subscribing to %s, mid: %s", topic, mid)
-            _raise_on_error(result)
-        await self._wait_for_mid(mid)
+
+    async def _async_perform_subscriptions(self) -> None:
+        """Send the queued topics in as few packets as possible.
+
+        Topics queued in the same event loop iteration, or while the
+        previous packets were sent, are sent together.
+        """
+        try:
+            while self._pending_subscriptions or self._pending_unsubscribes:
+                subscriptions = list(self._pending_subscriptions.items())
+                unsubscribes = list(self._pending_unsubscribes)
+                waiters = self._subscribe_waiters
+                self._pending_subscriptions = {}
+                self._pending_unsubscribes = set()
+                self._subscribe_waiters = []
+
+                if unsubscribes:
+                    try:
+                        await self._async_send_topics(
+                            "Unsubscribing from", self._mqttc.unsubscribe, unsubscribes
+                        )
+                    except HomeAssistantError as err:
+                        _LOGGER.error("Failed to unsubscribe: %s", err)
+
+                error: Exception | None = None
+                if subscriptions:
+                    try:
+                        await self._async_send_topics(
+                            "Subscribing to", self._mqttc.subscribe, subscriptions
+                        )
+                    except Exception as err:  # pylint: disable=broad-except
+                        error = err
+                        if not waiters:
+                            _LOGGER.error("Failed to subscribe: %s", err)
+
+                for waiter in waiters:
+                    if waiter.done():
+                        continue
+                    if error is None:
+                        waiter.set_result(None)
+                    else:
+                        waiter.set_exception(error)
+        finally:
+            self._subscriptions_task = None
+
+    async def _async_send_topics(
+        self,
+        action: str,
+        send: Callable[[list[Any]], tuple[int, int]],
+        topics: list[Any],
+    ) -> None:
+        """Send topics with SUBSCRIBE or UNSUBSCRIBE packets and wait for the ACKs."""
+        mids = []
+        async with self._paho_lock:
+            for idx in range(0, len(topics), MAX_TOPICS_PER_PACKET):
+                chunk = topics[idx : idx + MAX_TOPICS_PER_PACKET]
+                result, mid = await self.hass.async_add_executor_job(send, chunk)
+                _LOGGER.debug("%s %s, mid: %s", action, chunk, mid)
+                _raise_on_error(result)
+                mids.append(mid)
+        await asyncio.gather(*(self._wait_for_mid(mid) for mid in mids))
+
+    async def _async_resubscribe(self) -> None:
+        """Resubscribe to all topics we were subscribed to."""
+        # Group subscriptions to only re-subscribe once for each topic.
+        keyfunc = attrgetter("topic")
+        self._async_queue_subscriptions(
+            # Re-subscribe with the highest requested qos
+            (topic, max(subscription.qos for subscription in subs))
+            for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc)
+        )
 
     def _mqtt_on_connect(self, _mqttc, _userdata, _flags, result_code: int) -> None:
         """On connect callback.
@@ -834,12 +930,7 @@ class MQTT:
             result_code,
         )
 
-        # Group subscriptions to only re-subscribe once for each topic.
-        keyfunc = attrgetter("topic")
-        for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc):
-            # Re-subscribe with the highest requested qos
-            max_qos = max(subscription.qos for subscription in subs)
-            self.hass.add_job(self._async_perform_subscription, topic, max_qos)
+        self.hass.add_job(self._async_resubscribe)
 
         if (
             CONF_BIRTH_MESSAGE in self.conf
@@ -862,16 +953,42 @@ class MQTT:
             )
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        The event loop is only woken up for the first message of a batch,
+        messages received until it handles the batch are added to it.
+        """
+        with self._received_messages_lock:
+            self._received_messages.append(msg)
+            if self._received_messages_scheduled:
+                return
+            self._received_messages_scheduled = True
+        self.hass.loop.call_soon_threadsafe(self._mqtt_handle_received_messages)
+
+    @callback
+    def _mqtt_handle_received_messages(self) -> None:
+        """Handle a batch of the messages received by the paho thread.
 
-    @lru_cache(2048)
-    def _matching_subscriptions(self, topic):
-        subscriptions = []
-        for subscription in self.subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
+        Messages are handled in the order they were received. A batch
+        holds at most MESSAGE_BATCH_SIZE messages, the rest is handled
+        after the event loop had the chance to run other jobs.
+        """
+        received_messages = self._received_messages
+        with self._received_messages_lock:
+            batch = [
+                received_messages.popleft()
+                for _ in range(min(len(received_messages), MESSAGE_BATCH_SIZE))
+            ]
+            if not received_messages:
+                self._received_messages_scheduled = False
+            else:
+                self.hass.loop.call_soon(self._mqtt_handle_received_messages)
+
+        for msg in batch:
+            try:
+                self._mqtt_handle_message(msg)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling message on %s", msg.topic)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -883,7 +1000,7 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        subscriptions = self._matching_subscriptions(msg.topic)
+        subscriptions = self.subscriptions.match(msg.topic)
 
         for subscription in subscriptions:
 
@@ -983,16 +1100,6 @@ def _raise_on_error(result_code: int | None) -> None:
         )
 
 
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
-
-
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/debug_info", vol.Required("device_id"): str}
 )
@@ -0,0 +1,127 @@
+"""Match the topics of received messages against the subscribed topic filters."""
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterator
+from itertools import count
+from operator import itemgetter
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T", bound=Hashable)
+
+_SEQUENCE = itemgetter(1)
+
+
+class _TopicNode(Generic[_T]):
+    """A level of a topic filter."""
+
+    __slots__ = ["children", "values"]
+
+    def __init__(self) -> None:
+        """Init the node."""
+        self.children: dict[str, _TopicNode[_T]] = {}
+        # The values of the filters ending at this level and
+        # the order they were added in
+        self.values: dict[_T, int] = {}
+
+
+class SubscriptionMatcher(Generic[_T]):
+    """Trie of the subscribed topic filters, one level of a filter per node.
+
+    Filters are added and removed one at a time without rebuilding
+    anything. Matching a topic only follows the levels of the topic,
+    the exact level and the "+" and "#" wildcards, so the cost depends
+    on the depth of the topic instead of the number of subscriptions.
+    Matches are returned in the order they were added, like paho's
+    MQTTMatcher topics starting with "$" are not matched by a wildcard
+    in the first level.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the matcher."""
+        self._root: _TopicNode[_T] = _TopicNode()
+        self._sequence = count()
+        self._len = 0
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return self._len
+
+    def __iter__(self) -> Iterator[_T]:
+        """Iterate over all values."""
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            yield from node.values
+            nodes.extend(node.children.values())
+
+    def add(self, topic: str, value: _T) -> None:
+        """Add a value for a topic filter."""
+        node = self._root
+        for level in topic.split("/"):
+            if (child := node.children.get(level)) is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        if value not in node.values:
+            node.values[value] = next(self._sequence)
+            self._len += 1
+
+    def remove(self, topic: str, value: _T) -> None:
+        """Remove a value of a topic filter.
+
+        Raises KeyError if the value was not added for the topic filter.
+        """
+        path: list[tuple[_TopicNode[_T], str]] = []
+        node = self._root
+        for level in topic.split("/"):
+            path.append((node, level))
+            node = node.children[level]
+        del node.values[value]
+        self._len -= 1
+
+        # Prune the levels no other filter goes through
+        for parent, level in reversed(path):
+            if node.values or node.children:
+                break
+            del parent.children[level]
+            node = parent
+
+    def has_topic(self, topic: str) -> bool:
+        """Return if any value was added for the topic filter."""
+        node = self._root
+        for level in topic.split("/"):
+            if (child := node.children.get(level)) is None:
+                return False
+            node = child
+        return bool(node.values)
+
+    def match(self, topic: str) -> list[_T]:
+        """Return the values of all topic filters matching a topic."""
+        matches: list[tuple[_T, int]] = []
+        # Wildcards in the first level do not match topics starting with $
+        wildcards = not topic.startswith("$")
+        nodes = [self._root]
+        for level in topic.split("/"):
+            next_nodes = []
+            for node in nodes:
+                children = node.children
+                if wildcards:
+                    if (multi_level := children.get("#")) is not None:
+                        matches.extend(multi_level.values.items())
+                    if (single_level := children.get("+")) is not None:
+                        next_nodes.append(single_level)
+                if (child := children.get(level)) is not None:
+                    next_nodes.append(child)
+            if not next_nodes:
+                break
+            nodes = next_nodes
+            wildcards = True
+        else:
+            for node in nodes:
+                matches.extend(node.values.items())
+                # "a/#" also matches "a"
+                if (multi_level := node.children.get("#")) is not None:
+                    matches.extend(multi_level.values.items())
+
+        if len(matches) > 1:
+            matches.sort(key=_SEQUENCE)
+        return [value for value, _ in matches]
@@ -247,6 +247,20 @@ class P1MonitorSensorEntity(CoordinatorEntity, SensorEntity):
     """Defines an P1 Monitor sensor."""
 
     coordinator: P1MonitorDataUpdateCoordinator
+    # The sensors update every 5 seconds, their properties all come from
+    # the entity description
+    _static_properties = frozenset(
+        {
+            "assumed_state",
+            "capability_attributes",
+            "device_class",
+            "entity_picture",
+            "icon",
+            "name",
+            "supported_features",
+            "unit_of_measurement",
+        }
+    )
 
     def __init__(
         self,
@@ -1,4 +1,5 @@
 """Support for Prometheus metrics export."""
+import asyncio
 import logging
 import string
 
@@ -44,6 +45,9 @@ _LOGGER = logging.getLogger(__name__)
 
 API_ENDPOINT = "/api/prometheus"
 
+# Seconds a rendered exposition is shared between scrapes
+SNAPSHOT_MAX_AGE = 1
+
 DOMAIN = "prometheus"
 CONF_FILTER = "filter"
 CONF_PROM_NAMESPACE = "namespace"
@@ -139,6 +143,23 @@ class PrometheusMetrics:
             self._sensor_fallback_metric,
         ]
 
+        self._domain_handlers = {
+            "automation": self._handle_automation,
+            "binary_sensor": self._handle_binary_sensor,
+            "climate": self._handle_climate,
+            "device_tracker": self._handle_device_tracker,
+            "humidifier": self._handle_humidifier,
+            "input_boolean": self._handle_input_boolean,
+            "light": self._handle_light,
+            "lock": self._handle_lock,
+            "person": self._handle_person,
+            "sensor": self._handle_sensor,
+            "switch": self._handle_switch,
+            "zwave": self._handle_zwave,
+        }
+        # The domain handler of each entity, None if the entity is filtered out
+        self._entity_handlers = {}
+
         if namespace:
             self.metrics_prefix = f"{namespace}_"
         else:
@@ -150,43 +171,55 @@ class PrometheusMetrics:
         """Listen for new messages on the bus, and add them to Prometheus."""
         state = event.data.get("new_state")
         if state is None:
+            self._entity_handlers.pop(event.data.get("entity_id"), None)
             return
 
         entity_id = state.entity_id
         _LOGGER.debug("Handling state update for %s", entity_id)
-        domain, _ = hacore.split_entity_id(entity_id)
 
-        if not self._filter(state.entity_id):
+        try:
+            handler = self._entity_handlers[entity_id]
+        except KeyError:
+            handler = self._entity_handlers[entity_id] = self._entity_handler(entity_id)
+        if handler is None:
             return
 
-        ignored_states = (STATE_UNAVAILABLE, STATE_UNKNOWN)
-
-        handler = f"_handle_{domain}"
+        labels = self._labels(state)
+        available = state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
 
-        if hasattr(self, handler) and state.state not in ignored_states:
-            getattr(self, handler)(state)
+        if available:
+            handler(state, labels)
 
-        labels = self._labels(state)
         state_change = self._metric(
             "state_change", self.prometheus_cli.Counter, "The number of state changes"
         )
-        state_change.labels(**labels).inc()
+        state_change.labels(*labels).inc()
 
         entity_available = self._metric(
             "entity_available",
             self.prometheus_cli.Gauge,
             "Entity is available (not in the unavailable or unknown state)",
         )
-        entity_available.labels(**labels).set(float(state.state not in ignored_states))
+        entity_available.labels(*labels).set(float(available))
 
         last_updated_time_seconds = self._metric(
             "last_updated_time_seconds",
             self.prometheus_cli.Gauge,
             "The last_updated timestamp",
         )
-        last_updated_time_seconds.labels(**labels).set(state.last_updated.timestamp())
+        last_updated_time_seconds.labels(*labels).set(state.last_updated.timestamp())
+
+    def _entity_handler(self, entity_id):
+        """Return the domain handler of an entity or None if it is filtered out."""
+        if not self._filter(entity_id):
+            return None
+        domain, _ = hacore.split_entity_id(entity_id)
+        return self._domain_handlers.get(domain, self._handle_other)
+
+    def _handle_other(self, state, labels):
+        """Handle an entity of a domain without metrics of its own."""
 
-    def _handle_attributes(self, state):
+    def _handle_attributes(self, state, labels):
         for key, value in state.attributes.items():
             metric = self._metric(
                 f"{state.domain}_attr_{key.lower()}",
@@ -196,18 +229,17 @@ class PrometheusMetrics:
 
             try:
                 value = float(value)
-                metric.labels(**self._labels(state)).set(value)
+                metric.labels(*labels).set(value)
             except (ValueError, TypeError):
                 pass
 
     def _metric(self, metric, factory, documentation, extra_labels=None):
-        labels = ["entity", "friendly_name", "domain"]
-        if extra_labels is not None:
-            labels.extend(extra_labels)
-
         try:
             return self._metrics[metric]
         except KeyError:
+            labels = ["entity", "friendly_name", "domain"]
+            if extra_labels is not None:
+                labels.extend(extra_labels)
             full_metric_name = self._sanitize_metric_name(
                 f"{self.metrics_prefix}{metric}"
             )
@@ -240,13 +272,14 @@ class PrometheusMetrics:
 
     @staticmethod
     def _labels(state):
-        return {
-            "entity": state.entity_id,
-            "domain": state.domain,
-            "friendly_name": state.attributes.get(ATTR_FRIENDLY_NAME),
-        }
+        """Return the label values of the entity, in the order of the label names."""
+        return (
+            state.entity_id,
+            state.attributes.get(ATTR_FRIENDLY_NAME),
+            state.domain,
+        )
 
-    def _battery(self, state):
+    def _battery(self, state, labels):
         if "battery_level" in state.attributes:
             metric = self._metric(
                 "battery_level_percent",
@@ -255,45 +288,45 @@ class PrometheusMetrics:
             )
             try:
                 value = float(state.attributes[ATTR_BATTERY_LEVEL])
-                metric.labels(**self._labels(state)).set(value)
+                metric.labels(*labels).set(value)
             except ValueError:
                 pass
 
-    def _handle_binary_sensor(self, state):
+    def _handle_binary_sensor(self, state, labels):
         metric = self._metric(
             "binary_sensor_state",
             self.prometheus_cli.Gauge,
             "State of the binary sensor (0/1)",
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        metric.labels(*labels).set(value)
 
-    def _handle_input_boolean(self, state):
+    def _handle_input_boolean(self, state, labels):
         metric = self._metric(
             "input_boolean_state",
             self.prometheus_cli.Gauge,
             "State of the input boolean (0/1)",
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        metric.labels(*labels).set(value)
 
-    def _handle_device_tracker(self, state):
+    def _handle_device_tracker(self, state, labels):
         metric = self._metric(
             "device_tracker_state",
             self.prometheus_cli.Gauge,
             "State of the device tracker (0/1)",
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        metric.labels(*labels).set(value)
 
-    def _handle_person(self, state):
+    def _handle_person(self, state, labels):
         metric = self._metric(
             "person_state", self.prometheus_cli.Gauge, "State of the person (0/1)"
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        metric.labels(*labels).set(value)
 
-    def _handle_light(self, state):
+    def _handle_light(self, state, labels):
         metric = self._metric(
             "light_brightness_percent",
             self.prometheus_cli.Gauge,
@@ -306,18 +339,20 @@ class PrometheusMetrics:
             else:
                 value = self.state_as_number(state)
             value = value * 100
-            metric.labels(**self._labels(state)).set(value)
+            metric.labels(*labels).set(value)
         except ValueError:
             pass
 
-    def _handle_lock(self, state):
+    def _handle_lock(self, state, labels):
         metric = self._metric(
             "lock_state", self.prometheus_cli.Gauge, "State of the lock (0/1)"
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        metric.labels(*labels).set(value)
 
-    def _handle_climate_temp(self, state, attr, metric_name, metric_description):
+    def _handle_climate_temp(
+        self, state, labels, attr, metric_name, metric_description
+    ):
         temp = state.attributes.get(attr)
         if temp:
             if self._climate_units == TEMP_FAHRENHEIT:
@@ -327,29 +362,33 @@ class PrometheusMetrics:
                 self.prometheus_cli.Gauge,
                 metric_description,
             )
-            metric.labels(**self._labels(state)).set(temp)
+            metric.labels(*labels).set(temp)
 
-    def _handle_climate(self, state):
+    def _handle_climate(self, state, labels):
         self._handle_climate_temp(
             state,
+            labels,
             ATTR_TEMPERATURE,
             "climate_target_temperature_celsius",
             "Target temperature in degrees Celsius",
         )
         self._handle_climate_temp(
             state,
+            labels,
             ATTR_TARGET_TEMP_HIGH,
             "climate_target_temperature_high_celsius",
             "Target high temperature in degrees Celsius",
         )
         self._handle_climate_temp(
             state,
+            labels,
             ATTR_TARGET_TEMP_LOW,
             "climate_target_temperature_low_celsius",
             "Target low temperature in degrees Celsius",
         )
         self._handle_climate_temp(
             state,
+            labels,
             ATTR_CURRENT_TEMPERATURE,
             "climate_current_temperature_celsius",
             "Current temperature in degrees Celsius",
@@ -364,11 +403,9 @@ class PrometheusMetrics:
                 ["action"],
             )
             for action in CURRENT_HVAC_ACTIONS:
-                metric.labels(**dict(self._labels(state), action=action)).set(
-                    float(action == current_action)
-                )
+                metric.labels(*labels, action).set(float(action == current_action))
 
-    def _handle_humidifier(self, state):
+    def _handle_humidifier(self, state, labels):
         humidifier_target_humidity_percent = state.attributes.get(ATTR_HUMIDITY)
         if humidifier_target_humidity_percent:
             metric = self._metric(
@@ -376,7 +413,7 @@ class PrometheusMetrics:
                 self.prometheus_cli.Gauge,
                 "Target Relative Humidity",
             )
-            metric.labels(**self._labels(state)).set(humidifier_target_humidity_percent)
+            metric.labels(*labels).set(humidifier_target_humidity_percent)
 
         metric = self._metric(
             "humidifier_state",
@@ -385,7 +422,7 @@ class PrometheusMetrics:
         )
         try:
             value = self.state_as_number(state)
-            metric.labels(**self._labels(state)).set(value)
+            metric.labels(*labels).set(value)
         except ValueError:
             pass
 
@@ -399,11 +436,9 @@ class PrometheusMetrics:
                 ["mode"],
             )
             for mode in available_modes:
-                metric.labels(**dict(self._labels(state), mode=mode)).set(
-                    float(mode == current_mode)
-                )
+                metric.labels(*labels, mode).set(float(mode == current_mode))
 
-    def _handle_sensor(self, state):
+    def _handle_sensor(self, state, labels):
         unit = self._unit_string(state.attributes.get(ATTR_UNIT_OF_MEASUREMENT))
 
         for metric_handler in self._sensor_metric_handlers:
@@ -420,11 +455,11 @@ class PrometheusMetrics:
                 value = self.state_as_number(state)
                 if state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) == TEMP_FAHRENHEIT:
                     value = fahrenheit_to_celsius(value)
-                _metric.labels(**self._labels(state)).set(value)
+                _metric.labels(*labels).set(value)
             except ValueError:
                 pass
 
-        self._battery(state)
+        self._battery(state, labels)
 
     def _sensor_default_metric(self, state, unit):
         """Get default metric."""
@@ -471,34 +506,41 @@ class PrometheusMetrics:
         default = default.lower()
         return units.get(unit, default)
 
-    def _handle_switch(self, state):
+    def _handle_switch(self, state, labels):
         metric = self._metric(
             "switch_state", self.prometheus_cli.Gauge, "State of the switch (0/1)"
         )
 
         try:
             value = self.state_as_number(state)
-            metric.labels(**self._labels(state)).set(value)
+            metric.labels(*labels).set(value)
         except ValueError:
             pass
 
-        self._handle_attributes(state)
+        self._handle_attributes(state, labels)
 
-    def _handle_zwave(self, state):
-        self._battery(state)
+    def _handle_zwave(self, state, labels):
+        self._battery(state, labels)
 
-    def _handle_automation(self, state):
+    def _handle_automation(self, state, labels):
         metric = self._metric(
             "automation_triggered_count",
             self.prometheus_cli.Counter,
             "Count of times an automation has been triggered",
         )
 
-        metric.labels(**self._labels(state)).inc()
+        metric.labels(*labels).inc()
 
 
 class PrometheusView(HomeAssistantView):
-    """Handle Prometheus requests."""
+    """Handle Prometheus requests.
+
+    Rendering the metrics of thousands of entities takes long enough to
+    stall the event loop, so it is done in the executor. The rendered
+    exposition is shared by the scrapes that arrive while it is rendered
+    or within SNAPSHOT_MAX_AGE after, like several Prometheus servers
+    scraping at the same time.
+    """
 
     url = API_ENDPOINT
     name = "api:prometheus"
@@ -506,12 +548,26 @@ class PrometheusView(HomeAssistantView):
     def __init__(self, prometheus_cli):
         """Initialize Prometheus view."""
         self.prometheus_cli = prometheus_cli
+        self._lock = asyncio.Lock()
+        self._snapshot = None
+        self._snapshot_time = 0.0
 
     async def get(self, request):
         """Handle request for Prometheus metrics."""
         _LOGGER.debug("Received Prometheus metrics request")
 
         return web.Response(
-            body=self.prometheus_cli.generate_latest(),
+            body=await self._async_render(request.app["hass"]),
             content_type=CONTENT_TYPE_TEXT_PLAIN,
         )
+
+    async def _async_render(self, hass):
+        """Return the exposition, rendering it if the snapshot is too old."""
+        async with self._lock:
+            now = hass.loop.time()
+            if self._snapshot is None or now - self._snapshot_time > SNAPSHOT_MAX_AGE:
+                self._snapshot = await hass.async_add_executor_job(
+                    self.prometheus_cli.generate_latest
+                )
+                self._snapshot_time = now
+            return self._snapshot
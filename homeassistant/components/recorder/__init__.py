@@ -9,7 +9,7 @@ import queue
 import sqlite3
 import threading
 import time
-from typing import Any, Callable, NamedTuple
+from typing import Any, Callable, Mapping, NamedTuple
 
 from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.exc import SQLAlchemyError
@@ -47,15 +47,24 @@ from homeassistant.helpers.service import async_extract_entity_ids
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
+from homeassistant.util.lru import LRU
 
 from . import history, migration, purge, statistics
-from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
+from .const import (
+    CONF_DB_INTEGRITY_CHECK,
+    DATA_INSTANCE,
+    DOMAIN,
+    MAX_BIND_VARS,
+    SQLITE_URL_PREFIX,
+)
+from .history_cache import HistoryCache
 from .models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
-    StatisticsRuns,
+    StatisticsShortTermRuns,
     process_timestamp,
 )
 from .pool import RecorderPool
@@ -110,11 +119,15 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+# The history cache is disabled by default, its size is a number
+# of states since the memory they take depends on their attributes
+DEFAULT_HISTORY_CACHE_MAX_STATES = 0
+# Seconds between keep alives of the database connection
 KEEPALIVE_TIME = 30
 
-# Controls how often we clean up
-# States and Events objects
-EXPIRE_AFTER_COMMITS = 120
+# The number of attribute ids to cache in memory
+# to avoid looking up shared attributes in the database
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
@@ -124,6 +137,7 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_HISTORY_CACHE_MAX_STATES = "history_cache_max_states"
 
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
@@ -161,6 +175,10 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(
+                        CONF_HISTORY_CACHE_MAX_STATES,
+                        default=DEFAULT_HISTORY_CACHE_MAX_STATES,
+                    ): cv.positive_int,
                 }
             ),
         )
@@ -257,6 +275,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        history_cache_max_states=conf[CONF_HISTORY_CACHE_MAX_STATES],
     )
     instance.async_initialize()
     instance.start()
@@ -343,12 +362,21 @@ class StatisticsTask(NamedTuple):
     """An object to insert into the recorder queue to run a statistics task."""
 
     start: datetime
+    period: str = "5minute"
 
 
 class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+class CommitTask:
+    """An object to insert into the recorder queue to commit the event session."""
+
+
+class KeepAliveTask:
+    """An object to insert into the recorder queue to keep the database connection alive."""
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -363,6 +391,7 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
+        history_cache_max_states: int,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -385,11 +414,19 @@ class Recorder(threading.Thread):
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
 
-        self._timechanges_seen = 0
-        self._commits_without_expire = 0
-        self._keepalive_count = 0
-        self._old_states: dict[str, States] = {}
-        self._pending_expunge: list[States] = []
+        # The latest recorded state id of each entity
+        self._old_states: dict[str, int] = {}
+        self._pending_events: list[dict[str, Any]] = []
+        self._pending_states: list[
+            tuple[dict[str, Any], dict[str, Any], str, Mapping[str, Any]]
+        ] = []
+        self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
+        # The recent state changes to answer history queries without the database
+        self.history_cache: HistoryCache | None = None
+        if history_cache_max_states:
+            self.history_cache = HistoryCache(
+                history_cache_max_states, self.recording_start
+            )
         self.event_session = None
         self.get_session = None
         self._completed_first_database_setup = None
@@ -397,6 +434,7 @@ class Recorder(threading.Thread):
         self.async_migration_event = asyncio.Event()
         self.migration_in_progress = False
         self._queue_watcher = None
+        self._periodic_task_handles: dict[type, asyncio.TimerHandle] = {}
 
         self.enabled = True
 
@@ -413,6 +451,31 @@ class Recorder(threading.Thread):
         self._queue_watcher = async_track_time_interval(
             self.hass, self._async_check_queue, timedelta(minutes=10)
         )
+        if self.commit_interval:
+            self._async_put_task_periodically(CommitTask(), self.commit_interval)
+        self._async_put_task_periodically(KeepAliveTask(), KEEPALIVE_TIME)
+
+    @callback
+    def _async_put_task_periodically(self, task: Any, interval: float) -> None:
+        """Put a task in the queue every interval seconds.
+
+        The task is scheduled on the event loop instead of counting
+        time changed events so an idle recorder does not wake up
+        every second.
+        """
+
+        @callback
+        def _async_put_task() -> None:
+            self.queue.put(task)
+            self._periodic_task_handles[type(task)] = self.hass.loop.call_later(
+                interval, _async_put_task
+            )
+
+        if handle := self._periodic_task_handles.get(type(task)):
+            handle.cancel()
+        self._periodic_task_handles[type(task)] = self.hass.loop.call_later(
+            interval, _async_put_task
+        )
 
     @callback
     def _async_check_queue(self, *_):
@@ -422,6 +485,8 @@ class Recorder(threading.Thread):
         """
         size = self.queue.qsize()
         _LOGGER.debug("Recorder queue size is: %s", size)
+        if self.history_cache is not None:
+            _LOGGER.debug("Recorder history cache: %s", self.history_cache.info())
         if self.queue.qsize() <= MAX_QUEUE_BACKLOG:
             return
         _LOGGER.error(
@@ -439,11 +504,14 @@ class Recorder(threading.Thread):
         if self._event_listener:
             self._event_listener()
             self._event_listener = None
+        for handle in self._periodic_task_handles.values():
+            handle.cancel()
+        self._periodic_task_handles.clear()
 
     @callback
     def _async_event_filter(self, event) -> bool:
         """Filter events."""
-        if event.event_type in self.exclude_t:
+        if event.event_type in self.exclude_t or event.event_type == EVENT_TIME_CHANGED:
             return False
 
         entity_id = event.data.get(ATTR_ENTITY_ID)
@@ -482,7 +550,7 @@ class Recorder(threading.Thread):
         start = kwargs.get("start")
         if not start:
             start = statistics.get_start_time()
-        self.queue.put(StatisticsTask(start))
+        self.queue.put(StatisticsTask(start, kwargs.get("period", "5minute")))
 
     @callback
     def async_register(self, shutdown_task, hass_started):
@@ -563,8 +631,8 @@ class Recorder(threading.Thread):
             self.queue.put(PerodicCleanupTask())
 
     @callback
-    def async_hourly_statistics(self, now):
-        """Trigger the hourly statistics run."""
+    def async_periodic_statistics(self, now):
+        """Trigger the 5-minute statistics run, which also rolls up full hours."""
         start = statistics.get_start_time()
         self.queue.put(StatisticsTask(start))
 
@@ -575,14 +643,18 @@ class Recorder(threading.Thread):
             self.hass, self.async_nightly_tasks, hour=4, minute=12, second=0
         )
 
-        # Compile hourly statistics every hour at *:12
+        # Compile short term statistics every 5 minutes
         async_track_time_change(
-            self.hass, self.async_hourly_statistics, minute=12, second=0
+            self.hass,
+            self.async_periodic_statistics,
+            minute=range(0, 60, 5),
+            second=10,
         )
 
         # Add tasks for missing statistics runs
         now = dt_util.utcnow()
-        last_hour = now.replace(minute=0, second=0, microsecond=0)
+        last_period_minutes = now.minute - now.minute % 5
+        last_period = now.replace(minute=last_period_minutes, second=0, microsecond=0)
         start = now - timedelta(days=self.keep_days)
         start = start.replace(minute=0, second=0, microsecond=0)
 
@@ -590,18 +662,18 @@ class Recorder(threading.Thread):
             # Home Assistant is shutting down
             return
 
-        # Find the newest statistics run, if any
+        # Find the newest 5-minute statistics run, if any
         with session_scope(session=self.get_session()) as session:
-            last_run = session.query(func.max(StatisticsRuns.start)).scalar()
+            last_run = session.query(func.max(StatisticsShortTermRuns.start)).scalar()
         if last_run:
-            start = max(start, process_timestamp(last_run) + timedelta(hours=1))
+            start = max(start, process_timestamp(last_run) + timedelta(minutes=5))
 
         # Add tasks
-        while start < last_hour:
-            end = start + timedelta(hours=1)
+        while start < last_period:
+            end = start + timedelta(minutes=5)
             _LOGGER.debug("Compiling missing statistics for %s-%s", start, end)
             self.queue.put(StatisticsTask(start))
-            start = start + timedelta(hours=1)
+            start = end
 
     def run(self):
         """Start processing events to save."""
@@ -658,8 +730,8 @@ class Recorder(threading.Thread):
     def _run_event_loop(self):
         """Run the event loop for the recorder."""
         # Use a session for the event read loop
-        # with a commit every time the event time
-        # has changed. This reduces the disk io.
+        # with a commit every commit interval.
+        # This reduces the disk io.
         while event := self.queue.get():
             try:
                 self._process_one_event_or_recover(event)
@@ -742,6 +814,10 @@ class Recorder(threading.Thread):
 
     def _run_purge(self, purge_before, repack, apply_filter):
         """Purge the database."""
+        # Make sure no pending state references attributes that may get purged
+        self._commit_event_session_or_retry()
+        if self.history_cache is not None:
+            self.history_cache.purge(purge_before)
         if purge.purge_old_data(self, purge_before, repack, apply_filter):
             # We always need to do the db cleanups after a purge
             # is finished to ensure the WAL checkpoint and other
@@ -753,17 +829,20 @@ class Recorder(threading.Thread):
 
     def _run_purge_entities(self, entity_filter):
         """Purge entities from the database."""
+        self._commit_event_session_or_retry()
+        if self.history_cache is not None:
+            self.history_cache.purge_entities(entity_filter)
         if purge.purge_entity_data(self, entity_filter):
             return
         # Schedule a new purge task if this one didn't finish
         self.queue.put(PurgeEntitiesTask(entity_filter))
 
-    def _run_statistics(self, start):
+    def _run_statistics(self, start, period):
         """Run statistics task."""
-        if statistics.compile_statistics(self, start):
+        if statistics.compile_statistics(self, start, period):
             return
         # Schedule a new statistics task if this one didn't finish
-        self.queue.put(StatisticsTask(start))
+        self.queue.put(StatisticsTask(start, period))
 
     def _process_one_event(self, event):
         """Process one event."""
@@ -777,21 +856,16 @@ class Recorder(threading.Thread):
             perodic_db_cleanups(self)
             return
         if isinstance(event, StatisticsTask):
-            self._run_statistics(event.start)
+            self._run_statistics(event.start, event.period)
             return
         if isinstance(event, WaitTask):
             self._queue_watch.set()
             return
-        if event.event_type == EVENT_TIME_CHANGED:
-            self._keepalive_count += 1
-            if self._keepalive_count >= KEEPALIVE_TIME:
-                self._keepalive_count = 0
-                self._send_keep_alive()
-            if self.commit_interval:
-                self._timechanges_seen += 1
-                if self._timechanges_seen >= self.commit_interval:
-                    self._timechanges_seen = 0
-                    self._commit_event_session_or_retry()
+        if isinstance(event, CommitTask):
+            self._commit_event_session_or_retry()
+            return
+        if isinstance(event, KeepAliveTask):
+            self._send_keep_alive()
             return
 
         if not self.enabled:
@@ -799,44 +873,199 @@ class Recorder(threading.Thread):
 
         try:
             if event.event_type == EVENT_STATE_CHANGED:
-                dbevent = Events.from_event(event, event_data="{}")
+                event_row = Events.row_from_event(event, event_data="{}")
             else:
-                dbevent = Events.from_event(event)
-            dbevent.created = event.time_fired
-            self.event_session.add(dbevent)
+                event_row = Events.row_from_event(event)
         except (TypeError, ValueError):
             _LOGGER.warning("Event is not JSON serializable: %s", event)
             return
 
-        if event.event_type == EVENT_STATE_CHANGED:
+        if event.event_type != EVENT_STATE_CHANGED:
+            self._pending_events.append(event_row)
+        else:
             try:
-                dbstate = States.from_event(event)
-                has_new_state = event.data.get("new_state")
-                if dbstate.entity_id in self._old_states:
-                    old_state = self._old_states.pop(dbstate.entity_id)
-                    if old_state.state_id:
-                        dbstate.old_state_id = old_state.state_id
-                    else:
-                        dbstate.old_state = old_state
-                if not has_new_state:
-                    dbstate.state = None
-                dbstate.event = dbevent
-                dbstate.created = event.time_fired
-                self.event_session.add(dbstate)
-                if has_new_state:
-                    self._old_states[dbstate.entity_id] = dbstate
-                    self._pending_expunge.append(dbstate)
+                state_row = States.row_from_event(event)
+                shared_attrs = StateAttributes.shared_attrs_from_event(event)
+                new_state = event.data.get("new_state")
             except (TypeError, ValueError):
                 _LOGGER.warning(
                     "State is not JSON serializable: %s",
                     event.data.get("new_state"),
                 )
+                # Keep the event even if the state can not be saved
+                self._pending_events.append(event_row)
+            else:
+                if not new_state:
+                    state_row["state"] = None
+                state_row["created"] = event.time_fired
+                self._pending_states.append(
+                    (
+                        event_row,
+                        state_row,
+                        shared_attrs,
+                        new_state.attributes if new_state else {},
+                    )
+                )
 
         # If they do not have a commit interval
         # than we commit right away
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
+    def _write_pending_rows(self) -> tuple[dict[str, int], dict[str, int]]:
+        """Insert the pending events and states in the event session transaction.
+
+        Events without a state are inserted with a single executemany.
+        Events with a state, new shared attributes and states need their
+        generated primary keys, so those are inserted in batches that read
+        the keys back, see _insert_rows_returning_ids.
+
+        A state can only link to the previous state of its entity once that
+        one has an id, so the states are inserted in rounds holding at most
+        one state of each entity.
+
+        Returns the latest state id of each entity and the ids of the
+        shared attributes of the states.
+        """
+        connection = self.event_session.connection()
+        if self._pending_events:
+            connection.execute(Events.__table__.insert(), self._pending_events)
+
+        # Work on a copy so the commit can be retried after a failure
+        old_states = dict(self._old_states)
+        if not self._pending_states:
+            return old_states, {}
+
+        attributes_ids = self._get_or_insert_shared_attrs(
+            connection, {shared_attrs for _, _, shared_attrs, _ in self._pending_states}
+        )
+        event_ids = self._insert_rows_returning_ids(
+            connection,
+            Events.__table__,
+            [event_row for event_row, _, _, _ in self._pending_states],
+        )
+        rounds: list[list[dict[str, Any]]] = []
+        entity_rounds: dict[str, int] = {}
+        for (_, state_row, shared_attrs, _), event_id in zip(
+            self._pending_states, event_ids
+        ):
+            state_row["event_id"] = event_id
+            state_row["attributes_id"] = attributes_ids[shared_attrs]
+            entity_id = state_row["entity_id"]
+            entity_round = entity_rounds.get(entity_id, 0)
+            entity_rounds[entity_id] = entity_round + 1
+            if entity_round == len(rounds):
+                rounds.append([])
+            rounds[entity_round].append(state_row)
+
+        for state_rows in rounds:
+            for state_row in state_rows:
+                state_row["old_state_id"] = old_states.pop(state_row["entity_id"], None)
+            state_ids = self._insert_rows_returning_ids(
+                connection, States.__table__, state_rows
+            )
+            for state_row, state_id in zip(state_rows, state_ids):
+                if state_row["state"] is not None:
+                    old_states[state_row["entity_id"]] = state_id
+
+        return old_states, attributes_ids
+
+    def _get_or_insert_shared_attrs(
+        self, connection, shared_attrs_set: set[str]
+    ) -> dict[str, int]:
+        """Return the ids of the shared attributes rows, inserting them if needed."""
+        attributes_ids: dict[str, int] = {}
+        attr_hashes: dict[str, int] = {}
+        for shared_attrs in shared_attrs_set:
+            # Matching attributes id found in the cache
+            if attributes_id := self._state_attributes_ids.get(shared_attrs):
+                attributes_ids[shared_attrs] = attributes_id
+            else:
+                attr_hashes[shared_attrs] = StateAttributes.hash_shared_attrs(
+                    shared_attrs
+                )
+        if not attr_hashes:
+            return attributes_ids
+
+        # Matching attributes found in the database
+        hashes = list(set(attr_hashes.values()))
+        for start in range(0, len(hashes), MAX_BIND_VARS):
+            for attributes_id, shared_attrs in connection.execute(
+                select(
+                    [StateAttributes.attributes_id, StateAttributes.shared_attrs]
+                ).where(StateAttributes.hash.in_(hashes[start : start + MAX_BIND_VARS]))
+            ):
+                if shared_attrs in attr_hashes:
+                    attributes_ids.setdefault(shared_attrs, attributes_id)
+
+        # No matching attributes found, save them in the database
+        if missing := [
+            shared_attrs
+            for shared_attrs in attr_hashes
+            if shared_attrs not in attributes_ids
+        ]:
+            attributes_ids.update(
+                zip(
+                    missing,
+                    self._insert_rows_returning_ids(
+                        connection,
+                        StateAttributes.__table__,
+                        [
+                            {
+                                "hash": attr_hashes[shared_attrs],
+                                "shared_attrs": shared_attrs,
+                            }
+                            for shared_attrs in missing
+                        ],
+                    ),
+                )
+            )
+        return attributes_ids
+
+    @staticmethod
+    def _insert_rows_returning_ids(
+        connection, table, rows: list[dict[str, Any]]
+    ) -> list[int]:
+        """Insert rows in batches and return their generated ids in order.
+
+        SQLite assigns consecutive rowids to the rows of one executemany
+        while the transaction holds the write lock, so the ids end at the
+        last inserted rowid. PostgreSQL returns them from a multi row insert
+        with RETURNING and draws them from the sequence in row order. Other
+        databases, like MySQL with interleaved auto increment locks or an
+        increment step, do not guarantee consecutive ids and insert the rows
+        one by one.
+        """
+        insert = table.insert()
+        dialect_name = connection.dialect.name
+        if dialect_name == "sqlite":
+            connection.execute(insert, rows)
+            last_id = connection.execute(select([func.last_insert_rowid()])).scalar()
+            return list(range(last_id - len(rows) + 1, last_id + 1))
+        if dialect_name != "postgresql":
+            return [
+                connection.execute(insert, row).inserted_primary_key[0] for row in rows
+            ]
+
+        ids: list[int] = []
+        primary_key = table.primary_key.columns.values()[0]
+        chunk_size = max(1, MAX_BIND_VARS // len(rows[0]))
+        for start in range(0, len(rows), chunk_size):
+            multi_insert = insert.values(rows[start : start + chunk_size])
+            ids.extend(
+                sorted(
+                    row[0]
+                    for row in connection.execute(multi_insert.returning(primary_key))
+                )
+            )
+        return ids
+
+    def _evict_purged_state_attributes(self, attributes_ids: set[int]) -> None:
+        """Evict purged attributes ids from the attributes ids cache."""
+        for shared_attrs, attributes_id in list(self._state_attributes_ids.items()):
+            if attributes_id in attributes_ids:
+                del self._state_attributes_ids[shared_attrs]
+
     def _handle_database_error(self, err):
         """Handle a database error that may result in moving away the corrupt db."""
         if isinstance(err.__cause__, sqlite3.DatabaseError):
@@ -849,7 +1078,12 @@ class Recorder(threading.Thread):
 
     def _commit_event_session_or_retry(self):
         """Commit the event session if there is work to do."""
-        if not self.event_session.new and not self.event_session.dirty:
+        if (
+            not self._pending_events
+            and not self._pending_states
+            and not self.event_session.new
+            and not self.event_session.dirty
+        ):
             return
         tries = 1
         while tries <= self.db_max_retries:
@@ -866,40 +1100,44 @@ class Recorder(threading.Thread):
                 if tries == self.db_max_retries:
                     raise
 
+                # The pending rows are written again on the next try
+                self.event_session.rollback()
                 tries += 1
                 time.sleep(self.db_retry_wait)
 
     def _commit_event_session(self):
-        self._commits_without_expire += 1
-
-        if self._pending_expunge:
-            self.event_session.flush()
-            for dbstate in self._pending_expunge:
-                # Expunge the state so its not expired
-                # until we use it later for dbstate.old_state
-                if dbstate in self.event_session:
-                    self.event_session.expunge(dbstate)
-            self._pending_expunge = []
+        old_states, new_attributes_ids = self._write_pending_rows()
         self.event_session.commit()
 
-        # Expire is an expensive operation (frequently more expensive
-        # than the flush and commit itself) so we only
-        # do it after EXPIRE_AFTER_COMMITS commits
-        if self._commits_without_expire == EXPIRE_AFTER_COMMITS:
-            self._commits_without_expire = 0
-            self.event_session.expire_all()
+        if self.history_cache is not None:
+            self.history_cache.add_states(
+                (state_row, attributes)
+                for _, state_row, _, attributes in self._pending_states
+            )
+        self._pending_events = []
+        self._pending_states = []
+        self._old_states = old_states
+        # Once committed the attributes ids can be
+        # used by the next states with the same attributes
+        for shared_attrs, attributes_id in new_attributes_ids.items():
+            self._state_attributes_ids[shared_attrs] = attributes_id
 
     def _handle_sqlite_corruption(self):
         """Handle the sqlite3 database being corrupt."""
         self._close_event_session()
         self._close_connection()
         move_away_broken_database(dburl_to_path(self.db_url))
+        if self.history_cache is not None:
+            self.history_cache.clear(dt_util.utcnow())
         self._setup_recorder()
         self._setup_run()
 
     def _close_event_session(self):
         """Close the event session."""
         self._old_states = {}
+        self._pending_events = []
+        self._pending_states = []
+        self._state_attributes_ids.clear()
 
         if not self.event_session:
             return
@@ -13,3 +13,7 @@ CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 # We can increase this back to 1000 once most
 # have upgraded their sqlite version
 MAX_ROWS_TO_PURGE = 998
+
+# The maximum number of bound parameters in one multi row insert,
+# kept under the same sqlite3 limit
+MAX_BIND_VARS = 998
@@ -11,12 +11,15 @@ from sqlalchemy.ext import baked
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
+    process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.core import split_entity_id
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 
 from .models import LazyState
 
@@ -48,12 +51,24 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
+    StateAttributes.shared_attrs,
     States.last_changed,
     States.last_updated,
 ]
 
+QUERY_STATE_VALUES = [
+    States.entity_id,
+    States.state,
+    States.attributes,
+    StateAttributes.shared_attrs,
+    States.last_updated,
+]
+
 HISTORY_BAKERY = "recorder_history_bakery"
 
+# Rows fetched at a time when the states are yielded per entity
+ITER_STATES_BATCH_SIZE = 1000
+
 
 def async_setup(hass):
     """Set up the history hooks."""
@@ -86,8 +101,170 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
+    cached_states = _cached_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    )
+    if cached_states is not None:
+        return cached_states
+
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def iter_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Yield the significant states of each entity during start_time - end_time.
+
+    The lists are the same as the values of get_significant_states, but the
+    rows are read from the query while they are yielded, so only the states
+    of one entity are held at a time. The entities come in the requested
+    order, or ordered by entity_id if no entity_ids are given.
+    """
+    cached_states = _cached_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    )
+    if cached_states is not None:
+        yield from cached_states.values()
+        return
+
+    start_time_states = {}
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_time_states[state.entity_id] = state
+
+    def _iter_rows(query_entity_ids):
+        """Iterate the rows of the query, fetching them in batches."""
+        query = _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            query_entity_ids,
+            filters,
+            significant_changes_only,
+        )
+        return iter(
+            query.with_post_criteria(lambda q: q.yield_per(ITER_STATES_BATCH_SIZE))
+        )
+
+    if entity_ids is not None:
+        # Query the entities one by one to keep the requested order
+        for ent_id in dict.fromkeys(entity_ids):
+            ent_results = []
+            if ent_id in start_time_states:
+                ent_results.append(start_time_states.pop(ent_id))
+            _append_entity_states(
+                ent_results, ent_id, _iter_rows([ent_id]), minimal_response
+            )
+            if ent_results:
+                yield ent_results
+        return
+
+    # Entities without changes in the period only have their start time state
+    unchanged_entity_ids = sorted(start_time_states)
+    unchanged_idx = 0
+
+    for ent_id, group in groupby(_iter_rows(None), lambda state: state.entity_id):
+        while (
+            unchanged_idx < len(unchanged_entity_ids)
+            and unchanged_entity_ids[unchanged_idx] < ent_id
+        ):
+            unchanged_entity_id = unchanged_entity_ids[unchanged_idx]
+            unchanged_idx += 1
+            if unchanged_entity_id in start_time_states:
+                yield [start_time_states.pop(unchanged_entity_id)]
+
+        ent_results = []
+        if ent_id in start_time_states:
+            ent_results.append(start_time_states.pop(ent_id))
+        _append_entity_states(ent_results, ent_id, group, minimal_response)
+        yield ent_results
+
+    for ent_id in unchanged_entity_ids[unchanged_idx:]:
+        if ent_id in start_time_states:
+            yield [start_time_states.pop(ent_id)]
+
+
+def _cached_significant_states(hass, start_time, *args):
+    """Return the significant states from the history cache if it covers them."""
+    instance = hass.data.get(recorder.DATA_INSTANCE)
+    if instance is None or instance.history_cache is None:
+        return None
+
+    timer_start = time.perf_counter()
+    cached_states = instance.history_cache.significant_states(start_time, *args)
+    if cached_states is not None and _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs from the history cache", elapsed)
+    return cached_states
+
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query of the significant states ordered by entity and time."""
     baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+        lambda session: session.query(*QUERY_STATES).outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
     )
 
     if significant_changes_only:
@@ -115,25 +292,8 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
-
-    return _sorted_states_to_dict(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
 
@@ -141,7 +301,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
         baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
+            lambda session: session.query(*QUERY_STATES).outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
         )
 
         baked_query += lambda q: q.filter(
@@ -155,7 +317,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -177,12 +341,16 @@ def get_last_state_changes(hass, number_of_states, entity_id):
 
     with session_scope(hass=hass) as session:
         baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
+            lambda session: session.query(*QUERY_STATES).outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
         )
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -209,6 +377,71 @@ def get_last_state_changes(hass, number_of_states, entity_id):
         )
 
 
+def get_state_values_during_period(hass, start_time, end_time, entity_ids):
+    """Return the state, attributes and timestamp columns of entities in a period.
+
+    The columns are read straight from the query rows, without creating a state
+    for every row. Rows with the same attributes share one parsed dict. The state
+    of each entity at start_time comes first, timestamped at start_time.
+    """
+    attributes_cache: dict[str | None, dict] = {}
+
+    def _parse_attributes(row):
+        """Return the attributes of a row, parsing each distinct JSON once."""
+        attributes_json = row.shared_attrs or row.attributes
+        if (attributes := attributes_cache.get(attributes_json)) is None:
+            try:
+                attributes = json_loads(attributes_json or "{}")
+            except ValueError:
+                _LOGGER.exception("Error converting row to state: %s", row)
+                attributes = {}
+            attributes_cache[attributes_json] = attributes
+        return attributes
+
+    with session_scope(hass=hass) as session:
+        baked_query = hass.data[HISTORY_BAKERY](
+            lambda session: session.query(*QUERY_STATE_VALUES).outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+        )
+
+        baked_query += lambda q: q.filter(
+            (States.last_changed == States.last_updated)
+            & (States.last_updated > bindparam("start_time"))
+            & (States.last_updated < bindparam("end_time"))
+            & States.entity_id.in_(bindparam("entity_ids", expanding=True))
+        )
+
+        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+
+        rows = execute(
+            baked_query(session).params(
+                start_time=start_time, end_time=end_time, entity_ids=entity_ids
+            )
+        )
+
+        result = {}
+        start_timestamp = start_time.timestamp()
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run
+        ):
+            result[state.entity_id] = (
+                [state.state],
+                [state.attributes],
+                [start_timestamp],
+            )
+
+    for entity_id, group in groupby(rows, lambda row: row.entity_id):
+        states, attributes, timestamps = result.setdefault(entity_id, ([], [], []))
+        for row in group:
+            states.append(row.state or "")
+            attributes.append(_parse_attributes(row))
+            timestamps.append(process_timestamp(row.last_updated).timestamp())
+
+    return result
+
+
 def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None):
     """Return the states at a specific point in time."""
     if run is None:
@@ -276,7 +509,7 @@ def _get_states_with_session(
     query = query.join(
         most_recent_state_ids,
         States.state_id == most_recent_state_ids.c.max_state_id,
-    )
+    ).outerjoin(StateAttributes, States.attributes_id == StateAttributes.attributes_id)
 
     if entity_ids is not None:
         query = query.filter(States.entity_id.in_(entity_ids))
@@ -292,7 +525,9 @@ def _get_single_entity_states_with_session(hass, session, utc_point_in_time, ent
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
     baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+        lambda session: session.query(*QUERY_STATES).outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
     )
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
@@ -350,53 +585,59 @@ def _sorted_states_to_dict(
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
-    # Called in a tight loop so cache the function
-    # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
-
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
-
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
-
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
-
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+        _append_entity_states(result[ent_id], ent_id, group, minimal_response)
 
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
 
 
+def _append_entity_states(ent_results, ent_id, group, minimal_response):
+    """Append the states of one entity from its sorted rows."""
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(LazyState(db_state) for db_state in group)
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if not ent_results:
+        if (db_state := next(group, None)) is None:
+            return
+        ent_results.append(LazyState(db_state))
+
+    prev_state = ent_results[-1]
+    initial_state_count = len(ent_results)
+
+    # Called in a tight loop so cache the function
+    # here
+    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
+
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        ent_results.append(
+            {
+                STATE_KEY: db_state.state,
+                LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                    db_state.last_changed
+                ),
+            }
+        )
+        prev_state = db_state
+
+    if prev_state and len(ent_results) != initial_state_count:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        ent_results[-1] = LazyState(prev_state)
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = get_states(hass, utc_point_in_time, (entity_id,), run)
@@ -0,0 +1,405 @@
+"""In-memory cache of the recently recorded state changes."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime
+from itertools import chain
+import logging
+import sys
+import threading
+from typing import Any
+
+from homeassistant.core import split_entity_id
+import homeassistant.util.dt as dt_util
+
+from .history import (
+    IGNORE_DOMAINS,
+    LAST_CHANGED_KEY,
+    NEED_ATTRIBUTE_DOMAINS,
+    SIGNIFICANT_DOMAINS,
+    STATE_KEY,
+)
+from .models import LazyState
+
+_LOGGER = logging.getLogger(__name__)
+
+# When the cache is full, drop enough of the oldest
+# states to make room for this fraction of the cache
+EVICT_FRACTION = 0.1
+
+
+class CachedState(LazyState):
+    """A LazyState built from a cached state change instead of a database row."""
+
+    __slots__: list[str] = []
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self,
+        entity_id: str,
+        state: str | None,
+        attributes: Mapping[str, Any],
+        last_changed: datetime,
+        last_updated: datetime,
+    ) -> None:
+        """Init the cached state."""
+        self._row = None
+        self.entity_id = entity_id
+        self.state = state or ""
+        self._attributes = attributes
+        self._last_changed = last_changed
+        self._last_updated = last_updated
+        self._context = None
+
+    @property  # type: ignore
+    def attributes(self):
+        """State attributes."""
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, value):
+        """Set attributes."""
+        self._attributes = value
+
+    def as_dict(self):
+        """Return a dict representation of the CachedState."""
+        return {
+            "entity_id": self.entity_id,
+            "state": self.state,
+            "attributes": dict(self._attributes),
+            "last_changed": self._last_changed.isoformat(),
+            "last_updated": self._last_updated.isoformat(),
+        }
+
+
+class _EntityStates:
+    """Columns of the cached state changes of one entity.
+
+    Rows are sorted by last_updated, ties keep the order they were recorded in.
+    """
+
+    __slots__ = ["last_updated", "last_changed", "states", "attributes"]
+
+    def __init__(self) -> None:
+        """Init the columns."""
+        self.last_updated = array("d")
+        self.last_changed = array("d")
+        self.states: list[str | None] = []
+        self.attributes: list[Mapping[str, Any]] = []
+
+    def __len__(self) -> int:
+        """Return the number of cached rows."""
+        return len(self.states)
+
+    def add(
+        self,
+        state: str | None,
+        attributes: Mapping[str, Any],
+        last_changed: float,
+        last_updated: float,
+    ) -> None:
+        """Add a row, reusing the previous attributes if they did not change."""
+        if self.attributes and self.attributes[-1] == attributes:
+            attributes = self.attributes[-1]
+        if state is not None:
+            state = sys.intern(state)
+        if not self.last_updated or last_updated >= self.last_updated[-1]:
+            self.last_updated.append(last_updated)
+            self.last_changed.append(last_changed)
+            self.states.append(state)
+            self.attributes.append(attributes)
+            return
+        idx = bisect_right(self.last_updated, last_updated)
+        self.last_updated.insert(idx, last_updated)
+        self.last_changed.insert(idx, last_changed)
+        self.states.insert(idx, state)
+        self.attributes.insert(idx, attributes)
+
+    def drop_before(self, idx: int) -> None:
+        """Drop all rows before idx."""
+        del self.last_updated[:idx]
+        del self.last_changed[:idx]
+        del self.states[:idx]
+        del self.attributes[:idx]
+
+
+class HistoryCache:
+    """Recently recorded state changes kept in memory by the recorder.
+
+    The cache is filled by the recorder thread after each commit and
+    holds every recorded state change since `window_start`, plus the
+    last state change before it of each entity. Queries for periods that
+    start inside the window are answered from memory, everything else
+    has to go to the database.
+
+    The size is bounded by the number of states, not by memory. The
+    attributes are kept by reference and shared by consecutive states
+    with the same attributes, so entities that change large attributes
+    often take the most memory per state.
+    """
+
+    def __init__(self, max_states: int, window_start: datetime) -> None:
+        """Initialize the cache."""
+        self.max_states = max_states
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entities: dict[str, _EntityStates] = {}
+        self._num_states = 0
+        self._window_start = window_start.timestamp()
+        self._run_start = self._window_start
+
+    @property
+    def window_start(self) -> datetime:
+        """Return the time from which all state changes are cached."""
+        return dt_util.utc_from_timestamp(self._window_start)
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the fraction of the queries answered by the cache."""
+        if not (total := self.hits + self.misses):
+            return None
+        return self.hits / total
+
+    def num_attributes(self) -> int:
+        """Return the number of distinct attributes the cached states refer to."""
+        with self._lock:
+            return len(
+                {
+                    id(attributes)
+                    for entity_states in self._entities.values()
+                    for attributes in entity_states.attributes
+                }
+            )
+
+    def info(self) -> dict[str, Any]:
+        """Return the size and usage of the cache."""
+        return {
+            "states": self._num_states,
+            "max_states": self.max_states,
+            "entities": len(self._entities),
+            "window_start": self.window_start,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    def add_states(self, state_rows: Iterable[tuple[dict[str, Any], Mapping]]) -> None:
+        """Add committed state rows and their attributes."""
+        with self._lock:
+            for state_row, attributes in state_rows:
+                entity_id = state_row["entity_id"]
+                if (entity_states := self._entities.get(entity_id)) is None:
+                    entity_states = self._entities[entity_id] = _EntityStates()
+                entity_states.add(
+                    state_row["state"],
+                    attributes,
+                    state_row["last_changed"].timestamp(),
+                    state_row["last_updated"].timestamp(),
+                )
+                self._num_states += 1
+            if self._num_states > self.max_states:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Move the window start forward to make room for new states."""
+        num_to_drop = self._num_states - int(self.max_states * (1 - EVICT_FRACTION))
+        timestamps = sorted(
+            chain.from_iterable(
+                entity_states.last_updated for entity_states in self._entities.values()
+            )
+        )
+        # The last state before the window of each entity is kept
+        # so the state at the start of a period can be found
+        cut = timestamps[min(num_to_drop + len(self._entities), len(timestamps) - 1)]
+        self._window_start = max(self._window_start, cut)
+        for entity_states in self._entities.values():
+            if (idx := bisect_left(entity_states.last_updated, cut)) > 1:
+                entity_states.drop_before(idx - 1)
+        self._num_states = sum(map(len, self._entities.values()))
+        _LOGGER.debug(
+            "Evicted history cache states before %s, %d states left",
+            self.window_start,
+            self._num_states,
+        )
+
+    def purge(self, purge_before: datetime) -> None:
+        """Drop all states purged from the database."""
+        cut = purge_before.timestamp()
+        with self._lock:
+            self._window_start = max(self._window_start, cut)
+            for entity_id, entity_states in list(self._entities.items()):
+                entity_states.drop_before(bisect_left(entity_states.last_updated, cut))
+                if not entity_states:
+                    del self._entities[entity_id]
+            self._num_states = sum(map(len, self._entities.values()))
+
+    def purge_entities(self, entity_filter: Callable[[str], bool]) -> None:
+        """Drop all states of the entities purged from the database."""
+        with self._lock:
+            for entity_id in list(self._entities):
+                if entity_filter(entity_id):
+                    self._num_states -= len(self._entities.pop(entity_id))
+
+    def clear(self, window_start: datetime) -> None:
+        """Drop all states and start a new window."""
+        with self._lock:
+            self._entities.clear()
+            self._num_states = 0
+            self._window_start = self._run_start = window_start.timestamp()
+
+    def significant_states(
+        self,
+        start_time: datetime,
+        end_time: datetime | None = None,
+        entity_ids: list[str] | None = None,
+        filters: Any = None,
+        include_start_time_state: bool = True,
+        significant_changes_only: bool = True,
+        minimal_response: bool = False,
+    ) -> dict[str, list[LazyState | dict[str, Any]]] | None:
+        """Return the same result as history.get_significant_states.
+
+        Returns None if the period is not covered by the cache.
+        """
+        with self._lock:
+            result = self._significant_states(
+                start_time,
+                end_time,
+                entity_ids,
+                filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            )
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def _significant_states(  # noqa: C901
+        self,
+        start_time: datetime,
+        end_time: datetime | None,
+        entity_ids: list[str] | None,
+        filters: Any,
+        include_start_time_state: bool,
+        significant_changes_only: bool,
+        minimal_response: bool,
+    ) -> dict[str, list[LazyState | dict[str, Any]]] | None:
+        """Answer a significant states query from the cache."""
+        start_ts = start_time.timestamp()
+        if start_ts <= self._window_start:
+            return None
+        end_ts = end_time.timestamp() if end_time is not None else float("inf")
+
+        if entity_ids is None:
+            entity_ids_to_query: Iterable[str] = sorted(
+                entity_id
+                for entity_id in self._entities
+                if split_entity_id(entity_id)[0] not in IGNORE_DOMAINS
+                and (
+                    not filters
+                    or not filters.has_config
+                    or filters.entity_matches(entity_id)
+                )
+            )
+        else:
+            entity_ids_to_query = entity_ids
+
+        # Outside the cache a single entity can find its start
+        # state in the previous runs of the recorder
+        single_entity = entity_ids is not None and len(entity_ids) == 1
+
+        result: dict[str, list[LazyState | dict[str, Any]]] = {}
+        utc_from_timestamp = dt_util.utc_from_timestamp
+        for entity_id in entity_ids_to_query:
+            ent_results: list[LazyState | dict[str, Any]] = []
+            result[entity_id] = ent_results
+            if (entity_states := self._entities.get(entity_id)) is None:
+                if single_entity and include_start_time_state:
+                    return None
+                continue
+
+            last_updated = entity_states.last_updated
+            last_changed = entity_states.last_changed
+            states = entity_states.states
+
+            if include_start_time_state:
+                idx = bisect_left(last_updated, start_ts) - 1
+                if idx >= 0 and (single_entity or last_updated[idx] >= self._run_start):
+                    ent_results.append(
+                        CachedState(
+                            entity_id,
+                            states[idx],
+                            entity_states.attributes[idx],
+                            start_time,
+                            start_time,
+                        )
+                    )
+                elif single_entity:
+                    return None
+
+            domain = split_entity_id(entity_id)[0]
+            significant_domain = not significant_changes_only or (
+                domain in SIGNIFICANT_DOMAINS
+            )
+            rows = [
+                idx
+                for idx in range(
+                    bisect_right(last_updated, start_ts),
+                    bisect_left(last_updated, end_ts),
+                )
+                if significant_domain or last_changed[idx] == last_updated[idx]
+            ]
+            if not rows:
+                continue
+
+            if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+                ent_results.extend(
+                    _cached_state(entity_id, entity_states, idx) for idx in rows
+                )
+                continue
+
+            # With minimal response only the first and the last
+            # state are full states, the states in-between only
+            # provide the "state" and the "last_changed".
+            rows_iter = iter(rows)
+            if not ent_results:
+                ent_results.append(
+                    _cached_state(entity_id, entity_states, next(rows_iter))
+                )
+            prev_state = ent_results[-1].state  # type: ignore[union-attr]
+            prev_idx = None
+            for idx in rows_iter:
+                if states[idx] == prev_state:
+                    continue
+                ent_results.append(
+                    {
+                        STATE_KEY: states[idx],
+                        LAST_CHANGED_KEY: utc_from_timestamp(
+                            last_changed[idx]
+                        ).isoformat(),
+                    }
+                )
+                prev_state = states[idx]
+                prev_idx = idx
+            if prev_idx is not None:
+                ent_results[-1] = _cached_state(entity_id, entity_states, prev_idx)
+
+        return {key: val for key, val in result.items() if val}
+
+
+def _cached_state(
+    entity_id: str, entity_states: _EntityStates, idx: int
+) -> CachedState:
+    """Return a cached row as a state."""
+    return CachedState(
+        entity_id,
+        entity_states.states[idx],
+        entity_states.attributes[idx],
+        dt_util.utc_from_timestamp(entity_states.last_changed[idx]),
+        dt_util.utc_from_timestamp(entity_states.last_updated[idx]),
+    )
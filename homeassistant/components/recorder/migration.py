@@ -22,7 +22,11 @@ from .models import (
     Statistics,
     StatisticsMeta,
     StatisticsRuns,
+    StatisticsShortTerm,
+    StatisticsShortTermRuns,
+    process_timestamp,
 )
+from .statistics import get_start_time
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -351,7 +355,7 @@ def _drop_foreign_key_constraints(connection, engine, table, columns):
             )
 
 
-def _apply_update(engine, session, new_version, old_version):
+def _apply_update(engine, session, new_version, old_version):  # noqa: C901
     """Perform operations to bring schema up to date."""
     connection = session.connection()
     if new_version == 1:
@@ -486,6 +490,27 @@ def _apply_update(engine, session, new_version, old_version):
         start = now.replace(minute=0, second=0, microsecond=0)
         start = start - timedelta(hours=1)
         session.add(StatisticsRuns(start=start))
+    elif new_version == 20:
+        # The state_attributes table is created by create_all
+        # when the connection is set up, only the states table
+        # needs to learn about it. Existing states keep their
+        # attributes in the attributes column.
+        _add_columns(connection, "states", ["attributes_id INTEGER"])
+        _create_index(connection, "states", "ix_states_attributes_id")
+    elif new_version == 21:
+        # The statistics_short_term tables are created by create_all
+        # when the connection is set up. Insert a fake 5-minute run at
+        # the end of the last hour compiled from the states, so the
+        # 5-minute statistics are compiled from the next hour on and the
+        # first hour summarized from them is complete.
+        last_run = session.query(sqlalchemy.func.max(StatisticsRuns.start)).scalar()
+        if last_run is None:
+            hour_start = get_start_time().replace(minute=0)
+        else:
+            hour_start = process_timestamp(last_run) + Statistics.duration
+        session.add(
+            StatisticsShortTermRuns(start=hour_start - StatisticsShortTerm.duration)
+        )
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -505,10 +530,7 @@ def _inspect_schema_version(engine, session):
     for index in indexes:
         if index["column_names"] == ["time_fired"]:
             # Schema addition from version 1 detected. New DB.
-            now = dt_util.utcnow()
-            start = now.replace(minute=0, second=0, microsecond=0)
-            start = start - timedelta(hours=1)
-            session.add(StatisticsRuns(start=start))
+            session.add(StatisticsShortTermRuns(start=get_start_time()))
             session.add(SchemaChanges(schema_version=SCHEMA_VERSION))
             return SCHEMA_VERSION
 
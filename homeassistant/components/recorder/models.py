@@ -1,12 +1,13 @@
 """Models for SQLAlchemy."""
 from __future__ import annotations
 
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
 import logging
-from typing import TypedDict
+from typing import Any, TypedDict
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -20,7 +21,7 @@ from sqlalchemy import (
     distinct,
 )
 from sqlalchemy.dialects import mysql
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, declared_attr, relationship
 from sqlalchemy.orm.session import Session
 
 from homeassistant.const import (
@@ -34,12 +35,13 @@ from homeassistant.const import (
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_dumps, json_loads
 
 # SQLAlchemy Schema
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 19
+SCHEMA_VERSION = 21
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,20 +49,26 @@ DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
+TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+TABLE_STATISTICS_SHORT_TERM_RUNS = "statistics_short_term_runs"
 
 ALL_TABLES = [
     TABLE_STATES,
+    TABLE_STATE_ATTRIBUTES,
     TABLE_EVENTS,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
     TABLE_STATISTICS,
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
+    TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_SHORT_TERM_RUNS,
 ]
 
 DATETIME_TYPE = DateTime(timezone=True).with_variant(
@@ -100,16 +108,24 @@ class Events(Base):  # type: ignore
     @staticmethod
     def from_event(event, event_data=None):
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=event_data
-            or json.dumps(event.data, cls=JSONEncoder, separators=(",", ":")),
-            origin=str(event.origin.value),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.row_from_event(event, event_data))
+
+    @staticmethod
+    def row_from_event(event, event_data=None) -> dict[str, Any]:
+        """Create the column values of an event row from a native event.
+
+        Used to insert events without going through the ORM.
+        """
+        return {
+            "event_type": event.event_type,
+            "event_data": event_data or json_dumps(event.data, encoder=JSONEncoder),
+            "origin": str(event.origin.value),
+            "time_fired": event.time_fired,
+            "created": event.time_fired,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to a native HA Event."""
@@ -121,7 +137,7 @@ class Events(Base):  # type: ignore
         try:
             return Event(
                 self.event_type,
-                json.loads(self.event_data),
+                json_loads(self.event_data),
                 EventOrigin(self.origin),
                 process_timestamp(self.time_fired),
                 context=context,
@@ -154,8 +170,12 @@ class States(Base):  # type: ignore
     last_updated = Column(DATETIME_TYPE, default=dt_util.utcnow, index=True)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
     old_state_id = Column(Integer, ForeignKey("states.state_id"), index=True)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
+    state_attributes = relationship("StateAttributes")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -164,43 +184,63 @@ class States(Base):  # type: ignore
             f"id={self.state_id}, domain='{self.domain}', entity_id='{self.entity_id}', "
             f"state='{self.state}', event_id='{self.event_id}', "
             f"last_updated='{self.last_updated.isoformat(sep=' ', timespec='seconds')}', "
-            f"old_state_id={self.old_state_id}"
+            f"old_state_id={self.old_state_id}, attributes_id={self.attributes_id}"
             f")>"
         )
 
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The attributes are not set here, they are stored in the
+        state_attributes table (see StateAttributes).
+        """
+        return States(**States.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event) -> dict[str, Any]:
+        """Create the column values of a state row from a state_changed event.
+
+        Used to insert states without going through the ORM.
+        """
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
-        else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(
-                dict(state.attributes), cls=JSONEncoder, separators=(",", ":")
-            )
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
+            return {
+                "entity_id": entity_id,
+                "domain": split_entity_id(entity_id)[0],
+                "state": "",
+                "attributes": None,
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+            }
 
-        return dbstate
+        return {
+            "entity_id": entity_id,
+            "domain": state.domain,
+            "state": state.state,
+            "attributes": None,
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
+        # States recorded before schema 20 carry their own attributes,
+        # newer ones reference a row in the state_attributes table.
+        if self.attributes:
+            attributes_json = self.attributes
+        elif self.state_attributes is not None:
+            attributes_json = self.state_attributes.shared_attrs
+        else:
+            attributes_json = "{}"
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json_loads(attributes_json),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 # Join the events table on event_id to get the context instead
@@ -214,6 +254,64 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """Deduplicated state attributes shared between states."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, Identity(), primary_key=True)
+    hash = Column(BigInteger, index=True)
+    # Not named attributes to avoid confusion with the states table
+    shared_attrs = Column(Text().with_variant(mysql.LONGTEXT, "mysql"))
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StateAttributes("
+            f"id={self.attributes_id}, hash='{self.hash}', attributes='{self.shared_attrs}'"
+            f")>"
+        )
+
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        return StateAttributes(
+            shared_attrs=shared_attrs,
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+        )
+
+    @staticmethod
+    def shared_attrs_from_event(event) -> str:
+        """Create shared_attrs from a state_changed event."""
+        state = event.data.get("new_state")
+        # State got deleted
+        if state is None:
+            return "{}"
+        try:
+            # Shared with everything else serializing the state
+            return state.attributes_json()
+        except ValueError:
+            # NaN and infinity are not valid JSON but were always recorded
+            return json_dumps(dict(state.attributes), encoder=JSONEncoder)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs: str) -> int:
+        """Return the hash of the json encoded shared attributes."""
+        return zlib.crc32(shared_attrs.encode("utf-8"))
+
+    def to_native(self):
+        """Convert to a dict of state attributes."""
+        try:
+            return json_loads(self.shared_attrs)
+        except ValueError:
+            # When json.loads fails
+            _LOGGER.exception("Error converting row to state attributes: %s", self)
+            return {}
+
+
 class StatisticData(TypedDict, total=False):
     """Statistic data class."""
 
@@ -224,21 +322,21 @@ class StatisticData(TypedDict, total=False):
     sum: float
 
 
-class Statistics(Base):  # type: ignore
-    """Statistics."""
+class StatisticsBase:
+    """Statistics base class."""
 
-    __table_args__ = (
-        # Used for fetching statistics for a certain entity at a specific time
-        Index("ix_statistics_statistic_id_start", "metadata_id", "start"),
-    )
-    __tablename__ = TABLE_STATISTICS
     id = Column(Integer, primary_key=True)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
-    metadata_id = Column(
-        Integer,
-        ForeignKey(f"{TABLE_STATISTICS_META}.id", ondelete="CASCADE"),
-        index=True,
-    )
+
+    @declared_attr
+    def metadata_id(self):
+        """Define the metadata_id column for sub classes."""
+        return Column(
+            Integer,
+            ForeignKey(f"{TABLE_STATISTICS_META}.id", ondelete="CASCADE"),
+            index=True,
+        )
+
     start = Column(DATETIME_TYPE, index=True)
     mean = Column(Float())
     min = Column(Float())
@@ -246,16 +344,43 @@ class Statistics(Base):  # type: ignore
     state = Column(Float())
     sum = Column(Float())
 
-    @staticmethod
-    def from_stats(metadata_id: str, start: datetime, stats: StatisticData):
+    # The length of the period a row summarizes
+    duration: timedelta
+
+    @classmethod
+    def from_stats(cls, metadata_id: str, start: datetime, stats: StatisticData):
         """Create object from a statistics."""
-        return Statistics(
+        return cls(  # type: ignore
             metadata_id=metadata_id,
             start=start,
             **stats,
         )
 
 
+class Statistics(Base, StatisticsBase):  # type: ignore
+    """Hourly statistics, summarized from the short-term statistics."""
+
+    duration = timedelta(hours=1)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index("ix_statistics_statistic_id_start", "metadata_id", "start"),
+    )
+    __tablename__ = TABLE_STATISTICS
+
+
+class StatisticsShortTerm(Base, StatisticsBase):  # type: ignore
+    """Short-term statistics, compiled from the states every 5 minutes."""
+
+    duration = timedelta(minutes=5)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index("ix_statistics_short_term_statistic_id_start", "metadata_id", "start"),
+    )
+    __tablename__ = TABLE_STATISTICS_SHORT_TERM
+
+
 class StatisticMetaData(TypedDict, total=False):
     """Statistic meta data class."""
 
@@ -361,22 +486,33 @@ class SchemaChanges(Base):  # type: ignore
         )
 
 
-class StatisticsRuns(Base):  # type: ignore
-    """Representation of statistics run."""
+class StatisticsRunsBase:
+    """Statistics run base class."""
 
-    __tablename__ = TABLE_STATISTICS_RUNS
     run_id = Column(Integer, primary_key=True)
     start = Column(DateTime(timezone=True))
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
         return (
-            f"<recorder.StatisticsRuns("
+            f"<recorder.{self.__class__.__name__}("
             f"id={self.run_id}, start='{self.start.isoformat(sep=' ', timespec='seconds')}', "
             f")>"
         )
 
 
+class StatisticsRuns(Base, StatisticsRunsBase):  # type: ignore
+    """Representation of an hourly statistics run."""
+
+    __tablename__ = TABLE_STATISTICS_RUNS
+
+
+class StatisticsShortTermRuns(Base, StatisticsRunsBase):  # type: ignore
+    """Representation of a 5-minute statistics run."""
+
+    __tablename__ = TABLE_STATISTICS_SHORT_TERM_RUNS
+
+
 def process_timestamp(ts):
     """Process a timestamp into datetime object."""
     if ts is None:
@@ -426,7 +562,9 @@ class LazyState(State):
         """State attributes."""
         if not self._attributes:
             try:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json_loads(
+                    self._row.shared_attrs or self._row.attributes
+                )
             except ValueError:
                 # When json.loads fails
                 _LOGGER.exception("Error converting row to state: %s", self._row)
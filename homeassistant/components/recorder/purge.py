@@ -9,7 +9,7 @@ from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
 from .const import MAX_ROWS_TO_PURGE
-from .models import Events, RecorderRuns, States
+from .models import Events, RecorderRuns, StateAttributes, States, StatisticsShortTerm
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
 
@@ -35,11 +35,22 @@ def purge_old_data(
     with session_scope(session=instance.get_session()) as session:  # type: ignore
         # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
         event_ids = _select_event_ids_to_purge(session, purge_before)
-        state_ids = _select_state_ids_to_purge(session, purge_before, event_ids)
+        state_ids, attributes_ids = _select_state_and_attributes_ids_to_purge(
+            session, purge_before, event_ids
+        )
         if state_ids:
             _purge_state_ids(session, state_ids)
+        if unused_attributes_ids := _select_unused_attributes_ids(
+            session, attributes_ids
+        ):
+            _purge_attributes_ids(instance, session, unused_attributes_ids)
         if event_ids:
             _purge_event_ids(session, event_ids)
+        if short_term_statistics := _select_short_term_statistics_to_purge(
+            session, purge_before
+        ):
+            _purge_short_term_statistics(session, short_term_statistics)
+        if event_ids or short_term_statistics:
             # If states or events purging isn't processing the purge_before yet,
             # return false, as we are not done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
@@ -65,23 +76,67 @@ def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list
     return [event.event_id for event in events]
 
 
-def _select_state_ids_to_purge(
-    session: Session, purge_before: datetime, event_ids: list[int]
+def _select_short_term_statistics_to_purge(
+    session: Session, purge_before: datetime
 ) -> list[int]:
-    """Return a list of state ids to purge."""
+    """Return a list of short term statistics to purge."""
+    statistics = (
+        session.query(StatisticsShortTerm.id)
+        .filter(StatisticsShortTerm.start < purge_before)
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
+    )
+    _LOGGER.debug("Selected %s short term statistics to remove", len(statistics))
+    return [statistic.id for statistic in statistics]
+
+
+def _select_state_and_attributes_ids_to_purge(
+    session: Session, purge_before: datetime, event_ids: list[int]
+) -> tuple[set[int], set[int]]:
+    """Return a list of state ids and attributes ids to purge."""
     if not event_ids:
-        return []
+        return set(), set()
     states = (
-        session.query(States.state_id)
+        session.query(States.state_id, States.attributes_id)
         .filter(States.last_updated < purge_before)
         .filter(States.event_id.in_(event_ids))
         .all()
     )
     _LOGGER.debug("Selected %s state ids to remove", len(states))
-    return [state.state_id for state in states]
+    return _split_state_and_attributes_ids(states)
+
+
+def _split_state_and_attributes_ids(states: list) -> tuple[set[int], set[int]]:
+    """Split state rows into state ids and the attributes ids they reference."""
+    state_ids = set()
+    attributes_ids = set()
+    for state in states:
+        state_ids.add(state.state_id)
+        if state.attributes_id:
+            attributes_ids.add(state.attributes_id)
+    return state_ids, attributes_ids
+
+
+def _select_unused_attributes_ids(
+    session: Session, attributes_ids: set[int]
+) -> set[int]:
+    """Return the attributes ids that are no longer used by any state."""
+    if not attributes_ids:
+        return set()
+    seen_ids = {
+        state.attributes_id
+        for state in session.query(
+            distinct(States.attributes_id).label("attributes_id")
+        )
+        .filter(States.attributes_id.in_(attributes_ids))
+        .all()
+    }
+    unused_ids = attributes_ids - seen_ids
+    _LOGGER.debug("Selected %s shared attributes to remove", len(unused_ids))
+    return unused_ids
 
 
-def _purge_state_ids(session: Session, state_ids: list[int]) -> None:
+def _purge_state_ids(session: Session, state_ids: set[int]) -> None:
     """Disconnect states and delete by state id."""
 
     # Update old_state_id to NULL before deleting to ensure
@@ -103,6 +158,23 @@ def _purge_state_ids(session: Session, state_ids: list[int]) -> None:
     _LOGGER.debug("Deleted %s states", deleted_rows)
 
 
+def _purge_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: set[int]
+) -> None:
+    """Delete shared attributes by attributes id."""
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(attributes_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s attribute states", deleted_rows)
+
+    # Make sure the recorder does not link new states to a purged row
+    instance._evict_purged_state_attributes(  # pylint: disable=protected-access
+        attributes_ids
+    )
+
+
 def _purge_event_ids(session: Session, event_ids: list[int]) -> None:
     """Delete by event id."""
     deleted_rows = (
@@ -113,6 +185,18 @@ def _purge_event_ids(session: Session, event_ids: list[int]) -> None:
     _LOGGER.debug("Deleted %s events", deleted_rows)
 
 
+def _purge_short_term_statistics(
+    session: Session, short_term_statistics: list[int]
+) -> None:
+    """Delete by id."""
+    deleted_rows = (
+        session.query(StatisticsShortTerm)
+        .filter(StatisticsShortTerm.id.in_(short_term_statistics))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
+
+
 def _purge_old_recorder_runs(
     instance: Recorder, session: Session, purge_before: datetime
 ) -> None:
@@ -138,7 +222,7 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
         if not instance.entity_filter(entity_id)
     ]
     if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(session, excluded_entity_ids)
+        _purge_filtered_states(instance, session, excluded_entity_ids)
         return False
 
     # Check if excluded event_types are in database
@@ -148,33 +232,36 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
         if event_type in instance.exclude_t
     ]
     if len(excluded_event_types) > 0:
-        _purge_filtered_events(session, excluded_event_types)
+        _purge_filtered_events(instance, session, excluded_event_types)
         return False
 
     return True
 
 
-def _purge_filtered_states(session: Session, excluded_entity_ids: list[str]) -> None:
+def _purge_filtered_states(
+    instance: Recorder, session: Session, excluded_entity_ids: list[str]
+) -> None:
     """Remove filtered states and linked events."""
-    state_ids: list[int]
-    event_ids: list[int | None]
-    state_ids, event_ids = zip(
-        *(
-            session.query(States.state_id, States.event_id)
-            .filter(States.entity_id.in_(excluded_entity_ids))
-            .limit(MAX_ROWS_TO_PURGE)
-            .all()
-        )
+    states = (
+        session.query(States.state_id, States.attributes_id, States.event_id)
+        .filter(States.entity_id.in_(excluded_entity_ids))
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
     )
-    event_ids = [id_ for id_ in event_ids if id_ is not None]
+    state_ids, attributes_ids = _split_state_and_attributes_ids(states)
+    event_ids = [state.event_id for state in states if state.event_id is not None]
     _LOGGER.debug(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
     )
     _purge_state_ids(session, state_ids)
-    _purge_event_ids(session, event_ids)  # type: ignore  # type of event_ids already narrowed to 'list[int]'
+    _purge_event_ids(session, event_ids)
+    if unused_attributes_ids := _select_unused_attributes_ids(session, attributes_ids):
+        _purge_attributes_ids(instance, session, unused_attributes_ids)
 
 
-def _purge_filtered_events(session: Session, excluded_event_types: list[str]) -> None:
+def _purge_filtered_events(
+    instance: Recorder, session: Session, excluded_event_types: list[str]
+) -> None:
     """Remove filtered events and linked states."""
     events: list[Events] = (
         session.query(Events.event_id)
@@ -186,12 +273,16 @@ def _purge_filtered_events(session: Session, excluded_event_types: list[str]) ->
     _LOGGER.debug(
         "Selected %s event_ids to remove that should be filtered", len(event_ids)
     )
-    states: list[States] = (
-        session.query(States.state_id).filter(States.event_id.in_(event_ids)).all()
+    states = (
+        session.query(States.state_id, States.attributes_id)
+        .filter(States.event_id.in_(event_ids))
+        .all()
     )
-    state_ids: list[int] = [state.state_id for state in states]
+    state_ids, attributes_ids = _split_state_and_attributes_ids(states)
     _purge_state_ids(session, state_ids)
     _purge_event_ids(session, event_ids)
+    if unused_attributes_ids := _select_unused_attributes_ids(session, attributes_ids):
+        _purge_attributes_ids(instance, session, unused_attributes_ids)
 
 
 @retryable_database_job("purge")
@@ -206,7 +297,7 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
         _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
         if len(selected_entity_ids) > 0:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-            _purge_filtered_states(session, selected_entity_ids)
+            _purge_filtered_states(instance, session, selected_entity_ids)
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
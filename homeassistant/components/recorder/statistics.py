@@ -2,10 +2,10 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import datetime
 from itertools import groupby
 import logging
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any, Callable, Literal
 
 from sqlalchemy import bindparam
 from sqlalchemy.ext import baked
@@ -27,10 +27,13 @@ import homeassistant.util.volume as volume_util
 
 from .const import DOMAIN
 from .models import (
+    StatisticData,
     StatisticMetaData,
     Statistics,
     StatisticsMeta,
     StatisticsRuns,
+    StatisticsShortTerm,
+    StatisticsShortTermRuns,
     process_timestamp_to_utc_isoformat,
 )
 from .util import execute, retryable_database_job, session_scope
@@ -48,6 +51,16 @@ QUERY_STATISTICS = [
     Statistics.sum,
 ]
 
+QUERY_STATISTICS_SHORT_TERM = [
+    StatisticsShortTerm.metadata_id,
+    StatisticsShortTerm.start,
+    StatisticsShortTerm.mean,
+    StatisticsShortTerm.min,
+    StatisticsShortTerm.max,
+    StatisticsShortTerm.state,
+    StatisticsShortTerm.sum,
+]
+
 QUERY_STATISTIC_META = [
     StatisticsMeta.id,
     StatisticsMeta.statistic_id,
@@ -56,6 +69,18 @@ QUERY_STATISTIC_META = [
 
 STATISTICS_BAKERY = "recorder_statistics_bakery"
 STATISTICS_META_BAKERY = "recorder_statistics_bakery"
+STATISTICS_SHORT_TERM_BAKERY = "recorder_statistics_short_term_bakery"
+
+# The tables the statistics of each period are stored in
+PERIOD_TABLES: dict[str, type[Statistics | StatisticsShortTerm]] = {
+    "5minute": StatisticsShortTerm,
+    "hourly": Statistics,
+}
+# The tables the compiled periods are recorded in
+PERIOD_RUN_TABLES: dict[str, type[StatisticsRuns | StatisticsShortTermRuns]] = {
+    "5minute": StatisticsShortTermRuns,
+    "hourly": StatisticsRuns,
+}
 
 # Convert pressure and temperature statistics from the native unit used for statistics
 # to the units configured by the user
@@ -84,6 +109,7 @@ def async_setup(hass: HomeAssistant) -> None:
     """Set up the history hooks."""
     hass.data[STATISTICS_BAKERY] = baked.bakery()
     hass.data[STATISTICS_META_BAKERY] = baked.bakery()
+    hass.data[STATISTICS_SHORT_TERM_BAKERY] = baked.bakery()
 
     def entity_id_changed(event: Event) -> None:
         """Handle entity_id changed."""
@@ -112,10 +138,12 @@ def async_setup(hass: HomeAssistant) -> None:
 
 
 def get_start_time() -> datetime:
-    """Return start time."""
-    last_hour = dt_util.utcnow() - timedelta(hours=1)
-    start = last_hour.replace(minute=0, second=0, microsecond=0)
-    return start
+    """Return the start time of the last complete 5-minute period."""
+    now = dt_util.utcnow()
+    current_period = now.replace(
+        minute=now.minute - now.minute % 5, second=0, microsecond=0
+    )
+    return current_period - StatisticsShortTerm.duration
 
 
 def _get_metadata_ids(
@@ -152,14 +180,63 @@ def _get_or_add_metadata_id(
     return metadata_id[0]
 
 
+def _compile_hourly_statistics(
+    hass: HomeAssistant, session: scoped_session, start: datetime
+) -> None:
+    """Summarize the short-term statistics of an hour in the hourly statistics.
+
+    The mean is the average of the 5-minute means, min and max are the
+    extremes of the hour and the state and sum are those at the end of
+    the last 5-minute period.
+    """
+    end = start + Statistics.duration
+
+    baked_query = hass.data[STATISTICS_SHORT_TERM_BAKERY](
+        lambda session: session.query(*QUERY_STATISTICS_SHORT_TERM)
+    )
+    baked_query += lambda q: q.filter(
+        StatisticsShortTerm.start >= bindparam("start_time")
+    )
+    baked_query += lambda q: q.filter(StatisticsShortTerm.start < bindparam("end_time"))
+    baked_query += lambda q: q.order_by(
+        StatisticsShortTerm.metadata_id, StatisticsShortTerm.start
+    )
+    stats = execute(baked_query(session).params(start_time=start, end_time=end))
+
+    for metadata_id, group in groupby(stats or [], lambda stat: stat.metadata_id):
+        rows = list(group)
+        means = [row.mean for row in rows if row.mean is not None]
+        mins = [row.min for row in rows if row.min is not None]
+        maxes = [row.max for row in rows if row.max is not None]
+        summary: StatisticData = {
+            "mean": sum(means) / len(means) if means else None,
+            "min": min(mins) if mins else None,
+            "max": max(maxes) if maxes else None,
+            "state": rows[-1].state,
+            "sum": rows[-1].sum,
+        }
+        session.add(Statistics.from_stats(metadata_id, start, summary))
+
+
 @retryable_database_job("statistics")
-def compile_statistics(instance: Recorder, start: datetime) -> bool:
-    """Compile statistics."""
+def compile_statistics(
+    instance: Recorder, start: datetime, period: str = "5minute"
+) -> bool:
+    """Compile statistics for a period.
+
+    The 5-minute statistics are compiled from the states by the platforms.
+    Once the last 5-minute period of an hour is compiled, the hourly
+    statistics are summarized from the short-term statistics instead of
+    going through the states of the whole hour again. Hourly statistics
+    can also be compiled from the states directly to fill in the past.
+    """
+    table = PERIOD_TABLES[period]
+    run_table = PERIOD_RUN_TABLES[period]
     start = dt_util.as_utc(start)
-    end = start + timedelta(hours=1)
+    end = start + table.duration
 
     with session_scope(session=instance.get_session()) as session:  # type: ignore
-        if session.query(StatisticsRuns).filter_by(start=start).first():
+        if session.query(run_table).filter_by(start=start).first():
             _LOGGER.debug("Statistics already compiled for %s-%s", start, end)
             return True
 
@@ -179,8 +256,15 @@ def compile_statistics(instance: Recorder, start: datetime) -> bool:
                 metadata_id = _get_or_add_metadata_id(
                     instance.hass, session, entity_id, stat["meta"]
                 )
-                session.add(Statistics.from_stats(metadata_id, start, stat["stat"]))
-        session.add(StatisticsRuns(start=start))
+                session.add(table.from_stats(metadata_id, start, stat["stat"]))
+        if table is StatisticsShortTerm and end.minute == 0:
+            hour_start = end - Statistics.duration
+            if not session.query(StatisticsRuns).filter_by(start=hour_start).first():
+                # Make the short-term statistics of the hour visible to the summary
+                session.flush()
+                _compile_hourly_statistics(instance.hass, session, hour_start)
+                session.add(StatisticsRuns(start=hour_start))
+        session.add(run_table(start=start))
 
     return True
 
@@ -279,6 +363,7 @@ def statistics_during_period(
     start_time: datetime,
     end_time: datetime | None = None,
     statistic_ids: list[str] | None = None,
+    period: Literal["5minute", "hourly"] = "hourly",
 ) -> dict[str, list[dict[str, str]]]:
     """Return states changes during UTC period start_time - end_time."""
     metadata = None
@@ -287,23 +372,29 @@ def statistics_during_period(
         if not metadata:
             return {}
 
-        baked_query = hass.data[STATISTICS_BAKERY](
-            lambda session: session.query(*QUERY_STATISTICS)
-        )
+        if period == "5minute":
+            bakery = STATISTICS_SHORT_TERM_BAKERY
+            base_query = QUERY_STATISTICS_SHORT_TERM
+        else:
+            bakery = STATISTICS_BAKERY
+            base_query = QUERY_STATISTICS
+        table = PERIOD_TABLES[period]
+
+        baked_query = hass.data[bakery](lambda session: session.query(*base_query))
 
-        baked_query += lambda q: q.filter(Statistics.start >= bindparam("start_time"))
+        baked_query += lambda q: q.filter(table.start >= bindparam("start_time"))
 
         if end_time is not None:
-            baked_query += lambda q: q.filter(Statistics.start < bindparam("end_time"))
+            baked_query += lambda q: q.filter(table.start < bindparam("end_time"))
 
         metadata_ids = None
         if statistic_ids is not None:
             baked_query += lambda q: q.filter(
-                Statistics.metadata_id.in_(bindparam("metadata_ids"))
+                table.metadata_id.in_(bindparam("metadata_ids"))
             )
             metadata_ids = list(metadata.keys())
 
-        baked_query += lambda q: q.order_by(Statistics.metadata_id, Statistics.start)
+        baked_query += lambda q: q.order_by(table.metadata_id, table.start)
 
         stats = execute(
             baked_query(session).params(
@@ -315,8 +406,11 @@ def statistics_during_period(
         return _sorted_statistics_to_dict(hass, stats, statistic_ids, metadata)
 
 
-def get_last_statistics(
-    hass: HomeAssistant, number_of_stats: int, statistic_id: str
+def _get_last_statistics(
+    hass: HomeAssistant,
+    number_of_stats: int,
+    statistic_id: str,
+    period: Literal["5minute", "hourly"],
 ) -> dict[str, list[dict]]:
     """Return the last number_of_stats statistics for a statistic_id."""
     statistic_ids = [statistic_id]
@@ -325,16 +419,20 @@ def get_last_statistics(
         if not metadata:
             return {}
 
-        baked_query = hass.data[STATISTICS_BAKERY](
-            lambda session: session.query(*QUERY_STATISTICS)
-        )
+        if period == "5minute":
+            bakery = STATISTICS_SHORT_TERM_BAKERY
+            base_query = QUERY_STATISTICS_SHORT_TERM
+        else:
+            bakery = STATISTICS_BAKERY
+            base_query = QUERY_STATISTICS
+        table = PERIOD_TABLES[period]
+
+        baked_query = hass.data[bakery](lambda session: session.query(*base_query))
 
         baked_query += lambda q: q.filter_by(metadata_id=bindparam("metadata_id"))
         metadata_id = next(iter(metadata.keys()))
 
-        baked_query += lambda q: q.order_by(
-            Statistics.metadata_id, Statistics.start.desc()
-        )
+        baked_query += lambda q: q.order_by(table.metadata_id, table.start.desc())
 
         baked_query += lambda q: q.limit(bindparam("number_of_stats"))
 
@@ -349,6 +447,20 @@ def get_last_statistics(
         return _sorted_statistics_to_dict(hass, stats, statistic_ids, metadata)
 
 
+def get_last_statistics(
+    hass: HomeAssistant, number_of_stats: int, statistic_id: str
+) -> dict[str, list[dict]]:
+    """Return the last number_of_stats hourly statistics for a statistic_id."""
+    return _get_last_statistics(hass, number_of_stats, statistic_id, "hourly")
+
+
+def get_last_short_term_statistics(
+    hass: HomeAssistant, number_of_stats: int, statistic_id: str
+) -> dict[str, list[dict]]:
+    """Return the last number_of_stats 5-minute statistics for a statistic_id."""
+    return _get_last_statistics(hass, number_of_stats, statistic_id, "5minute")
+
+
 def _sorted_statistics_to_dict(
     hass: HomeAssistant,
     stats: list,
@@ -0,0 +1,38 @@
+"""Provide info to system health."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_INSTANCE
+
+
+@callback
+def async_register(
+    hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register system health callbacks."""
+    register.async_register_info(system_health_info)
+
+
+async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
+    """Get info for the info page."""
+    if (instance := hass.data.get(DATA_INSTANCE)) is None or (
+        history_cache := instance.history_cache
+    ) is None:
+        return {}
+
+    info = history_cache.info()
+    hit_rate = info["hit_rate"]
+    return {
+        "history_cache_states": f"{info['states']}/{info['max_states']}",
+        "history_cache_entities": info["entities"],
+        "history_cache_attributes": await hass.async_add_executor_job(
+            history_cache.num_attributes
+        ),
+        "history_cache_hits": info["hits"],
+        "history_cache_misses": info["misses"],
+        "history_cache_hit_rate": None if hit_rate is None else f"{hit_rate:.1%}",
+    }
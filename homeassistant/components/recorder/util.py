@@ -22,9 +22,12 @@ from .models import (
     ALL_TABLES,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
+    TABLE_STATE_ATTRIBUTES,
     TABLE_STATISTICS,
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
+    TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_SHORT_TERM_RUNS,
     RecorderRuns,
     process_timestamp,
 )
@@ -184,8 +187,15 @@ def basic_sanity_check(cursor):
     """Check tables to make sure select does not fail."""
 
     for table in ALL_TABLES:
-        # The statistics tables may not be present in old databases
-        if table in [TABLE_STATISTICS, TABLE_STATISTICS_META, TABLE_STATISTICS_RUNS]:
+        # The state attributes and statistics tables may not be present in old databases
+        if table in [
+            TABLE_STATE_ATTRIBUTES,
+            TABLE_STATISTICS,
+            TABLE_STATISTICS_META,
+            TABLE_STATISTICS_RUNS,
+            TABLE_STATISTICS_SHORT_TERM,
+            TABLE_STATISTICS_SHORT_TERM_RUNS,
+        ]:
             continue
         if table in (TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES):
             cursor.execute(f"SELECT * FROM {table};")  # nosec # not injection
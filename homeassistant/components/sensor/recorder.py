@@ -4,6 +4,8 @@ from __future__ import annotations
 import datetime
 import itertools
 import logging
+import math
+import operator
 from typing import Callable
 
 from homeassistant.components.recorder import history, statistics
@@ -41,7 +43,7 @@ from homeassistant.const import (
     VOLUME_CUBIC_FEET,
     VOLUME_CUBIC_METERS,
 )
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import HomeAssistant
 import homeassistant.util.pressure as pressure_util
 import homeassistant.util.temperature as temperature_util
 import homeassistant.util.volume as volume_util
@@ -152,7 +154,10 @@ def _is_number(s: str) -> bool:  # pylint: disable=invalid-name
 
 
 def _time_weighted_average(
-    fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
+    values: list[float],
+    timestamps: list[float],
+    start: datetime.datetime,
+    end: datetime.datetime,
 ) -> float:
     """Calculate a time weighted average.
 
@@ -160,59 +165,58 @@ def _time_weighted_average(
     state changes.
     Note: there's no interpolation of values between state changes.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
-    accumulated = 0.0
-
-    for fstate, state in fstates:
-        # The recorder will give us the last known state, which may be well
-        # before the requested start time for the statistics
-        start_time = start if state.last_updated < start else state.last_updated
-        if old_start_time is None:
-            # Adjust start time, if there was no last known state
-            start = start_time
-        else:
-            duration = start_time - old_start_time
-            # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
-
-        old_fstate = fstate
-        old_start_time = start_time
-
-    if old_fstate is not None:
-        # Accumulate the value, weighted by duration until end of the period
-        assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
-
-    return accumulated / (end - start).total_seconds()
+    start_ts = start.timestamp()
+    end_ts = end.timestamp()
+    # The recorder will give us the last known state, which may be well
+    # before the requested start time for the statistics
+    timestamps = [max(timestamp, start_ts) for timestamp in timestamps]
+    # Each value lasts until the next state change or the end of the period
+    durations = map(
+        operator.sub,
+        itertools.chain(itertools.islice(timestamps, 1, None), (end_ts,)),
+        timestamps,
+    )
+    accumulated = math.fsum(map(operator.mul, values, durations))
 
+    # If there was no last known state, the period starts at the first state change
+    return accumulated / (end_ts - timestamps[0])
 
-def _normalize_states(
-    entity_history: list[State], key: str, entity_id: str
-) -> tuple[str | None, list[tuple[float, State]]]:
-    """Normalize units."""
-    unit = None
 
+def _normalize_states(
+    states: list[str],
+    attributes: list[dict],
+    timestamps: list[float],
+    key: str,
+    entity_id: str,
+) -> tuple[str | None, list[float], list[dict], list[float]]:
+    """Normalize units.
+
+    Returns the unit and the values, attributes and timestamps of the numerical
+    states.
+    """
     if key not in UNIT_CONVERSIONS:
         # We're not normalizing this device class, return the state as they are
-        fstates = [
-            (float(el.state), el) for el in entity_history if _is_number(el.state)
-        ]
-        if fstates:
-            unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-        return unit, fstates
-
-    fstates = []
-
-    for state in entity_history:
+        numbers = [idx for idx, state in enumerate(states) if _is_number(state)]
+        unit = None
+        if numbers:
+            unit = attributes[numbers[0]].get(ATTR_UNIT_OF_MEASUREMENT)
+        return (
+            unit,
+            [float(states[idx]) for idx in numbers],
+            [attributes[idx] for idx in numbers],
+            [timestamps[idx] for idx in numbers],
+        )
+
+    fvalues = []
+    fattributes = []
+    ftimestamps = []
+
+    for state, state_attributes, timestamp in zip(states, attributes, timestamps):
         # Exclude non numerical states from statistics
-        if not _is_number(state.state):
+        if not _is_number(state):
             continue
 
-        fstate = float(state.state)
-        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        unit = state_attributes.get(ATTR_UNIT_OF_MEASUREMENT)
         # Exclude unsupported units from statistics
         if unit not in UNIT_CONVERSIONS[key]:
             if entity_id not in WARN_UNSUPPORTED_UNIT:
@@ -220,9 +224,11 @@ def _normalize_states(
                 _LOGGER.warning("%s has unknown unit %s", entity_id, unit)
             continue
 
-        fstates.append((UNIT_CONVERSIONS[key][unit](fstate), state))
+        fvalues.append(UNIT_CONVERSIONS[key][unit](float(state)))
+        fattributes.append(state_attributes)
+        ftimestamps.append(timestamp)
 
-    return DEVICE_CLASS_UNITS[key], fstates
+    return DEVICE_CLASS_UNITS[key], fvalues, fattributes, ftimestamps
 
 
 def compile_statistics(
@@ -236,21 +242,22 @@ def compile_statistics(
 
     entities = _get_entities(hass)
 
-    # Get history between start and end
-    history_list = history.get_significant_states(  # type: ignore
+    # Get the state columns of all entities between start and end in one query
+    history_columns = history.get_state_values_during_period(  # type: ignore
         hass, start - datetime.timedelta.resolution, end, [i[0] for i in entities]
     )
 
     for entity_id, state_class, key in entities:
         wanted_statistics = DEVICE_CLASS_OR_UNIT_STATISTICS[state_class][key]
 
-        if entity_id not in history_list:
+        if entity_id not in history_columns:
             continue
 
-        entity_history = history_list[entity_id]
-        unit, fstates = _normalize_states(entity_history, key, entity_id)
+        unit, fvalues, fattributes, ftimestamps = _normalize_states(
+            *history_columns[entity_id], key, entity_id
+        )
 
-        if not fstates:
+        if not fvalues:
             continue
 
         result[entity_id] = {}
@@ -265,27 +272,35 @@ def compile_statistics(
         # Make calculations
         stat: dict = {}
         if "max" in wanted_statistics:
-            stat["max"] = max(*itertools.islice(zip(*fstates), 1))
+            stat["max"] = max(fvalues)
         if "min" in wanted_statistics:
-            stat["min"] = min(*itertools.islice(zip(*fstates), 1))
+            stat["min"] = min(fvalues)
 
         if "mean" in wanted_statistics:
-            stat["mean"] = _time_weighted_average(fstates, start, end)
+            stat["mean"] = _time_weighted_average(fvalues, ftimestamps, start, end)
 
         if "sum" in wanted_statistics:
             new_state = old_state = None
             _sum = 0
-            last_stats = statistics.get_last_statistics(hass, 1, entity_id)
+            last_stats = {}
+            if end - start < datetime.timedelta(hours=1):
+                last_stats = statistics.get_last_short_term_statistics(
+                    hass, 1, entity_id
+                )
+            if entity_id not in last_stats:
+                # There are no short-term statistics right after upgrading
+                # or when they were purged, continue the hourly statistics
+                last_stats = statistics.get_last_statistics(hass, 1, entity_id)
             if entity_id in last_stats:
                 # We have compiled history for this sensor before, use that as a starting point
                 new_state = old_state = last_stats[entity_id][0]["state"]
                 _sum = last_stats[entity_id][0]["sum"]
 
-            for fstate, state in fstates:
+            for fstate, state_attributes in zip(fvalues, fattributes):
 
                 # Deprecated, will be removed in Home Assistant 2021.10
                 if (
-                    "last_reset" not in state.attributes
+                    "last_reset" not in state_attributes
                     and state_class == STATE_CLASS_MEASUREMENT
                 ):
                     continue
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Callable
-import json
 from typing import Any
 
 import voluptuous as vol
@@ -12,7 +11,14 @@ from homeassistant.auth.permissions.const import CAT_ENTITIES, POLICY_READ
 from homeassistant.bootstrap import SIGNAL_BOOTSTRAP_INTEGRATONS
 from homeassistant.components.websocket_api.const import ERR_NOT_FOUND
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
-from homeassistant.core import Context, Event, HomeAssistant, callback
+from homeassistant.core import (
+    Context,
+    Event,
+    EventDataFilter,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
@@ -21,6 +27,7 @@ from homeassistant.exceptions import (
 )
 from homeassistant.helpers import config_validation as cv, entity, template
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
 from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
@@ -30,6 +37,7 @@ from homeassistant.helpers.json import ExtendedJSONEncoder
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_get_loaded_integrations
+from homeassistant.util.json import json_dumps
 
 from . import const, decorators, messages
 from .connection import ActiveConnection
@@ -42,6 +50,7 @@ def async_register_commands(
 ) -> None:
     """Register commands."""
     async_reg(hass, handle_call_service)
+    async_reg(hass, handle_entity_polling_stats)
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_execute_script)
     async_reg(hass, handle_get_config)
@@ -53,8 +62,10 @@ def async_register_commands(
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
+    async_reg(hass, handle_supported_features)
     async_reg(hass, handle_test_condition)
     async_reg(hass, handle_unsubscribe_events)
 
@@ -113,6 +124,55 @@ def handle_subscribe_events(
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle subscribe entities command.
+
+    Sends the current states as a compact snapshot, followed by only
+    what changed for each state change.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+
+    @callback
+    def forward_entity_changes(event: Event) -> None:
+        """Forward entity state changes to websocket."""
+        entity_id = event.data["entity_id"]
+        if not connection.user.permissions.check_entity(entity_id, POLICY_READ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    # There is no await between taking the snapshot and listening
+    # for state changes, so no state change can be missed
+    states = _async_get_allowed_states(hass, connection)
+    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+        EVENT_STATE_CHANGED,
+        forward_entity_changes,
+        event_filter=EventDataFilter("entity_id", entity_ids) if entity_ids else None,
+    )
+    connection.send_message(messages.result_message(msg["id"]))
+    connection.send_message(
+        messages.event_message(
+            msg["id"],
+            {
+                messages.ENTITY_EVENT_ADD: {
+                    state.entity_id: messages.compressed_state_dict(state)
+                    for state in states
+                    if not entity_ids or state.entity_id in entity_ids
+                }
+            },
+        )
+    )
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -228,17 +288,48 @@ def handle_get_states(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle get states command."""
+    states = _async_get_allowed_states(hass, connection)
+
+    try:
+        serialized_states = [state.as_json() for state in states]
+    except (ValueError, TypeError):
+        # Let message_to_json log the bad data
+        connection.send_message(messages.result_message(msg["id"], states))
+        return
+
+    connection.send_message(
+        messages.construct_result_message(msg["id"], f"[{','.join(serialized_states)}]")
+    )
+
+
+@callback
+def _async_get_allowed_states(
+    hass: HomeAssistant, connection: ActiveConnection
+) -> list[State]:
+    """Return the states the user of the connection may read."""
     if connection.user.permissions.access_all_entities("read"):
-        states = hass.states.async_all()
-    else:
-        entity_perm = connection.user.permissions.check_entity
-        states = [
-            state
-            for state in hass.states.async_all()
-            if entity_perm(state.entity_id, "read")
-        ]
+        return hass.states.async_all()
+    entity_perm = connection.user.permissions.check_entity
+    return [
+        state
+        for state in hass.states.async_all()
+        if entity_perm(state.entity_id, "read")
+    ]
+
 
-    connection.send_message(messages.result_message(msg["id"], states))
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "supported_features",
+        vol.Required("features"): {str: int},
+    }
+)
+def handle_supported_features(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle setting the protocol features the client supports."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -431,6 +522,35 @@ def handle_entity_source(
     connection.send_result(msg["id"], sources)
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "entity/polling_stats"})
+@decorators.require_admin
+def handle_entity_polling_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle polling statistics of the entity platforms command."""
+    connection.send_result(
+        msg["id"],
+        [
+            {
+                "domain": platform.domain,
+                "platform": platform.platform_name,
+                "config_entry_id": platform.config_entry.entry_id
+                if platform.config_entry
+                else None,
+                "scan_interval": platform.scan_interval.total_seconds(),
+                "entities": sum(
+                    entity.should_poll for entity in platform.entities.values()
+                ),
+                **platform.polling_stats.as_dict(),
+            }
+            for platforms in hass.data.get(DATA_ENTITY_PLATFORM, {}).values()
+            for platform in platforms
+            if any(entity.should_poll for entity in platform.entities.values())
+        ],
+    )
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "subscribe_trigger",
@@ -459,7 +579,7 @@ async def handle_subscribe_trigger(
             msg["id"], {"variables": variables, "context": context}
         )
         connection.send_message(
-            json.dumps(message, cls=ExtendedJSONEncoder, allow_nan=False)
+            json_dumps(message, encoder=ExtendedJSONEncoder, allow_nan=False)
         )
 
     connection.subscriptions[msg["id"]] = (
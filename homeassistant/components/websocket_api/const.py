@@ -4,11 +4,11 @@ from __future__ import annotations
 import asyncio
 from concurrent import futures
 from functools import partial
-import json
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Final
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.json import JSONEncoder
+from homeassistant.util.json import json_dumps
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection
@@ -40,6 +40,9 @@ ERR_TEMPLATE_ERROR: Final = "template_error"
 
 TYPE_RESULT: Final = "result"
 
+# Protocol features a client can opt in to with the supported_features command
+FEATURE_COALESCE_MESSAGES: Final = "coalesce_messages"
+
 # Define the possible errors that occur when connections are cancelled.
 # Originally, this was just asyncio.CancelledError, but issue #9546 showed
 # that futures.CancelledErrors can also occur in some situations.
@@ -52,4 +55,4 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 # Data used to store the current connection list
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
 
-JSON_DUMP: Final = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+JSON_DUMP: Final = partial(json_dumps, encoder=JSONEncoder, allow_nan=False)
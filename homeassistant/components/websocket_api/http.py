@@ -15,11 +15,14 @@ from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.event import async_call_later
+from homeassistant.util.json import json_loads
 
 from .auth import AuthPhase, auth_required_message
+from .connection import ActiveConnection
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -66,25 +69,54 @@ class WebSocketHandler:
         self._writer_task: asyncio.Task | None = None
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub: Callable[[], None] | None = None
+        self._connection: ActiveConnection | None = None
 
     async def _writer(self) -> None:
-        """Write outgoing messages."""
+        """Write outgoing messages.
+
+        If the client supports it, all messages that are pending
+        are coalesced and sent as a JSON array in a single frame.
+        """
         # Exceptions if Socket disconnected or cancelled by connection handler
         assert self.wsock is not None
+        to_write = self._to_write
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                message = await self._to_write.get()
+                message = await to_write.get()
                 if message is None:
                     break
 
-                self._logger.debug("Sending %s", message)
-                await self.wsock.send_str(message)
+                if not (pending := to_write.qsize()) or not self._can_coalesce:
+                    self._logger.debug("Sending %s", message)
+                    await self.wsock.send_str(message)
+                    continue
+
+                messages = [message]
+                closing = False
+                for _ in range(pending):
+                    if (message := to_write.get_nowait()) is None:
+                        closing = True
+                        break
+                    messages.append(message)
+
+                coalesced = "[" + ",".join(messages) + "]"
+                self._logger.debug("Sending %s", coalesced)
+                await self.wsock.send_str(coalesced)
+                if closing:
+                    break
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub is not None:
             self._peak_checker_unsub()
             self._peak_checker_unsub = None
 
+    @property
+    def _can_coalesce(self) -> bool:
+        """Return if the client accepts multiple messages in a frame."""
+        return self._connection is not None and bool(
+            self._connection.supported_features.get(FEATURE_COALESCE_MESSAGES)
+        )
+
     @callback
     def _send_message(self, message: str | dict[str, Any]) -> None:
         """Send a message to the client.
@@ -183,13 +215,13 @@ class WebSocketHandler:
                 raise Disconnect
 
             try:
-                msg_data = msg.json()
+                msg_data = msg.json(loads=json_loads)
             except ValueError as err:
                 disconnect_warn = "Received invalid JSON."
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
@@ -209,7 +241,7 @@ class WebSocketHandler:
                     break
 
                 try:
-                    msg_data = msg.json()
+                    msg_data = msg.json(loads=json_loads)
                 except ValueError:
                     disconnect_warn = "Received invalid JSON."
                     break
@@ -7,7 +7,7 @@ from typing import Any, Final
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -31,12 +31,32 @@ BASE_COMMAND_MESSAGE_SCHEMA: Final = vol.Schema({vol.Required("id"): cv.positive
 IDEN_TEMPLATE: Final = "__IDEN__"
 IDEN_JSON_TEMPLATE: Final = '"__IDEN__"'
 
+# Keys of the compressed states sent to entity subscriptions
+COMPRESSED_STATE_STATE: Final = "s"
+COMPRESSED_STATE_ATTRIBUTES: Final = "a"
+COMPRESSED_STATE_CONTEXT: Final = "c"
+COMPRESSED_STATE_LAST_CHANGED: Final = "lc"
+COMPRESSED_STATE_LAST_UPDATED: Final = "lu"
+
+# Keys of the entity subscription events
+ENTITY_EVENT_ADD: Final = "a"
+ENTITY_EVENT_REMOVE: Final = "r"
+ENTITY_EVENT_CHANGE: Final = "c"
+
+STATE_DIFF_ADDITIONS: Final = "+"
+STATE_DIFF_REMOVALS: Final = "-"
+
 
 def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     """Return a success result message."""
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
 
 
+def construct_result_message(iden: int, payload: str) -> str:
+    """Construct a success result message JSON from an already serialized result."""
+    return f'{{"id":{iden},"type":"{const.TYPE_RESULT}","success":true,"result":{payload}}}'
+
+
 def error_message(iden: int | None, code: str, message: str) -> dict[str, Any]:
     """Return an error result message."""
     return {
@@ -69,9 +89,94 @@ def _cached_event_message(event: Event) -> str:
     """Cache and serialize the event to json.
 
     The IDEN_TEMPLATE is used which will be replaced
-    with the actual iden in cached_event_message
+    with the actual iden in cached_event_message. The
+    JSON of the event is reused from the event itself.
+    """
+    try:
+        event_json = event.as_json()
+    except (ValueError, TypeError):
+        # Let message_to_json log the bad data
+        return message_to_json(event_message(IDEN_TEMPLATE, event))
+    return f'{{"id":{IDEN_JSON_TEMPLATE},"type":"event","event":{event_json}}}'
+
+
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return an entity subscription event message for a state changed event.
+
+    Serialize to json once per message, like cached_event_message.
+    """
+    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_message(event: Event) -> str:
+    """Cache and serialize the state diff of the event to json.
+
+    The IDEN_TEMPLATE is used which will be replaced
+    with the actual iden in cached_state_diff_message
+    """
+    return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+
+
+def _state_diff_event(event: Event) -> dict[str, Any]:
+    """Convert a state changed event to an entity subscription event."""
+    if (new_state := event.data["new_state"]) is None:
+        return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
+    if (old_state := event.data["old_state"]) is None:
+        return {
+            ENTITY_EVENT_ADD: {new_state.entity_id: compressed_state_dict(new_state)}
+        }
+    return {
+        ENTITY_EVENT_CHANGE: {new_state.entity_id: state_diff(old_state, new_state)}
+    }
+
+
+def compressed_state_dict(state: State) -> dict[str, Any]:
+    """Return a compact dict of a state.
+
+    The last updated time is left out if it equals the last changed time.
+    """
+    compressed = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: state.context.id,
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_updated != state.last_changed:
+        compressed[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed
+
+
+def state_diff(old_state: State, new_state: State) -> dict[str, Any]:
+    """Return what changed between two states of an entity.
+
+    Changed values are in the additions, attributes that are gone
+    are listed in the removals.
     """
-    return message_to_json(event_message(IDEN_TEMPLATE, event))
+    additions: dict[str, Any] = {}
+    diff: dict[str, Any] = {STATE_DIFF_ADDITIONS: additions}
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+    if old_state.context.id != new_state.context.id:
+        additions[COMPRESSED_STATE_CONTEXT] = new_state.context.id
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if old_attributes is not new_attributes:
+        changed = {
+            key: value
+            for key, value in new_attributes.items()
+            if key not in old_attributes or old_attributes[key] != value
+        }
+        if changed:
+            additions[COMPRESSED_STATE_ATTRIBUTES] = changed
+        if removed := [key for key in old_attributes if key not in new_attributes]:
+            diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: removed}
+    return diff
 
 
 def message_to_json(message: dict[str, Any]) -> str:
@@ -737,13 +737,15 @@ async def merge_packages_config(
                 integration = await async_get_integration_with_requirements(
                     hass, domain
                 )
-                component = integration.get_component()
+                component = await integration.async_get_component()
             except INTEGRATION_LOAD_EXCEPTIONS as ex:
                 _log_pkg_error(pack_name, comp_name, config, str(ex))
                 continue
 
             try:
-                config_platform: ModuleType | None = integration.get_platform("config")
+                config_platform: ModuleType | None = (
+                    await integration.async_get_platform("config")
+                )
                 # Test if config platform has a config validator
                 if not hasattr(config_platform, "async_validate_config"):
                     config_platform = None
@@ -809,7 +811,7 @@ async def async_process_component_config(  # noqa: C901
     """
     domain = integration.domain
     try:
-        component = integration.get_component()
+        component = await integration.async_get_component()
     except LOAD_EXCEPTIONS as ex:
         _LOGGER.error("Unable to import %s: %s", domain, ex)
         return None
@@ -817,7 +819,7 @@ async def async_process_component_config(  # noqa: C901
     # Check if the integration has a custom config validator
     config_validator = None
     try:
-        config_validator = integration.get_platform("config")
+        config_validator = await integration.async_get_platform("config")
     except ImportError as err:
         # Filter out import error of the config platform.
         # If the config platform contains bad imports, make sure
@@ -888,7 +890,7 @@ async def async_process_component_config(  # noqa: C901
             continue
 
         try:
-            platform = p_integration.get_platform(domain)
+            platform = await p_integration.async_get_platform(domain)
         except LOAD_EXCEPTIONS:
             _LOGGER.exception("Platform error: %s", domain)
             continue
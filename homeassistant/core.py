@@ -11,12 +11,16 @@ from collections.abc import Awaitable, Collection, Coroutine, Iterable, Mapping
 import datetime
 import enum
 import functools
+import heapq
+from itertools import count
 import logging
 import os
 import pathlib
 import re
+import sys
 import threading
 from time import monotonic
+from operator import itemgetter
 from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar, cast
 from urllib.parse import urlparse
@@ -60,6 +64,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.util import location
 from homeassistant.util.async_ import (
     fire_coroutine_threadsafe,
@@ -108,6 +113,9 @@ SOURCE_DISCOVERED = "discovered"
 SOURCE_STORAGE = "storage"
 SOURCE_YAML = "yaml"
 
+# Attribute values of these types are shared between the states of an entity
+SHARED_ATTRIBUTE_TYPES = {dict, frozenset, list, set, tuple}
+
 # How long to wait until things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
@@ -602,7 +610,7 @@ class EventOrigin(enum.Enum):
 class Event:
     """Representation of an event within the bus."""
 
-    __slots__ = ["event_type", "data", "origin", "time_fired", "context"]
+    __slots__ = ["event_type", "data", "origin", "time_fired", "context", "_as_json"]
 
     def __init__(
         self,
@@ -618,6 +626,7 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context: Context = context or Context()
+        self._as_json: str | None = None
 
     def __hash__(self) -> int:
         """Make hashable."""
@@ -637,6 +646,30 @@ class Event:
             "context": self.context.as_dict(),
         }
 
+    def as_json(self) -> str:
+        """Return the JSON representation of this Event.
+
+        The JSON is created once and reuses the JSON of the states in the
+        data. Raises ValueError or TypeError if the data is not valid JSON.
+        """
+        if self._as_json is None:
+            self._as_json = "".join(
+                (
+                    '{"event_type":',
+                    json_dumps(self.event_type),
+                    ',"data":',
+                    _data_json(self.data),
+                    ',"origin":',
+                    json_dumps(str(self.origin.value)),
+                    ',"time_fired":"',
+                    self.time_fired.isoformat(),
+                    '","context":',
+                    json_dumps(self.context.as_dict()),
+                    "}",
+                )
+            )
+        return self._as_json
+
     def __repr__(self) -> str:
         """Return the representation."""
         if self.data:
@@ -656,12 +689,58 @@ class Event:
         )
 
 
+def _data_json(data: Mapping[str, Any]) -> str:
+    """Return the JSON of event data, reusing the JSON of the states in it."""
+    if not any(isinstance(value, State) for value in data.values()) or not all(
+        isinstance(key, str) for key in data
+    ):
+        return json_dumps(data)
+    return (
+        "{"
+        + ",".join(
+            json_dumps(key)
+            + ":"
+            + (value.as_json() if isinstance(value, State) else json_dumps(value))
+            for key, value in data.items()
+        )
+        + "}"
+    )
+
+
+def _values_to_frozenset(values: Any) -> frozenset:
+    """Convert a single value or an iterable of values to a frozenset."""
+    if isinstance(values, str):
+        return frozenset((values,))
+    return frozenset(values)
+
+
+@attr.s(slots=True, frozen=True)
+class EventDataFilter:
+    """Declarative event filter on one key of the event data.
+
+    The listener only runs for events where the value of `key` is one of
+    `values`, or, if the value is a list, where one of its items is.
+    The event bus indexes these filters so firing an event only visits
+    the matching listeners, which run in the order of registration with
+    the other listeners.
+    """
+
+    key: str = attr.ib()
+    values: frozenset = attr.ib(converter=_values_to_frozenset)
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: dict[str, list[tuple[HassJob, Callable | None]]] = {}
+        self._listeners: dict[str, list[tuple[HassJob, Callable | None, int]]] = {}
+        # Listeners with an EventDataFilter by event type, data key and value
+        self._indexed_listeners: dict[
+            str, dict[str, dict[Any, list[tuple[HassJob, Callable | None, int]]]]
+        ] = {}
+        # Listeners run in the order they were registered in
+        self._listener_seq = count()
         self._hass = hass
 
     @callback
@@ -670,7 +749,26 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, indexed_listeners in self._indexed_listeners.items():
+            filterable_jobs = {
+                id(filterable_job)
+                for value_listeners in indexed_listeners.values()
+                for filterable_jobs in value_listeners.values()
+                for filterable_job in filterable_jobs
+            }
+            listeners[event_type] = listeners.get(event_type, 0) + len(filterable_jobs)
+        return listeners
+
+    @callback
+    def async_has_listeners(self, event_type: str) -> bool:
+        """Return if there are listeners for a specific event type.
+
+        Listeners of MATCH_ALL are not taken into account.
+
+        This method must be run in the event loop.
+        """
+        return event_type in self._listeners or event_type in self._indexed_listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -707,14 +805,17 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
+        event = Event(event_type, event_data, origin, time_fired, context)
 
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        listeners = self._async_event_type_listeners(event_type, event.data)
 
-        event = Event(event_type, event_data, origin, time_fired, context)
+        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+        if event_type != EVENT_HOMEASSISTANT_CLOSE:
+            match_all_listeners = self._async_event_type_listeners(
+                MATCH_ALL, event.data
+            )
+            if match_all_listeners:
+                listeners = match_all_listeners + listeners
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
@@ -722,7 +823,7 @@ class EventBus:
         if not listeners:
             return
 
-        for job, event_filter in listeners:
+        for job, event_filter, _ in listeners:
             if event_filter is not None:
                 try:
                     if not event_filter(event):
@@ -732,6 +833,52 @@ class EventBus:
                     continue
             self._hass.async_add_hass_job(job, event)
 
+    @callback
+    def _async_event_type_listeners(
+        self, event_type: str, event_data: Mapping[str, Any]
+    ) -> list[tuple[HassJob, Callable | None, int]]:
+        """Return the listeners of an event type in the order of registration."""
+        listeners = self._listeners.get(event_type, [])
+        if not self._indexed_listeners or not (
+            indexed_listeners := self._async_match_indexed_listeners(
+                event_type, event_data
+            )
+        ):
+            return listeners
+        if not listeners:
+            return indexed_listeners
+        return list(heapq.merge(listeners, indexed_listeners, key=itemgetter(2)))
+
+    @callback
+    def _async_match_indexed_listeners(
+        self, event_type: str, event_data: Mapping[str, Any]
+    ) -> list[tuple[HassJob, Callable | None, int]]:
+        """Return the listeners with an EventDataFilter matching the event data.
+
+        The listeners are returned in the order of registration.
+        """
+        if (indexed_listeners := self._indexed_listeners.get(event_type)) is None:
+            return []
+
+        # Listeners by registration, a list value can match a listener twice
+        matched: dict[int, tuple[HassJob, Callable | None, int]] = {}
+        for key, value_listeners in indexed_listeners.items():
+            if (value := event_data.get(key)) is None:
+                continue
+            for item in value if isinstance(value, list) else (value,):
+                try:
+                    filterable_jobs = value_listeners.get(item)
+                except TypeError:
+                    # Unhashable values can not match
+                    continue
+                if filterable_jobs:
+                    for filterable_job in filterable_jobs:
+                        matched[filterable_job[2]] = filterable_job
+
+        if len(matched) < 2:
+            return list(matched.values())
+        return [matched[seq] for seq in sorted(matched)]
+
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -753,7 +900,7 @@ class EventBus:
         self,
         event_type: str,
         listener: Callable,
-        event_filter: Callable | None = None,
+        event_filter: Callable | EventDataFilter | None = None,
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -762,19 +909,50 @@ class EventBus:
 
         An optional event_filter, which must be a callable decorated with
         @callback that returns a boolean value, determines if the
-        listener callable should run.
+        listener callable should run. An EventDataFilter can be used
+        instead of a callable when the listener only cares about a set of
+        values of one key of the event data, e.g. a set of entity ids.
+        Those filters are indexed and do not cost anything for the events
+        that do not match.
 
         This method must be run in the event loop.
         """
+        if isinstance(event_filter, EventDataFilter):
+            return self._async_listen_indexed_job(
+                event_type,
+                event_filter,
+                (HassJob(listener), None, next(self._listener_seq)),
+            )
         if event_filter is not None and not is_callback(event_filter):
             raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
         return self._async_listen_filterable_job(
-            event_type, (HassJob(listener), event_filter)
+            event_type, (HassJob(listener), event_filter, next(self._listener_seq))
         )
 
+    @callback
+    def _async_listen_indexed_job(
+        self,
+        event_type: str,
+        event_filter: EventDataFilter,
+        filterable_job: tuple[HassJob, Callable | None, int],
+    ) -> CALLBACK_TYPE:
+        value_listeners = self._indexed_listeners.setdefault(event_type, {}).setdefault(
+            event_filter.key, {}
+        )
+        for value in event_filter.values:
+            value_listeners.setdefault(value, []).append(filterable_job)
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_indexed_listener(
+                event_type, event_filter, filterable_job
+            )
+
+        return remove_listener
+
     @callback
     def _async_listen_filterable_job(
-        self, event_type: str, filterable_job: tuple[HassJob, Callable | None]
+        self, event_type: str, filterable_job: tuple[HassJob, Callable | None, int]
     ) -> CALLBACK_TYPE:
         self._listeners.setdefault(event_type, []).append(filterable_job)
 
@@ -815,7 +993,7 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        filterable_job: tuple[HassJob, Callable | None] | None = None
+        filterable_job: tuple[HassJob, Callable | None, int] | None = None
 
         @callback
         def _onetime_listener(event: Event) -> None:
@@ -833,13 +1011,13 @@ class EventBus:
             self._async_remove_listener(event_type, filterable_job)
             self._hass.async_run_job(listener, event)
 
-        filterable_job = (HassJob(_onetime_listener), None)
+        filterable_job = (HassJob(_onetime_listener), None, next(self._listener_seq))
 
         return self._async_listen_filterable_job(event_type, filterable_job)
 
     @callback
     def _async_remove_listener(
-        self, event_type: str, filterable_job: tuple[HassJob, Callable | None]
+        self, event_type: str, filterable_job: tuple[HassJob, Callable | None, int]
     ) -> None:
         """Remove a listener of a specific event_type.
 
@@ -858,6 +1036,34 @@ class EventBus:
                 "Unable to remove unknown job listener %s", filterable_job
             )
 
+    @callback
+    def _async_remove_indexed_listener(
+        self,
+        event_type: str,
+        event_filter: EventDataFilter,
+        filterable_job: tuple[HassJob, Callable | None, int],
+    ) -> None:
+        """Remove a listener with an EventDataFilter.
+
+        This method must be run in the event loop.
+        """
+        try:
+            indexed_listeners = self._indexed_listeners[event_type]
+            value_listeners = indexed_listeners[event_filter.key]
+            for value in event_filter.values:
+                value_listeners[value].remove(filterable_job)
+                # delete empty lists and indexes
+                if not value_listeners[value]:
+                    del value_listeners[value]
+            if not value_listeners:
+                del indexed_listeners[event_filter.key]
+            if not indexed_listeners:
+                del self._indexed_listeners[event_type]
+        except (KeyError, ValueError):
+            _LOGGER.exception(
+                "Unable to remove unknown job listener %s", filterable_job
+            )
+
 
 class State:
     """Object to represent a state within the state machine.
@@ -882,6 +1088,8 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_json",
+        "_attributes_json",
     ]
 
     def __init__(
@@ -911,12 +1119,18 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        if isinstance(attributes, MappingProxyType):
+            # Shared with the previous state of the entity
+            self.attributes = attributes
+        else:
+            self.attributes = MappingProxyType(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: dict[str, Collection[Any]] | None = None
+        self._as_json: str | None = None
+        self._attributes_json: str | None = None
 
     @property
     def name(self) -> str:
@@ -949,6 +1163,49 @@ class State:
             }
         return self._as_dict
 
+    def as_json(self) -> str:
+        """Return the JSON representation of the State.
+
+        Async friendly.
+
+        The JSON is created once and shared by everything sending or
+        storing the state. Raises ValueError or TypeError if the
+        attributes are not valid JSON.
+        """
+        if self._as_json is None:
+            last_changed_isoformat = self.last_changed.isoformat()
+            if self.last_changed == self.last_updated:
+                last_updated_isoformat = last_changed_isoformat
+            else:
+                last_updated_isoformat = self.last_updated.isoformat()
+            self._as_json = "".join(
+                (
+                    '{"entity_id":',
+                    json_dumps(self.entity_id),
+                    ',"state":',
+                    json_dumps(self.state),
+                    ',"attributes":',
+                    self.attributes_json(),
+                    ',"last_changed":"',
+                    last_changed_isoformat,
+                    '","last_updated":"',
+                    last_updated_isoformat,
+                    '","context":',
+                    json_dumps(self.context.as_dict()),
+                    "}",
+                )
+            )
+        return self._as_json
+
+    def attributes_json(self) -> str:
+        """Return the JSON representation of the attributes.
+
+        Async friendly.
+        """
+        if self._attributes_json is None:
+            self._attributes_json = json_dumps(dict(self.attributes))
+        return self._attributes_json
+
     @classmethod
     def from_dict(cls, json_dict: dict) -> Any:
         """Initialize a state from a dict.
@@ -1003,6 +1260,39 @@ class State:
         )
 
 
+def _share_attributes(
+    attributes: Mapping[str, Any], old_attributes: Mapping[str, Any] | None
+) -> dict[str, Any]:
+    """Return a copy of the attributes sharing what it can with other states.
+
+    Keys and strings are interned, so the states of all entities share
+    them. Containers equal to the previous value of the entity are
+    replaced by that value, so the copies an entity creates on every
+    update, like lists of options, are freed right away.
+    """
+    # pylint: disable=unidiomatic-typecheck
+    shared = {}
+    for key, value in attributes.items():
+        if type(key) is str:
+            key = sys.intern(key)
+        value_type = type(value)
+        if value_type is str:
+            value = sys.intern(value)
+        elif value_type in SHARED_ATTRIBUTE_TYPES:
+            if (
+                old_attributes is not None
+                and type(old_value := old_attributes.get(key)) is value_type
+                and old_value == value
+            ):
+                value = old_value
+            elif value_type is not dict:
+                value = value_type(
+                    sys.intern(item) if type(item) is str else item for item in value
+                )
+        shared[key] = value
+    return shared
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
@@ -1205,7 +1495,9 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            same_attr = (
+                attributes is old_state.attributes or old_state.attributes == attributes
+            )
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
@@ -1216,6 +1508,17 @@ class StateMachine:
 
         now = dt_util.utcnow()
 
+        # pylint: disable=protected-access
+        if same_attr:
+            assert old_state is not None
+            attributes = old_state.attributes
+            attributes_json = old_state._attributes_json
+        else:
+            attributes = _share_attributes(
+                attributes, old_state and old_state.attributes
+            )
+            attributes_json = None
+
         state = State(
             entity_id,
             new_state,
@@ -1225,6 +1528,7 @@ class StateMachine:
             context,
             old_state is None,
         )
+        state._attributes_json = attributes_json
         self._states[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
@@ -1786,9 +2090,15 @@ def _async_create_timer(hass: HomeAssistant) -> None:
         """Fire next time event."""
         now = dt_util.utcnow()
 
-        hass.bus.async_fire(
-            EVENT_TIME_CHANGED, {ATTR_NOW: now}, time_fired=now, context=timer_context
-        )
+        # Time trackers are scheduled on the event loop, the time changed
+        # event is only fired for listeners that explicitly ask for it
+        if hass.bus.async_has_listeners(EVENT_TIME_CHANGED):
+            hass.bus.async_fire(
+                EVENT_TIME_CHANGED,
+                {ATTR_NOW: now},
+                time_fired=now,
+                context=timer_context,
+            )
 
         # If we are more than a second late, a tick was missed
         late = monotonic() - target
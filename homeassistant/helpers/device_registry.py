@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from collections import OrderedDict
 import logging
+from operator import itemgetter
 import time
 from typing import TYPE_CHECKING, Any, NamedTuple, cast
 
@@ -47,6 +48,9 @@ ORPHANED_DEVICE_KEEP_SECONDS = 86400 * 30
 class _DeviceIndex(NamedTuple):
     identifiers: dict[tuple[str, str], str]
     connections: dict[tuple[str, str], str]
+    # Only registered devices are indexed by area and config entry
+    area_id: dict[str, dict[str, DeviceEntry]]
+    config_entry_id: dict[str, dict[str, DeviceEntry]]
 
 
 @attr.s(slots=True, frozen=True)
@@ -161,7 +165,9 @@ class DeviceRegistry:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the device registry."""
         self.hass = hass
-        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION, STORAGE_KEY, journal_key=itemgetter("id")
+        )
         self._clear_index()
 
     @callback
@@ -228,8 +234,12 @@ class DeviceRegistry:
 
     def _clear_index(self) -> None:
         """Clear the index."""
-        self._registered_index = _DeviceIndex(identifiers={}, connections={})
-        self._deleted_index = _DeviceIndex(identifiers={}, connections={})
+        self._registered_index = _DeviceIndex(
+            identifiers={}, connections={}, area_id={}, config_entry_id={}
+        )
+        self._deleted_index = _DeviceIndex(
+            identifiers={}, connections={}, area_id={}, config_entry_id={}
+        )
 
     def _rebuild_index(self) -> None:
         """Create the index after loading devices."""
@@ -541,9 +551,9 @@ class DeviceRegistry:
 
         data["devices"] = [
             {
-                "config_entries": list(entry.config_entries),
-                "connections": list(entry.connections),
-                "identifiers": list(entry.identifiers),
+                "config_entries": sorted(entry.config_entries),
+                "connections": sorted(entry.connections),
+                "identifiers": sorted(entry.identifiers),
                 "manufacturer": entry.manufacturer,
                 "model": entry.model,
                 "name": entry.name,
@@ -559,9 +569,9 @@ class DeviceRegistry:
         ]
         data["deleted_devices"] = [
             {
-                "config_entries": list(entry.config_entries),
-                "connections": list(entry.connections),
-                "identifiers": list(entry.identifiers),
+                "config_entries": sorted(entry.config_entries),
+                "connections": sorted(entry.connections),
+                "identifiers": sorted(entry.identifiers),
                 "id": entry.id,
                 "orphaned_timestamp": entry.orphaned_timestamp,
             }
@@ -587,8 +597,8 @@ class DeviceRegistry:
                 )
             else:
                 config_entries = config_entries - {config_entry_id}
-                # No need to reindex here since we currently
-                # do not have a lookup by config entry
+                # No need to reindex here since deleted
+                # devices are not indexed by config entry
                 self.deleted_devices[deleted_device.id] = attr.evolve(
                     deleted_device, config_entries=config_entries
                 )
@@ -615,9 +625,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for dev_id in list(self._registered_index.area_id.get(area_id, ())):
+            self._async_update_device(dev_id, area_id=None)
 
 
 @callback
@@ -645,7 +654,8 @@ async def async_get_registry(hass: HomeAssistant) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> list[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    devices = registry._registered_index.area_id  # pylint: disable=protected-access
+    return list(devices.get(area_id, {}).values())
 
 
 @callback
@@ -653,11 +663,9 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> list[DeviceEntry]:
     """Return entries that match a config entry."""
-    return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
-    ]
+    index = registry._registered_index  # pylint: disable=protected-access
+    devices = index.config_entry_id
+    return list(devices.get(config_entry_id, {}).values())
 
 
 @callback
@@ -803,6 +811,14 @@ def _add_device_to_index(
         devices_index.identifiers[identifier] = device.id
     for connection in device.connections:
         devices_index.connections[connection] = device.id
+    if not isinstance(device, DeviceEntry):
+        return
+    if device.area_id is not None:
+        devices_index.area_id.setdefault(device.area_id, {})[device.id] = device
+    for config_entry_id in device.config_entries:
+        devices_index.config_entry_id.setdefault(config_entry_id, {})[
+            device.id
+        ] = device
 
 
 def _remove_device_from_index(
@@ -816,3 +832,21 @@ def _remove_device_from_index(
     for connection in device.connections:
         if connection in devices_index.connections:
             del devices_index.connections[connection]
+    if not isinstance(device, DeviceEntry):
+        return
+    if device.area_id is not None:
+        _remove_from_related_index(devices_index.area_id, device.area_id, device.id)
+    for config_entry_id in device.config_entries:
+        _remove_from_related_index(
+            devices_index.config_entry_id, config_entry_id, device.id
+        )
+
+
+def _remove_from_related_index(
+    index: dict[str, dict[str, DeviceEntry]], key: str, device_id: str
+) -> None:
+    """Remove a device from an index by area or config entry."""
+    devices = index[key]
+    del devices[device_id]
+    if not devices:
+        del index[key]
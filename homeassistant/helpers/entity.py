@@ -222,6 +222,9 @@ class Entity(ABC):
     # Protect for multiple updates
     _update_staged = False
 
+    # Number of updates in a row that raised
+    _update_failures = 0
+
     # Process updates in parallel
     parallel_updates: asyncio.Semaphore | None = None
 
@@ -238,6 +241,19 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _added = False
 
+    # Properties whose attributes are only assembled when the registry entry
+    # changes or after async_invalidate_static_attributes has been called:
+    # assumed_state, capability_attributes, device_class, entity_picture,
+    # icon, name, supported_features and unit_of_measurement. Entities opt in
+    # for the properties that never change, none are static by default.
+    _static_properties: frozenset[str] = frozenset()
+
+    # The registry entry, the capability and the entity attributes of the
+    # static properties
+    _static_attributes: tuple[
+        RegistryEntry | None, Mapping[str, Any] | None, dict[str, Any]
+    ] | None = None
+
     # Entity Properties
     _attr_assumed_state: bool = False
     _attr_available: bool = True
@@ -446,7 +462,9 @@ class Entity(ABC):
                 await self.async_device_update()
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Update for %s fails", self.entity_id)
+                self._update_failures += 1
                 return
+            self._update_failures = 0
 
         self._async_write_ha_state()
 
@@ -492,8 +510,23 @@ class Entity(ABC):
 
         start = timer()
 
-        attr = self.capability_attributes
-        attr = dict(attr) if attr else {}
+        static_properties = self._static_properties
+        capability_attributes: Mapping[str, Any] | None = None
+        static_attributes: dict[str, Any] | None = None
+        if static_properties:
+            static = self._static_attributes
+            if static is None or static[0] is not self.registry_entry:
+                static = self._static_attributes = (
+                    self.registry_entry,
+                    self.capability_attributes
+                    if "capability_attributes" in static_properties
+                    else None,
+                    self._async_entity_attributes({}, static_properties, True),
+                )
+            _, capability_attributes, static_attributes = static
+        if "capability_attributes" not in static_properties:
+            capability_attributes = self.capability_attributes
+        attr = dict(capability_attributes) if capability_attributes else {}
 
         state = self._stringify_state()
         if self.available:
@@ -505,35 +538,9 @@ class Entity(ABC):
                 extra_state_attributes = self.device_state_attributes
             attr.update(extra_state_attributes or {})
 
-        unit_of_measurement = self.unit_of_measurement
-        if unit_of_measurement is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        entry = self.registry_entry
-        # pylint: disable=consider-using-ternary
-        name = (entry and entry.name) or self.name
-        if name is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        icon = (entry and entry.icon) or self.icon
-        if icon is not None:
-            attr[ATTR_ICON] = icon
-
-        entity_picture = self.entity_picture
-        if entity_picture is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
-        assumed_state = self.assumed_state
-        if assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        supported_features = self.supported_features
-        if supported_features is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
-
-        device_class = self.device_class
-        if device_class is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
+        if static_attributes:
+            attr.update(static_attributes)
+        self._async_entity_attributes(attr, static_properties, False)
 
         end = timer()
 
@@ -579,6 +586,58 @@ class Entity(ABC):
             self.entity_id, state, attr, self.force_update, self._context
         )
 
+    def _async_entity_attributes(
+        self, attr: dict[str, Any], properties: frozenset[str], static: bool
+    ) -> dict[str, Any]:
+        """Add the attributes of the entity properties to attr.
+
+        Adds the attributes of the given static properties if static is True,
+        otherwise the attributes of the other properties.
+        """
+        if ("unit_of_measurement" in properties) is static:
+            unit_of_measurement = self.unit_of_measurement
+            if unit_of_measurement is not None:
+                attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+        entry = self.registry_entry
+        if ("name" in properties) is static:
+            # pylint: disable=consider-using-ternary
+            name = (entry and entry.name) or self.name
+            if name is not None:
+                attr[ATTR_FRIENDLY_NAME] = name
+
+        if ("icon" in properties) is static:
+            icon = (entry and entry.icon) or self.icon
+            if icon is not None:
+                attr[ATTR_ICON] = icon
+
+        if ("entity_picture" in properties) is static:
+            entity_picture = self.entity_picture
+            if entity_picture is not None:
+                attr[ATTR_ENTITY_PICTURE] = entity_picture
+
+        if ("assumed_state" in properties) is static:
+            assumed_state = self.assumed_state
+            if assumed_state:
+                attr[ATTR_ASSUMED_STATE] = assumed_state
+
+        if ("supported_features" in properties) is static:
+            supported_features = self.supported_features
+            if supported_features is not None:
+                attr[ATTR_SUPPORTED_FEATURES] = supported_features
+
+        if ("device_class" in properties) is static:
+            device_class = self.device_class
+            if device_class is not None:
+                attr[ATTR_DEVICE_CLASS] = str(device_class)
+
+        return attr
+
+    @callback
+    def async_invalidate_static_attributes(self) -> None:
+        """Assemble the attributes of the static properties on the next write."""
+        self._static_attributes = None
+
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
 
@@ -4,11 +4,15 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Coroutine, Iterable
 from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import partial
 import logging
 from logging import Logger
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Callable, Protocol
+import zlib
 
 import voluptuous as vol
 
@@ -33,6 +37,7 @@ from homeassistant.exceptions import (
     RequiredParameterMissing,
 )
 from homeassistant.setup import async_start_setup
+from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
 from . import (
@@ -43,7 +48,7 @@ from . import (
 )
 from .device_registry import DeviceRegistry
 from .entity_registry import DISABLED_INTEGRATION, EntityRegistry
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later, async_track_point_in_utc_time
 from .typing import ConfigType, DiscoveryInfoType
 
 if TYPE_CHECKING:
@@ -59,6 +64,15 @@ PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
 PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 
+# The entities of a platform are polled in this many slots spread over the
+# scan interval, so they do not all update at the same time
+POLL_SLOTS = 10
+# Entities whose update failed or overran this many times in a row are polled
+# less often
+POLL_BACKOFF_FAILURES = 3
+# Entities that back off are polled at least every this many scan intervals
+POLL_BACKOFF_MAX_INTERVALS = 8
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -71,6 +85,41 @@ class AddEntitiesCallback(Protocol):
         """Define add_entities type."""
 
 
+@dataclass
+class PollingStats:
+    """Statistics of the polling of an entity platform."""
+
+    # Slots of a scan interval in which entities were polled
+    intervals: int = 0
+    # Updates of entities
+    polls: int = 0
+    # Updates of entities that raised
+    failures: int = 0
+    # Polls skipped because the previous update of the entity did not finish
+    overruns: int = 0
+    # Polls skipped because the entity backs off after failing
+    backoffs: int = 0
+    # Seconds it took to update the entities of a slot
+    last_latency: float | None = None
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dict."""
+        return {
+            "intervals": self.intervals,
+            "polls": self.polls,
+            "failures": self.failures,
+            "overruns": self.overruns,
+            "backoffs": self.backoffs,
+            "last_latency": self.last_latency,
+            "mean_latency": self.total_latency / self.intervals
+            if self.intervals
+            else None,
+            "max_latency": self.max_latency,
+        }
+
+
 class EntityPlatform:
     """Manage the entities for a single platform."""
 
@@ -102,7 +151,16 @@ class EntityPlatform:
         self._async_unsub_polling: CALLBACK_TYPE | None = None
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: CALLBACK_TYPE | None = None
-        self._process_updates: asyncio.Lock | None = None
+        # Methods to cancel the next poll of each slot, None is the first poll
+        self._poll_unsubs: dict[int | None, CALLBACK_TYPE] = {}
+        # Slot in the scan interval in which an entity is polled
+        self._poll_slots: dict[str, int] = {}
+        self._next_poll_slot = 0
+        # Polls in a row of an entity that failed or overran
+        self._poll_failures: dict[str, int] = {}
+        # Scan intervals to skip polling an entity that backs off
+        self._poll_backoff: dict[str, int] = {}
+        self.polling_stats = PollingStats()
 
         self.parallel_updates: asyncio.Semaphore | None = None
 
@@ -402,12 +460,52 @@ class EntityPlatform:
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
-            self.scan_interval,
+        self._async_unsub_polling = self._async_unsub_poll_slots
+        self._async_schedule_poll(None, dt_util.utcnow() + self.scan_interval)
+
+    def _poll_phase(self, slot: int) -> float:
+        """Return how early in the scan interval a slot is polled.
+
+        The slots are spread evenly over the interval. They are offset by a
+        fraction derived from the platform, so the slots of platforms set up
+        together do not line up and keep their phase on every run.
+        """
+        key = f"{self.domain}.{self.platform_name}"
+        if self.config_entry is not None:
+            key = f"{key}.{self.config_entry.entry_id}"
+        return (slot + zlib.crc32(key.encode()) / 2 ** 32) / POLL_SLOTS
+
+    @callback
+    def _async_schedule_poll(self, slot: int | None, point_in_time: datetime) -> None:
+        """Schedule the next poll of a slot, or the first poll of all slots."""
+        self._poll_unsubs[slot] = async_track_point_in_utc_time(
+            self.hass, partial(self._async_poll_slot, slot), point_in_time
         )
 
+    @callback
+    def _async_unsub_poll_slots(self) -> None:
+        """Cancel the next poll of all slots."""
+        while self._poll_unsubs:
+            self._poll_unsubs.popitem()[1]()
+
+    async def _async_poll_slot(self, slot: int | None, now: datetime) -> None:
+        """Poll the entities of a slot and schedule its next poll.
+
+        The first poll updates all entities one scan interval after they were
+        added. Each slot then moves to its phase, which is early in the next
+        interval, so every entity is still polled once per scan interval.
+        """
+        if slot is None:
+            del self._poll_unsubs[None]
+            for next_slot in range(POLL_SLOTS):
+                self._async_schedule_poll(
+                    next_slot,
+                    now + self.scan_interval * (1 - self._poll_phase(next_slot)),
+                )
+        else:
+            self._async_schedule_poll(slot, now + self.scan_interval)
+        await self._update_entity_states(now, slot)
+
     async def _async_add_entity(  # noqa: C901
         self,
         entity: Entity,
@@ -569,6 +667,8 @@ class EntityPlatform:
 
         entity_id = entity.entity_id
         self.entities[entity_id] = entity
+        self._poll_slots[entity_id] = self._next_poll_slot
+        self._next_poll_slot = (self._next_poll_slot + 1) % POLL_SLOTS
 
         if not restored:
             # Reserve the state in the state machine
@@ -581,6 +681,9 @@ class EntityPlatform:
         def remove_entity_cb() -> None:
             """Remove entity from entities list."""
             self.entities.pop(entity_id)
+            self._poll_slots.pop(entity_id, None)
+            self._poll_failures.pop(entity_id, None)
+            self._poll_backoff.pop(entity_id, None)
 
         entity.async_on_remove(remove_entity_cb)
 
@@ -678,34 +781,86 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
+    async def _update_entity_states(
+        self, now: datetime, slot: int | None = None
+    ) -> None:
+        """Update the states of the polling entities of a slot, or of all slots.
 
         To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+        in parallel and other entities sequential. Entities that keep failing
+        or are still updating from the previous scan interval are polled less
+        often.
 
         This method must be run in the event loop.
         """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
+        stats = self.polling_stats
+        start = timer()
+        tasks = []
+        overruns = 0
+        for entity_id, entity in self.entities.items():
+            if not entity.should_poll or (
+                slot is not None and self._poll_slots.get(entity_id) != slot
+            ):
+                continue
+            if skip := self._poll_backoff.get(entity_id):
+                self._poll_backoff[entity_id] = skip - 1
+                stats.backoffs += 1
+                continue
+            # pylint: disable=protected-access
+            if entity._update_staged:
+                overruns += 1
+                self._async_poll_failed(entity_id)
+                continue
+            tasks.append(self._async_poll_entity(entity))
+
+        if overruns:
+            stats.overruns += overruns
             self.logger.warning(
                 "Updating %s %s took longer than the scheduled update interval %s",
                 self.platform_name,
                 self.domain,
                 self.scan_interval,
             )
+
+        if not tasks:
             return
 
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
+        await asyncio.gather(*tasks)
 
-            if tasks:
-                await asyncio.gather(*tasks)
+        latency = timer() - start
+        stats.intervals += 1
+        stats.last_latency = latency
+        stats.max_latency = max(stats.max_latency, latency)
+        stats.total_latency += latency
+
+    async def _async_poll_entity(self, entity: Entity) -> None:
+        """Update an entity and back off if it keeps failing."""
+        await entity.async_update_ha_state(True)
+
+        stats = self.polling_stats
+        stats.polls += 1
+        # pylint: disable=protected-access
+        if not entity._update_failures:
+            self._poll_failures.pop(entity.entity_id, None)
+            self._poll_backoff.pop(entity.entity_id, None)
+            return
+
+        stats.failures += 1
+        self._async_poll_failed(entity.entity_id)
+
+    @callback
+    def _async_poll_failed(self, entity_id: str) -> None:
+        """Count a failed or overrun poll and back off if they keep happening."""
+        failures = self._poll_failures.get(entity_id, 0) + 1
+        self._poll_failures[entity_id] = failures
+        if failures >= POLL_BACKOFF_FAILURES:
+            self._poll_backoff[entity_id] = (
+                min(
+                    2 ** (failures - POLL_BACKOFF_FAILURES + 1),
+                    POLL_BACKOFF_MAX_INTERVALS,
+                )
+                - 1
+            )
 
 
 current_platform: ContextVar[EntityPlatform | None] = ContextVar(
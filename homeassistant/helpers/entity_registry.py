@@ -12,7 +12,8 @@ from __future__ import annotations
 from collections import OrderedDict
 from collections.abc import Iterable, Mapping
 import logging
-from typing import TYPE_CHECKING, Any, Callable, cast
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, cast
 
 import attr
 
@@ -30,6 +31,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import (
     Event,
+    EventDataFilter,
     HomeAssistant,
     callback,
     split_entity_id,
@@ -74,6 +76,14 @@ ENTITY_DESCRIBING_ATTRIBUTES = {
 }
 
 
+class _EntityIndex(NamedTuple):
+    """Entries by the ids they refer to, then by entity id."""
+
+    device_id: dict[str, dict[str, RegistryEntry]]
+    area_id: dict[str, dict[str, RegistryEntry]]
+    config_entry_id: dict[str, dict[str, RegistryEntry]]
+
+
 @attr.s(slots=True, frozen=True)
 class RegistryEntry:
     """Entity Registry Entry."""
@@ -154,7 +164,10 @@ class EntityRegistry:
         self.hass = hass
         self.entities: dict[str, RegistryEntry]
         self._index: dict[tuple[str, str, str], str] = {}
-        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._entries_index = _EntityIndex(device_id={}, area_id={}, config_entry_id={})
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION, STORAGE_KEY, journal_key=itemgetter("entity_id")
+        )
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_modified
         )
@@ -562,19 +575,16 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
+        for entity_id in list(
+            self._entries_index.config_entry_id.get(config_entry, ())
+        ):
             self.async_remove(entity_id)
 
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for entity_id, entry in self.entities.items():
-            if area_id == entry.area_id:
-                self._async_update_entity(entity_id, area_id=None)
+        for entity_id in list(self._entries_index.area_id.get(area_id, ())):
+            self._async_update_entity(entity_id, area_id=None)
 
     def _register_entry(self, entry: RegistryEntry) -> None:
         self.entities[entry.entity_id] = entry
@@ -582,6 +592,9 @@ class EntityRegistry:
 
     def _add_index(self, entry: RegistryEntry) -> None:
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        for attr_name, index in zip(_EntityIndex._fields, self._entries_index):
+            if (key := getattr(entry, attr_name)) is not None:
+                index.setdefault(key, {})[entry.entity_id] = entry
 
     def _unregister_entry(self, entry: RegistryEntry) -> None:
         self._remove_index(entry)
@@ -589,9 +602,16 @@ class EntityRegistry:
 
     def _remove_index(self, entry: RegistryEntry) -> None:
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
+        for attr_name, index in zip(_EntityIndex._fields, self._entries_index):
+            if (key := getattr(entry, attr_name)) is not None:
+                entries = index[key]
+                del entries[entry.entity_id]
+                if not entries:
+                    del index[key]
 
     def _rebuild_index(self) -> None:
         self._index = {}
+        self._entries_index = _EntityIndex(device_id={}, area_id={}, config_entry_id={})
         for entry in self.entities.values():
             self._add_index(entry)
 
@@ -623,11 +643,13 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str, include_disabled_entities: bool = False
 ) -> list[RegistryEntry]:
     """Return entries that match a device."""
+    entries = registry._entries_index.device_id.get(  # pylint: disable=protected-access
+        device_id, {}
+    )
     return [
         entry
-        for entry in registry.entities.values()
-        if entry.device_id == device_id
-        and (not entry.disabled_by or include_disabled_entities)
+        for entry in entries.values()
+        if not entry.disabled_by or include_disabled_entities
     ]
 
 
@@ -636,7 +658,8 @@ def async_entries_for_area(
     registry: EntityRegistry, area_id: str
 ) -> list[RegistryEntry]:
     """Return entries that match an area."""
-    return [entry for entry in registry.entities.values() if entry.area_id == area_id]
+    entries = registry._entries_index.area_id  # pylint: disable=protected-access
+    return list(entries.get(area_id, {}).values())
 
 
 @callback
@@ -644,11 +667,9 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> list[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    index = registry._entries_index  # pylint: disable=protected-access
+    entries = index.config_entry_id
+    return list(entries.get(config_entry_id, {}).values())
 
 
 @callback
@@ -694,11 +715,6 @@ async def _async_migrate(entities: dict[str, Any]) -> dict[str, list[dict[str, A
 def async_setup_entity_restore(hass: HomeAssistant, registry: EntityRegistry) -> None:
     """Set up the entity restore mechanism."""
 
-    @callback
-    def cleanup_restored_states_filter(event: Event) -> bool:
-        """Clean up restored states filter."""
-        return bool(event.data["action"] == "remove")
-
     @callback
     def cleanup_restored_states(event: Event) -> None:
         """Clean up restored states."""
@@ -712,7 +728,7 @@ def async_setup_entity_restore(hass: HomeAssistant, registry: EntityRegistry) ->
     hass.bus.async_listen(
         EVENT_ENTITY_REGISTRY_UPDATED,
         cleanup_restored_states,
-        event_filter=cleanup_restored_states_filter,
+        event_filter=EventDataFilter("action", "remove"),
     )
 
     if hass.is_running:
@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 import json
 from typing import Any
 
+from homeassistant.util.json import json_dumps as _json_dumps
+
 
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
@@ -22,6 +24,14 @@ class JSONEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
+def json_dumps(data: Any) -> str:
+    """Dump data to a compact JSON string.
+
+    NaN and infinity are rejected since they are not valid JSON.
+    """
+    return _json_dumps(data, encoder=JSONEncoder, allow_nan=False)
+
+
 class ExtendedJSONEncoder(JSONEncoder):
     """JSONEncoder that supports Home Assistant objects and falls back to repr(o)."""
 
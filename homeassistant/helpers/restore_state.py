@@ -36,6 +36,10 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How long an unchanged state keeps the last_seen of a previous dump, until
+# then the journal of the store does not have to write it again
+LAST_SEEN_REFRESH_INTERVAL = timedelta(hours=1)
+
 
 class StoredState:
     """Object to represent a stored state."""
@@ -110,10 +114,16 @@ class RestoreStateData:
         """Initialize the restore state data class."""
         self.hass: HomeAssistant = hass
         self.store: Store = Store(
-            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY,
+            encoder=JSONEncoder,
+            journal_key=_stored_state_key,
         )
         self.last_states: dict[str, StoredState] = {}
         self.entity_ids: set[str] = set()
+        # The stored states of the current entities in the last dump
+        self._dumped_states: dict[str, StoredState] = {}
 
     @callback
     def async_get_stored_states(self) -> list[StoredState]:
@@ -133,13 +143,25 @@ class RestoreStateData:
         }
 
         # Start with the currently registered states
-        stored_states = [
-            StoredState(state, now)
-            for state in all_states
-            if state.entity_id in self.entity_ids and
-            # Ignore all states that are entity registry placeholders
-            not state.attributes.get(entity_registry.ATTR_RESTORED)
-        ]
+        refresh_time = now - LAST_SEEN_REFRESH_INTERVAL
+        stored_states = []
+        for state in all_states:
+            if state.entity_id not in self.entity_ids or (
+                # Ignore all states that are entity registry placeholders
+                state.attributes.get(entity_registry.ATTR_RESTORED)
+            ):
+                continue
+            stored_state = self._dumped_states.get(state.entity_id)
+            if (
+                stored_state is None
+                or stored_state.state is not state
+                or stored_state.last_seen < refresh_time
+            ):
+                stored_state = StoredState(state, now)
+            stored_states.append(stored_state)
+        self._dumped_states = {
+            stored_state.state.entity_id: stored_state for stored_state in stored_states
+        }
         expiration_time = now - STATE_EXPIRATION
 
         for entity_id, stored_state in self.last_states.items():
@@ -218,6 +240,11 @@ class RestoreStateData:
         self.entity_ids.remove(entity_id)
 
 
+def _stored_state_key(item: dict[str, Any]) -> str:
+    """Return the key of a stored state in the journal."""
+    return cast(str, item["state"]["entity_id"])
+
+
 def _encode(value: Any) -> Any:
     """Little helper to JSON encode a value."""
     try:
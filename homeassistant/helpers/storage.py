@@ -10,16 +10,20 @@ from typing import Any, Callable
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.core import CALLBACK_TYPE, CoreState, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.event import async_call_later
 from homeassistant.loader import bind_hass
-from homeassistant.util import json as json_util
+from homeassistant.util import json as json_util, uuid as uuid_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-warn-return-any
 # mypy: no-check-untyped-defs
 
 STORAGE_DIR = ".storage"
+JOURNAL_SUFFIX = ".journal"
 _LOGGER = logging.getLogger(__name__)
 
+_MISSING = object()
+
 
 @bind_hass
 async def async_migrator(
@@ -65,7 +69,19 @@ async def async_migrator(
 
 @bind_hass
 class Store:
-    """Class to help storing data."""
+    """Class to help storing data.
+
+    With a journal_key the store writes a journal: instead of rewriting the
+    whole file on every save, only the items that changed since the previous
+    save are appended to a journal file next to it. The data has to be a
+    list of items or a dict of lists of items, journal_key returns the
+    unique key of an item. Saved items are compared with the next save, so
+    they must not be changed afterwards, and lists made from sets should be
+    sorted so their order does not change between restarts. The journal is
+    compacted into the file on load, on the final write and when it would
+    grow larger than the file, so older versions and other tools reading
+    the file only miss the changes of a running instance.
+    """
 
     def __init__(
         self,
@@ -75,6 +91,7 @@ class Store:
         private: bool = False,
         *,
         encoder: type[JSONEncoder] | None = None,
+        journal_key: Callable[[Any], str] | None = None,
     ) -> None:
         """Initialize storage class."""
         self.version = version
@@ -87,12 +104,23 @@ class Store:
         self._write_lock = asyncio.Lock()
         self._load_task: asyncio.Future | None = None
         self._encoder = encoder
+        self._journal_key = journal_key
+        # The last written data as returned by _journal_items
+        self._journal_base: tuple[Any, dict[tuple, Any]] | None = None
+        self._journal_id: str | None = None
+        self._journal_size = 0
+        self._snapshot_size = 0
 
     @property
     def path(self):
         """Return the config path."""
         return self.hass.config.path(STORAGE_DIR, self.key)
 
+    @property
+    def journal_path(self):
+        """Return the path of the journal."""
+        return self.path + JOURNAL_SUFFIX
+
     async def async_load(self) -> dict | list | None:
         """Load data.
 
@@ -124,9 +152,7 @@ class Store:
             if "data_func" in data:
                 data["data"] = data.pop("data_func")()
         else:
-            data = await self.hass.async_add_executor_job(
-                json_util.load_json, self.path
-            )
+            data = await self.hass.async_add_executor_job(self._load_data)
 
             if data == {}:
                 return None
@@ -143,6 +169,67 @@ class Store:
 
         return stored
 
+    def _load_data(self) -> dict:
+        """Load the data and replay the journal."""
+        data = json_util.load_json(self.path)
+        if self._journal_key is None or not data:
+            return data
+
+        journal_id = data.pop("journal", None)
+        journal = self._journal_items(data["data"])
+        if journal_id is None or journal is None:
+            return data
+
+        layout, items = journal
+        replayed = False
+        try:
+            with open(self.journal_path, encoding="utf-8") as fdesc:
+                for line in fdesc:
+                    replayed = True
+                    try:
+                        record = json_util.json_loads(line)
+                    except ValueError:
+                        # A save was interrupted
+                        _LOGGER.warning(
+                            "Ignoring the incomplete end of the journal of %s",
+                            self.key,
+                        )
+                        break
+                    # Left over from a compaction that was interrupted
+                    if record["journal"] != journal_id:
+                        continue
+                    for change in record["changes"]:
+                        if len(change) == 3:
+                            items[(change[0], change[1])] = change[2]
+                        else:
+                            items.pop((change[0], change[1]), None)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            _LOGGER.exception("Journal reading failed: %s", self.journal_path)
+            raise HomeAssistantError(err) from err
+
+        data["data"] = _journal_data(layout, items)
+
+        if replayed:
+            _LOGGER.debug("Compacting the journal of %s", self.key)
+            try:
+                self._write_snapshot(self.path, data, (layout, items))
+            except (json_util.SerializationError, json_util.WriteError) as err:
+                # The next save writes the file
+                _LOGGER.error("Error compacting journal for %s: %s", self.key, err)
+                self._journal_base = None
+        else:
+            self._journal_base = layout, items
+            self._journal_id = journal_id
+            self._journal_size = 0
+            self._snapshot_size = os.path.getsize(self.path)
+
+        if data["version"] != self.version:
+            # The migrated data is saved as a new file
+            self._journal_base = None
+        return data
+
     async def async_save(self, data: dict | list) -> None:
         """Save data."""
         self._data = {"version": self.version, "key": self.key, "data": data}
@@ -210,8 +297,20 @@ class Store:
             self._async_cleanup_final_write_listener()
 
             if self._data is None:
-                # Another write already consumed the data
-                return
+                if (
+                    self._journal_size
+                    and self._journal_base is not None
+                    and self.hass.state == CoreState.final_write
+                ):
+                    # Compact the changes written since the last snapshot
+                    self._data = {
+                        "version": self.version,
+                        "key": self.key,
+                        "data": _journal_data(*self._journal_base),
+                    }
+                else:
+                    # Another write already consumed the data
+                    return
 
             data = self._data
 
@@ -227,13 +326,144 @@ class Store:
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
+            if self._journal_size:
+                self._async_ensure_final_write_listener()
+
     def _write_data(self, path: str, data: dict) -> None:
         """Write the data."""
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
+        if self._journal_key is None:
+            _LOGGER.debug("Writing data for %s to %s", self.key, path)
+            json_util.save_json(path, data, self._private, encoder=self._encoder)
+            return
+
+        try:
+            # Compare the items as they are loaded from the file
+            data = {
+                **data,
+                "data": json_util.json_loads(
+                    json_util.json_dumps(data["data"], encoder=self._encoder)
+                ),
+            }
+        except (TypeError, ValueError):
+            # Let writing the file report the data that can not be serialized
+            pass
+
+        journal = self._journal_items(data["data"])
+        if (
+            journal is not None
+            and self._journal_base is not None
+            and journal[0] == self._journal_base[0]
+            and self.hass.state != CoreState.final_write
+        ):
+            line = self._journal_line(journal[1])
+            if line is None:
+                _LOGGER.debug("Data of %s did not change", self.key)
+                self._journal_base = journal
+                return
+            if self._journal_size + len(line) < self._snapshot_size:
+                _LOGGER.debug("Appending changes of %s to the journal", self.key)
+                self._append_journal(line)
+                self._journal_size += len(line)
+                self._journal_base = journal
+                return
+
         _LOGGER.debug("Writing data for %s to %s", self.key, path)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        self._write_snapshot(path, data, journal)
+
+    def _write_snapshot(
+        self, path: str, data: dict, journal: tuple[Any, dict[tuple, Any]] | None
+    ) -> None:
+        """Write the data to the file and start a new journal."""
+        journal_id = uuid_util.random_uuid_hex()
+        json_util.save_json(
+            path,
+            {**data, "journal": journal_id},
+            self._private,
+            encoder=self._encoder,
+        )
+        # A journal left behind belongs to the previous journal id
+        with suppress(FileNotFoundError):
+            os.unlink(self.journal_path)
+        self._journal_base = journal
+        self._journal_id = journal_id
+        self._journal_size = 0
+        self._snapshot_size = os.path.getsize(path)
+
+    def _journal_items(self, data: Any) -> tuple[Any, dict[tuple, Any]] | None:
+        """Return the layout and the items of the data by section and key.
+
+        Returns None if the data can not be journaled.
+        """
+        items: dict[tuple, Any] = {}
+        if isinstance(data, list):
+            layout = None
+            sections: Any = ((None, data),)
+        elif isinstance(data, dict):
+            layout = tuple(
+                (section, isinstance(value, list)) for section, value in data.items()
+            )
+            sections = data.items()
+        else:
+            return None
+
+        num_items = 0
+        for section, value in sections:
+            if not isinstance(value, list):
+                items[(section, None)] = value
+                num_items += 1
+                continue
+            for item in value:
+                items[(section, self._journal_key(item))] = item
+            num_items += len(value)
+
+        # Items with the same key would be lost
+        if len(items) != num_items:
+            return None
+        return layout, items
+
+    def _journal_line(self, items: dict[tuple, Any]) -> str | None:
+        """Return the journal record of the changes or None if nothing changed."""
+        assert self._journal_base is not None
+        base = self._journal_base[1]
+        changes: list[list] = [
+            [section, key, item]
+            for (section, key), item in items.items()
+            if base.get((section, key), _MISSING) != item
+        ]
+        changes.extend(
+            [section, key] for section, key in base if (section, key) not in items
+        )
+        if not changes:
+            return None
+        try:
+            return (
+                json_util.json_dumps(
+                    {"journal": self._journal_id, "changes": changes},
+                    encoder=self._encoder,
+                )
+                + "\n"
+            )
+        except (TypeError, ValueError) as err:
+            raise json_util.SerializationError(
+                f"Failed to serialize to JSON: {self.journal_path}: {err}"
+            ) from err
+
+    def _append_journal(self, line: str) -> None:
+        """Append a record to the journal."""
+        try:
+            fd = os.open(
+                self.journal_path,
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                0o600 if self._private else 0o644,
+            )
+            with open(fd, "w", encoding="utf-8") as fdesc:
+                fdesc.write(line)
+        except OSError as err:
+            _LOGGER.exception("Appending to journal failed: %s", self.journal_path)
+            raise json_util.WriteError(err) from err
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
@@ -246,3 +476,22 @@ class Store:
 
         with suppress(FileNotFoundError):
             await self.hass.async_add_executor_job(os.unlink, self.path)
+
+        if self._journal_key is not None:
+            self._journal_base = None
+            with suppress(FileNotFoundError):
+                await self.hass.async_add_executor_job(os.unlink, self.journal_path)
+
+
+def _journal_data(layout: Any, items: dict[tuple, Any]) -> Any:
+    """Return the data with the items returned by Store._journal_items."""
+    if layout is None:
+        return list(items.values())
+    data: dict[str, Any] = {
+        section: [] if is_list else items.get((section, None))
+        for section, is_list in layout
+    }
+    for (section, key), item in items.items():
+        if key is not None:
+            data[section].append(item)
+    return data
@@ -10,16 +10,22 @@ from contextlib import suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from functools import partial, wraps
+import hashlib
+import importlib.util
 import json
 import logging
+import marshal
 import math
 from operator import attrgetter
+import os
 import random
 import re
 import sys
+import tempfile
+import threading
+from types import CodeType
 from typing import Any, Callable, cast
 from urllib.parse import urlencode as urllib_urlencode
-import weakref
 
 import jinja2
 from jinja2 import pass_context
@@ -32,10 +38,13 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     STATE_UNKNOWN,
 )
 from homeassistant.core import (
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -52,6 +61,7 @@ from homeassistant.helpers.typing import TemplateVarsType
 from homeassistant.loader import bind_hass
 from homeassistant.util import convert, dt as dt_util, location as loc_util
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.lru import LRU
 from homeassistant.util.thread import ThreadWithException
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -64,6 +74,12 @@ _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
+_CODE_CACHE = "template.code_cache"
+
+# Number of compiled templates each environment keeps in memory
+TEMPLATE_CACHE_SIZE = 1024
+
+CODE_CACHE_FILE = "core.template_code_cache"
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -1437,6 +1453,106 @@ class LoggingUndefined(jinja2.Undefined):
         return super().__bool__()
 
 
+class TemplateCodeCache:
+    """The Python code Jinja generated for templates, kept on disk between restarts.
+
+    Generating the code is the expensive part of compiling a template.
+    The cache is only valid for the Jinja version and Python bytecode it
+    was written with, entries are further keyed on the filters and tests
+    of the environment since Jinja checks those when generating the code.
+    Only the most recently used entries since the start are written back,
+    as many as the environments keep compiled templates.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the cache."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded: dict[tuple[str, str], CodeType] = {}
+        self._used: LRU = LRU(TEMPLATE_CACHE_SIZE)
+        self._dirty = False
+
+    @staticmethod
+    def _header() -> tuple[str, bytes]:
+        """Return what the cached code depends on outside of the environment."""
+        return (jinja2.__version__, importlib.util.MAGIC_NUMBER)
+
+    def load(self) -> None:
+        """Load the cache from disk."""
+        try:
+            with open(self.path, "rb") as fdesc:
+                header, codes = marshal.load(fdesc)
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, ValueError, TypeError) as err:
+            _LOGGER.warning("Ignoring unreadable template cache %s: %s", self.path, err)
+            return
+        if header != self._header():
+            _LOGGER.debug("Ignoring template cache of another Jinja or Python version")
+            return
+        with self._lock:
+            # Caches of older versions were not bounded, keep the most recent
+            self._loaded = dict(list(codes.items())[-TEMPLATE_CACHE_SIZE:])
+
+    def save(self) -> None:
+        """Write the entries used since the start to disk."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = marshal.dumps((self._header(), dict(self._used)))
+            self._dirty = False
+
+        tmp_filename = ""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(self.path), delete=False
+            ) as fdesc:
+                fdesc.write(data)
+                tmp_filename = fdesc.name
+            os.replace(tmp_filename, self.path)
+        except OSError as err:
+            _LOGGER.error("Saving template cache %s failed: %s", self.path, err)
+        finally:
+            if os.path.exists(tmp_filename):
+                with suppress(OSError):
+                    os.remove(tmp_filename)
+
+    def get(self, fingerprint: str, source: str) -> CodeType | None:
+        """Return the code of a template if it is cached."""
+        key = (fingerprint, source)
+        with self._lock:
+            if (code := self._used.get(key)) is None and (
+                code := self._loaded.pop(key, None)
+            ) is not None:
+                self._used[key] = code
+                self._dirty = True
+        return code
+
+    def set(self, fingerprint: str, source: str, code: CodeType) -> None:
+        """Add the code of a template."""
+        with self._lock:
+            self._used[(fingerprint, source)] = code
+            self._dirty = True
+
+
+async def async_load_code_cache(hass: HomeAssistant) -> None:
+    """Load the code of the templates compiled before the last restart."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.storage import STORAGE_DIR
+
+    code_cache = TemplateCodeCache(hass.config.path(STORAGE_DIR, CODE_CACHE_FILE))
+    await hass.async_add_executor_job(code_cache.load)
+    hass.data[_CODE_CACHE] = code_cache
+
+    async def _async_save(_: Event) -> None:
+        """Save the cache once the templates of the start are compiled."""
+        await hass.async_add_executor_job(code_cache.save)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_save)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _async_save)
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -1448,7 +1564,10 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        self.template_cache: LRU = LRU(TEMPLATE_CACHE_SIZE)
+        self._template_cache_lock = threading.Lock()
+        self._mode = "limited" if limited else "strict" if strict else "normal"
+        self._fingerprint: str | None = None
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1603,12 +1722,51 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             # any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        cached = self.template_cache.get(source)
-
-        if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
+        with self._template_cache_lock:
+            cached = self.template_cache.get(source)
+        if cached is not None:
+            return cached
 
+        code_cache: TemplateCodeCache | None = (
+            self.hass.data.get(_CODE_CACHE) if self.hass is not None else None
+        )
+        if code_cache is None:
+            cached = super().compile(source)
+        elif (cached := code_cache.get(self.fingerprint, source)) is None:
+            cached = super().compile(source)
+            code_cache.set(self.fingerprint, source, cached)
+
+        with self._template_cache_lock:
+            self.template_cache[source] = cached
         return cached
 
+    @property
+    def fingerprint(self) -> str:
+        """Return a digest of what the code generated for a template depends on.
+
+        Jinja checks which filters and tests exist and passes the context,
+        eval context or environment as the first argument in the generated
+        code of those asking for it.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha1(
+                repr(
+                    (
+                        self._mode,
+                        _pass_args(self.filters),
+                        _pass_args(self.tests),
+                    )
+                ).encode()
+            ).hexdigest()
+        return self._fingerprint
+
+
+def _pass_args(funcs: dict[str, Callable]) -> list[tuple[str, str | None]]:
+    """Return the names of functions and the argument Jinja passes them."""
+    return sorted(
+        (name, getattr(getattr(func, "jinja_pass_arg", None), "name", None))
+        for name, func in funcs.items()
+    )
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
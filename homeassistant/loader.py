@@ -14,6 +14,7 @@ import json
 import logging
 import pathlib
 import sys
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Callable, Dict, TypedDict, TypeVar, cast
 
@@ -42,6 +43,7 @@ CALLABLE_T = TypeVar(  # pylint: disable=invalid-name
 _LOGGER = logging.getLogger(__name__)
 
 DATA_COMPONENTS = "components"
+DATA_IMPORT_TIME = "import_time"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
@@ -483,21 +485,69 @@ class Integration:
 
         return self._all_dependencies_resolved
 
+    async def async_get_component(self) -> ModuleType:
+        """Return the component, importing it in the executor if needed."""
+        cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
+        if self.domain in cache:
+            return cache[self.domain]  # type: ignore
+        return await self._async_import(self.domain, self.get_component)
+
     def get_component(self) -> ModuleType:
         """Return the component."""
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         if self.domain not in cache:
+            start = timer()
             cache[self.domain] = importlib.import_module(self.pkg_path)
+            self._record_import_time(self.domain, timer() - start)
         return cache[self.domain]  # type: ignore
 
+    async def async_get_platform(self, platform_name: str) -> ModuleType:
+        """Return a platform, importing it in the executor if needed."""
+        cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
+        full_name = f"{self.domain}.{platform_name}"
+        if full_name in cache:
+            return cache[full_name]  # type: ignore
+        return await self._async_import(full_name, self.get_platform, platform_name)
+
     def get_platform(self, platform_name: str) -> ModuleType:
         """Return a platform for an integration."""
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         full_name = f"{self.domain}.{platform_name}"
         if full_name not in cache:
+            start = timer()
             cache[full_name] = self._import_platform(platform_name)
+            self._record_import_time(full_name, timer() - start)
         return cache[full_name]  # type: ignore
 
+    async def _async_import(
+        self, name: str, get_module: Callable[..., ModuleType], *args: Any
+    ) -> ModuleType:
+        """Import a module of the integration in the executor.
+
+        Some modules can only be imported in the event loop, like those
+        creating asyncio primitives at import time before Python 3.10, and
+        concurrent imports of packages importing each other can deadlock in
+        importlib. Both raise RuntimeError, those modules are imported in the
+        event loop instead.
+        """
+        try:
+            return await self.hass.async_add_executor_job(get_module, *args)
+        except RuntimeError as err:
+            _LOGGER.debug(
+                "Importing %s in the executor failed, importing it in the event loop: %s",
+                name,
+                err,
+            )
+            return get_module(*args)
+
+    def _record_import_time(self, name: str, seconds: float) -> None:
+        """Record how long importing a module of the integration took.
+
+        Imports run both in the event loop and in the executor, a plain
+        dict assignment is safe from either.
+        """
+        self.hass.data.setdefault(DATA_IMPORT_TIME, {})[name] = seconds
+
     def _import_platform(self, platform_name: str) -> ModuleType:
         """Import the platform."""
         return importlib.import_module(f"{self.pkg_path}.{platform_name}")
@@ -5,18 +5,21 @@ import argparse
 import asyncio
 import collections
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import logging
 from timeit import default_timer as timer
+import tracemalloc
 from typing import Callable, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
 from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.helpers.entity_values import EntityValues
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -146,6 +149,141 @@ async def time_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def state_machine_set_10k_entities(hass):
+    """Set the states of 10k entities 10 times with the same attributes."""
+    start = timer()
+    _set_10k_entity_states(hass, 10)
+    return timer() - start
+
+
+@benchmark
+async def state_machine_memory_10k_entities(hass):
+    """Measure the memory used by the states of 10k entities."""
+    tracemalloc.start()
+    start = timer()
+    _set_10k_entity_states(hass, 2)
+    runtime = timer() - start
+    print(f"States use {tracemalloc.get_traced_memory()[0] / 2 ** 20:.1f} MiB")
+    tracemalloc.stop()
+    return runtime
+
+
+def _set_10k_entity_states(hass, rounds):
+    """Set the states of 10k entities like input selects write them."""
+    for round_ in range(rounds):
+        for idx in range(10 ** 4):
+            hass.states.async_set(
+                f"input_select.select_{idx}",
+                f"Option {(idx + round_) % 20}",
+                {
+                    "options": [f"Option {option}" for option in range(20)],
+                    "editable": True,
+                    "friendly_name": f"Select {idx}",
+                    "icon": "mdi:format-list-bulleted",
+                },
+            )
+
+
+@benchmark
+async def entity_write_ha_state_static_properties(hass):
+    """Write the states of 1k power sensors 100 times with static properties."""
+    runtime = _write_1k_sensor_states(hass, frozenset())
+    print(f"Without static properties: {runtime}s")
+    return _write_1k_sensor_states(
+        hass,
+        frozenset(
+            {
+                "assumed_state",
+                "capability_attributes",
+                "device_class",
+                "entity_picture",
+                "icon",
+                "name",
+                "supported_features",
+                "unit_of_measurement",
+            }
+        ),
+    )
+
+
+def _write_1k_sensor_states(hass, static_properties):
+    """Write the states of 1k power sensors 100 times."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components.sensor import SensorEntity
+
+    class PowerSensor(SensorEntity):
+        """Power sensor."""
+
+        _static_properties = static_properties
+        _attr_device_class = "power"
+        _attr_native_unit_of_measurement = "W"
+        _attr_state_class = "measurement"
+
+    sensors = []
+    for idx in range(1000):
+        sensor = PowerSensor()
+        sensor.hass = hass
+        sensor.entity_id = f"sensor.power_{idx}"
+        sensor._attr_name = f"Power {idx}"
+        sensors.append(sensor)
+
+    start = timer()
+    for value in range(100):
+        for sensor in sensors:
+            sensor._attr_native_value = value
+            sensor.async_write_ha_state()
+    return timer() - start
+
+
+@benchmark
+async def service_area_target_8k_entities(hass):
+    """Resolve the entities of an area target 1000 times with 8k entities."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.helpers import (
+        area_registry as ar,
+        device_registry as dr,
+        entity_registry as er,
+        service,
+    )
+
+    area_reg = hass.data[ar.DATA_REGISTRY] = ar.AreaRegistry(hass)
+    area_reg.areas = {
+        f"area_{idx}": ar.AreaEntry(
+            name=f"Area {idx}", normalized_name=f"area {idx}", id=f"area_{idx}"
+        )
+        for idx in range(100)
+    }
+    dev_reg = hass.data[dr.DATA_REGISTRY] = dr.DeviceRegistry(hass)
+    dev_reg.devices = {
+        f"device_{idx}": dr.DeviceEntry(
+            id=f"device_{idx}", area_id=f"area_{idx % 100}", config_entries={"mock"}
+        )
+        for idx in range(2000)
+    }
+    dev_reg.deleted_devices = {}
+    dev_reg._rebuild_index()
+    ent_reg = hass.data[er.DATA_REGISTRY] = er.EntityRegistry(hass)
+    ent_reg.entities = {
+        f"light.light_{idx}": er.RegistryEntry(
+            entity_id=f"light.light_{idx}",
+            unique_id=str(idx),
+            platform="mock",
+            device_id=f"device_{idx % 2000}",
+        )
+        for idx in range(8000)
+    }
+    ent_reg._rebuild_index()
+    call = core.ServiceCall("light", "turn_on", {"area_id": "area_42"})
+
+    start = timer()
+    for _ in range(1000):
+        await service.async_extract_referenced_entity_ids(
+            hass, call, expand_group=False
+        )
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -252,6 +390,366 @@ async def state_changed_event_filter_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def state_changed_5k_filtered_listeners(hass):
+    """Fire 100k state changes with 5k listeners that filter on entity_id."""
+
+    def _entity_id_filter(entity_id):
+        @core.callback
+        def _filter(event):
+            return event.data.get("entity_id") == entity_id
+
+        return _filter
+
+    return await _state_changed_5k_listeners(hass, _entity_id_filter)
+
+
+@benchmark
+async def state_changed_5k_data_filtered_listeners(hass):
+    """Fire 100k state changes with 5k listeners with an entity_id data filter."""
+    return await _state_changed_5k_listeners(
+        hass, lambda entity_id: core.EventDataFilter("entity_id", entity_id)
+    )
+
+
+async def _state_changed_5k_listeners(hass, event_filter_factory):
+    """Fire 100k state changes with 5k listeners each tracking one entity."""
+    count = 0
+    events_to_fire = 10 ** 5
+    entity_ids = [f"sensor.power_{idx}" for idx in range(5000)]
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for entity_id in entity_ids:
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED, listener, event_filter=event_filter_factory(entity_id)
+        )
+
+    events_data = [
+        {
+            "entity_id": entity_id,
+            "old_state": core.State(entity_id, "off"),
+            "new_state": core.State(entity_id, "on"),
+        }
+        for entity_id in entity_ids[:100]
+    ]
+
+    start = timer()
+
+    for idx in range(events_to_fire):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, events_data[idx % 100])
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
+def _mqtt_topic_filters(num_devices):
+    """Return the topic filters subscribed to by MQTT discovered devices."""
+    topic_filters = ["homeassistant/#", "zigbee2mqtt/bridge/#", "tasmota/discovery/#"]
+    for idx in range(num_devices):
+        topic_filters.append(f"zigbee2mqtt/device_{idx}")
+        topic_filters.append(f"zigbee2mqtt/device_{idx}/availability")
+        topic_filters.append(f"tele/tasmota_{idx}/+")
+        topic_filters.append(f"stat/tasmota_{idx}/RESULT")
+        topic_filters.append(f"home/room_{idx % 50}/+/state")
+    return topic_filters
+
+
+@benchmark
+async def mqtt_subscription_matching(hass):
+    """Replay 10 seconds of 2k msg/s on 5k MQTT subscriptions.
+
+    A subscription is added and removed every 10 messages like
+    MQTT discovery does.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.mqtt.matcher import SubscriptionMatcher
+
+    topic_filters = _mqtt_topic_filters(1000)
+    topics = [
+        topic
+        for idx in range(1000)
+        for topic in (
+            f"zigbee2mqtt/device_{idx}",
+            f"tele/tasmota_{idx}/SENSOR",
+            f"home/room_{idx % 50}/sensor_{idx}/state",
+            f"homeassistant/sensor/device_{idx}/config",
+        )
+    ]
+    messages_to_replay = 2000 * 10
+    count = 0
+
+    start = timer()
+
+    matcher: SubscriptionMatcher = SubscriptionMatcher()
+    for topic_filter in topic_filters:
+        matcher.add(topic_filter, object())
+
+    for idx in range(messages_to_replay):
+        if idx % 10 == 0:
+            subscription = object()
+            matcher.add(f"zigbee2mqtt/new_device_{idx}", subscription)
+            matcher.remove(f"zigbee2mqtt/new_device_{idx}", subscription)
+        count += len(matcher.match(topics[idx % len(topics)]))
+
+    # Every room filter is subscribed to by 20 devices
+    assert count == messages_to_replay * 23 // 4
+
+    return timer() - start
+
+
+@benchmark
+async def mqtt_receive_messages(hass):
+    """Receive 100k MQTT messages from a thread standing in for paho."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    import threading
+
+    from homeassistant import config_entries
+    from homeassistant.components import mqtt
+
+    conf = mqtt.CONFIG_SCHEMA({mqtt.DOMAIN: {mqtt.CONF_BROKER: "localhost"}})
+    entry = config_entries.ConfigEntry(
+        1, mqtt.DOMAIN, "benchmark", {}, config_entries.SOURCE_USER
+    )
+    client = mqtt.MQTT(hass, entry, conf[mqtt.DOMAIN])
+    messages_to_receive = 10 ** 5
+    messages = [
+        mqtt.models.ReceiveMessage(f"sensor/power_{idx % 100}", b"100", 0, False)
+        for idx in range(messages_to_receive)
+    ]
+    count = 0
+    received_all = asyncio.Event()
+
+    @core.callback
+    def message_received(msg):
+        """Handle message."""
+        nonlocal count
+        count += 1
+        if count == messages_to_receive:
+            received_all.set()
+
+    await client.async_subscribe("sensor/+", message_received, 0)
+
+    def receive_messages():
+        """Receive the messages like the paho network thread."""
+        for msg in messages:
+            client._mqtt_on_message(None, None, msg)
+
+    start = timer()
+    thread = threading.Thread(target=receive_messages)
+    thread.start()
+    await received_all.wait()
+    runtime = timer() - start
+    thread.join()
+
+    print(f"{messages_to_receive / runtime:.0f} msgs/sec")
+    return runtime
+
+
+@benchmark
+async def prometheus_scrape_5k_entities(hass):
+    """Scrape the metrics of 5k entities 10 times a minute by two servers."""
+    # pylint: disable=import-outside-toplevel
+    from functools import partial
+    from types import SimpleNamespace
+
+    import prometheus_client
+
+    from homeassistant.components import prometheus
+
+    # A registry per run, the default one refuses the metrics of a second run
+    registry = prometheus_client.CollectorRegistry()
+    prometheus_cli = SimpleNamespace(
+        Counter=partial(prometheus_client.Counter, registry=registry),
+        Gauge=partial(prometheus_client.Gauge, registry=registry),
+        generate_latest=partial(prometheus_client.generate_latest, registry),
+    )
+    metrics = prometheus.PrometheusMetrics(
+        prometheus_cli,
+        lambda entity_id: True,
+        prometheus.DEFAULT_NAMESPACE,
+        hass.config.units.temperature_unit,
+        EntityValues({}),
+        None,
+        None,
+    )
+    hass.bus.async_listen(EVENT_STATE_CHANGED, metrics.handle_event)
+    view = prometheus.PrometheusView(prometheus_cli)
+    request = SimpleNamespace(app={"hass": hass})
+
+    entities = 5000
+    scrapes = 10
+    attributes = {
+        "unit_of_measurement": "W",
+        "device_class": "power",
+        "battery_level": 80,
+    }
+
+    def set_states(first, last, value):
+        """Set the states of a range of the entities."""
+        for idx in range(first, last):
+            entity_id = f"sensor.power_{idx}"
+            hass.states.async_set(
+                entity_id, value, dict(attributes, friendly_name=entity_id)
+            )
+
+    set_states(0, entities, "100")
+    await hass.async_block_till_done()
+
+    longest_stall = 0.0
+    ticking = True
+
+    async def tick():
+        """Measure how late the event loop runs a 10 ms sleep."""
+        nonlocal longest_stall
+        while ticking:
+            before = timer()
+            await asyncio.sleep(0.01)
+            longest_stall = max(longest_stall, timer() - before - 0.01)
+
+    ticker = asyncio.create_task(tick())
+    changes_per_scrape = entities // scrapes
+    start = timer()
+    for scrape in range(scrapes):
+        # Every entity changes once a minute
+        set_states(
+            scrape * changes_per_scrape, (scrape + 1) * changes_per_scrape, str(scrape)
+        )
+        await hass.async_block_till_done()
+        await asyncio.gather(view.get(request), view.get(request))
+    runtime = timer() - start
+    ticking = False
+    await ticker
+
+    print(f"Longest event loop stall: {longest_stall * 1000:.0f} ms")
+    return runtime
+
+
+@benchmark
+async def recorder_write_state_changes(hass):
+    """Write 10k state changes for 100 entities through the recorder."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from homeassistant.components import recorder
+
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=1,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=1,
+        db_retry_wait=0,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+        history_cache_max_states=0,
+    )
+    events = []
+    for idx in range(10 ** 4):
+        entity_id = f"sensor.power_{idx % 100}"
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": entity_id,
+                    "old_state": None,
+                    "new_state": core.State(
+                        entity_id,
+                        str(idx),
+                        {"unit_of_measurement": "W", "friendly_name": entity_id},
+                    ),
+                },
+            )
+        )
+
+    def _write_events():
+        """Process the events like the recorder thread, commit every 100 events."""
+        instance._setup_connection()
+        instance._setup_run()
+        start = timer()
+        for idx, event in enumerate(events, 1):
+            instance._process_one_event(event)
+            if idx % 100 == 0:
+                instance._commit_event_session_or_retry()
+        instance._commit_event_session_or_retry()
+        runtime = timer() - start
+        instance._close_event_session()
+        instance._close_connection()
+        return runtime
+
+    return await hass.async_add_executor_job(_write_events)
+
+
+@benchmark
+async def recorder_compile_statistics(hass):
+    """Compile an hour of 5-minute statistics for 1000 sensors."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from types import SimpleNamespace
+
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import statistics
+
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=1,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=1,
+        db_retry_wait=0,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+        history_cache_max_states=0,
+    )
+    statistics.async_setup(hass)
+
+    def compile_statistics(hass, start, end):
+        """Return the statistics of 1000 sensors like the sensor platform."""
+        value = start.minute
+        return {
+            f"sensor.energy_{idx}": {
+                "meta": {
+                    "unit_of_measurement": "kWh",
+                    "has_mean": True,
+                    "has_sum": True,
+                },
+                "stat": {
+                    "mean": value + idx,
+                    "min": value,
+                    "max": value + 2 * idx,
+                    "state": value + idx,
+                    "sum": value * idx,
+                },
+            }
+            for idx in range(1000)
+        }
+
+    hass.data[recorder.DOMAIN] = {
+        "sensor": SimpleNamespace(compile_statistics=compile_statistics)
+    }
+    hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+    def _compile():
+        """Compile the 5-minute periods of an hour, the last one rolls up the hour."""
+        instance._setup_connection()
+        start = timer()
+        for period in range(12):
+            statistics.compile_statistics(
+                instance, hour + timedelta(minutes=5 * period)
+            )
+        runtime = timer() - start
+        instance._close_connection()
+        return runtime
+
+    return await hass.async_add_executor_job(_compile)
+
+
 @benchmark
 async def logbook_filtering_state(hass):
     """Filter state changes."""
@@ -390,6 +888,120 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def json_deserialize_states(hass):
+    """Deserialize million states like the recorder and storage do."""
+    data = JSON_DUMP(
+        [
+            core.State("light.kitchen", "on", {"friendly_name": "Kitchen Lights"})
+            for _ in range(10 ** 6)
+        ]
+    )
+
+    start = timer()
+    json_loads(data)
+    return timer() - start
+
+
+@benchmark
+async def json_serialize_state_attributes(hass):
+    """Serialize the attributes of 100k states like the recorder does."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder.models import StateAttributes
+
+    events = [
+        core.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "new_state": core.State(
+                    "sensor.power",
+                    str(idx),
+                    {
+                        "unit_of_measurement": "W",
+                        "device_class": "power",
+                        "state_class": "measurement",
+                        "friendly_name": "Power",
+                    },
+                )
+            },
+        )
+        for idx in range(10 ** 5)
+    ]
+
+    start = timer()
+    for event in events:
+        StateAttributes.shared_attrs_from_event(event)
+    return timer() - start
+
+
+@benchmark
+async def websocket_subscribe_events_state_changed(hass):
+    """Send 10k state changes to 20 subscribe_events connections."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api import messages
+
+    return _websocket_state_changed_messages(messages.cached_event_message)
+
+
+@benchmark
+async def websocket_subscribe_entities(hass):
+    """Send 10k state changes to 20 subscribe_entities connections."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api import messages
+
+    return _websocket_state_changed_messages(messages.cached_state_diff_message)
+
+
+@benchmark
+async def state_changed_serialization(hass):
+    """Serialize 10k state changes for the recorder and 5 websocket connections."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder.models import StateAttributes
+    from homeassistant.components.websocket_api import messages
+
+    def serialize(iden, event):
+        if iden == 0:
+            StateAttributes.shared_attrs_from_event(event)
+        return messages.cached_event_message(iden, event)
+
+    return _websocket_state_changed_messages(serialize, 5)
+
+
+def _websocket_state_changed_messages(message_factory, connections=20):
+    """Build the messages of 10k power sensor updates for the connections."""
+    attributes = {
+        "unit_of_measurement": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "friendly_name": "Power",
+    }
+    events = []
+    states = {}
+    for idx in range(10 ** 4):
+        entity_id = f"sensor.power_{idx % 100}"
+        new_state = core.State(entity_id, str(idx), attributes)
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": entity_id,
+                    "old_state": states.get(entity_id),
+                    "new_state": new_state,
+                },
+            )
+        )
+        states[entity_id] = new_state
+
+    sent = 0
+    start = timer()
+    for event in events:
+        for iden in range(connections):
+            sent += len(message_factory(iden, event))
+    runtime = timer() - start
+    print(f"Sent {sent} bytes")
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -412,6 +1024,7 @@ def _create_state_changed_event_from_old_new(
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
             "state_id",
             "old_state_id",
         ],
@@ -420,6 +1033,7 @@ def _create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
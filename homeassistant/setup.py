@@ -204,7 +204,7 @@ async def _async_setup_component(
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        component = await integration.async_get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", integration.documentation)
         return False
@@ -332,7 +332,7 @@ async def async_prepare_setup_platform(
         return None
 
     try:
-        platform = integration.get_platform(domain)
+        platform = await integration.async_get_platform(domain)
     except ImportError as exc:
         log_error(f"Platform not found ({exc}).")
         return None
@@ -345,7 +345,7 @@ async def async_prepare_setup_platform(
     # If the integration is not set up yet, and can be set up, set it up.
     if integration.domain not in hass.config.components:
         try:
-            component = integration.get_component()
+            component = await integration.async_get_component()
         except ImportError as exc:
             log_error(f"Unable to import the component ({exc}).")
             return None
@@ -486,3 +486,26 @@ def async_start_setup(
             setup_time[integration] += time_taken
         else:
             setup_time[integration] = time_taken
+
+
+@core.callback
+def async_get_startup_timeline(hass: core.HomeAssistant) -> dict[str, dict[str, float]]:
+    """Return the import and setup seconds of each integration.
+
+    The time spent importing the platforms of an integration is added to
+    the integration. Integrations are sorted by the total time, slowest first.
+    """
+    timeline: dict[str, dict[str, float]] = {}
+    for name, seconds in hass.data.get(loader.DATA_IMPORT_TIME, {}).items():
+        times = timeline.setdefault(name.split(".", 1)[0], {"import": 0, "setup": 0})
+        times["import"] += seconds
+    for integration, time_taken in hass.data.get(DATA_SETUP_TIME, {}).items():
+        times = timeline.setdefault(integration, {"import": 0, "setup": 0})
+        times["setup"] += time_taken.total_seconds()
+    return dict(
+        sorted(
+            timeline.items(),
+            key=lambda item: item[1]["import"] + item[1]["setup"],
+            reverse=True,
+        )
+    )
@@ -2,17 +2,30 @@
 from __future__ import annotations
 
 from collections import deque
+from functools import lru_cache
 import json
 import logging
+import math
 import os
 import tempfile
 from typing import Any, Callable
 
-from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 _LOGGER = logging.getLogger(__name__)
 
+# Datetimes and dataclasses are handed to the encoder like the json module does
+ORJSON_OPTIONS = 0
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+# Cached JSON can be spliced into the output from orjson 3.9
+ORJSON_FRAGMENT = orjson is not None and hasattr(orjson, "Fragment")
+
 
 class SerializationError(HomeAssistantError):
     """Error serializing the data to JSON."""
@@ -22,6 +35,84 @@ class WriteError(HomeAssistantError):
     """Error writing the data."""
 
 
+def json_loads(data: bytes | str) -> Any:
+    """Parse a JSON document, with orjson if it is installed.
+
+    Documents orjson refuses, like the NaN and Infinity written by the
+    json module, are parsed by the json module.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def json_dumps(
+    data: Any,
+    *,
+    encoder: type[json.JSONEncoder] | None = None,
+    allow_nan: bool = True,
+) -> str:
+    """Dump data to a compact JSON string, with orjson if it is installed.
+
+    The result decodes to the same data as json.dumps with the same
+    encoder would, only non-ASCII characters are not escaped. Data orjson
+    can not serialize the same way is serialized by the json module,
+    which raises the same errors as before.
+    """
+    if orjson is not None:
+        try:
+            dumped = orjson.dumps(
+                data, default=_orjson_default(encoder), option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # orjson writes NaN and infinity as null,
+            # the json module writes or refuses them
+            if b"null" not in dumped or not _has_non_finite(data):
+                return dumped.decode("utf-8")
+    return json.dumps(data, cls=encoder, allow_nan=allow_nan, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def _orjson_default(
+    encoder: type[json.JSONEncoder] | None,
+) -> Callable[[Any], Any]:
+    """Return the function converting the objects orjson does not support."""
+    encoder_default = (encoder or json.JSONEncoder)().default
+
+    def default(obj: Any) -> Any:
+        """Convert an object like the encoder does."""
+        if hasattr(obj, "as_json"):
+            # States and events cache their JSON, which never has NaN
+            if ORJSON_FRAGMENT:
+                return orjson.Fragment(obj.as_json())
+            return json_loads(obj.as_json())
+        value = encoder_default(obj)
+        if _has_non_finite(value):
+            raise ValueError("Out of range float values are not JSON compliant")
+        return value
+
+    return default
+
+
+def _has_non_finite(data: Any) -> bool:
+    """Return if data contains NaN or infinity."""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, (list, tuple)):
+        return False
+    for value in data:
+        if _has_non_finite(value):
+            return True
+    return False
+
+
 def load_json(filename: str, default: list | dict | None = None) -> list | dict:
     """Load JSON data from a file and return as dict or list.
 
@@ -29,7 +120,7 @@ def load_json(filename: str, default: list | dict | None = None) -> list | dict:
     """
     try:
         with open(filename, encoding="utf-8") as fdesc:
-            return json.loads(fdesc.read())  # type: ignore
+            return json_loads(fdesc.read())  # type: ignore
     except FileNotFoundError:
         # This is not a fatal error
         _LOGGER.debug("JSON file not found: %s", filename)
@@ -100,6 +191,9 @@ def find_paths_unserializable_data(
 
     This method is slow! Only use for error handling.
     """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.core import Event, State
+
     to_process = deque([(bad_data, "$")])
     invalid = {}
 
@@ -0,0 +1,37 @@
+"""A bounded mapping that evicts the least recently used key."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+
+class LRU(OrderedDict):
+    """Dictionary with a maximum size that drops the least recently used key.
+
+    Lookups through `[]` and `get` mark a key as recently used.
+    Not thread safe.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the LRU."""
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key: Any) -> Any:
+        """Return a value and mark the key as recently used."""
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Store a value and evict the oldest key if the LRU is full."""
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return a value if present and mark the key as recently used."""
+        if key not in self:
+            return default
+        return self[key]
@@ -0,0 +1,82 @@
+"""The tests for downsampling the history."""
+from datetime import timedelta
+
+from homeassistant.components.history.downsample import downsample_states, lttb_indices
+from homeassistant.components.recorder.history import LAST_CHANGED_KEY, STATE_KEY
+from homeassistant.components.recorder.models import LazyState
+import homeassistant.util.dt as dt_util
+
+
+def test_lttb_keeps_first_last_and_peaks():
+    """Test the first, the last and the extreme points are selected."""
+    values = [0.0] * 100
+    values[33] = 50.0
+    values[66] = -50.0
+    times = [float(idx) for idx in range(100)]
+
+    selected = lttb_indices(times, values, 10)
+
+    assert len(selected) == 10
+    assert selected == sorted(selected)
+    assert selected[0] == 0
+    assert selected[-1] == 99
+    assert 33 in selected
+    assert 66 in selected
+
+
+def test_lttb_small_series():
+    """Test series that do not need downsampling and tiny thresholds."""
+    assert lttb_indices([0.0, 1.0, 2.0], [1.0, 2.0, 3.0], 5) == [0, 1, 2]
+    assert lttb_indices([0.0, 1.0, 2.0, 3.0], [1.0, 2.0, 3.0, 4.0], 2) == [0, 3]
+
+
+class MockRow:
+    """A database row for a LazyState."""
+
+    def __init__(self, state, last_changed, attributes="{}"):
+        """Init the row."""
+        self.entity_id = "sensor.test"
+        self.state = state
+        self.attributes = attributes
+        self.shared_attrs = attributes
+        self.last_changed = last_changed
+        self.last_updated = last_changed
+        self.context_id = None
+        self.context_user_id = None
+        self.context_parent_id = None
+
+
+def test_downsample_minimal_response():
+    """Test downsampling a minimal response keeps the full states."""
+    start = dt_util.utcnow()
+    first = LazyState(MockRow("1", start, '{"unit_of_measurement": "W"}'))
+    last = LazyState(
+        MockRow("1", start + timedelta(seconds=99), '{"unit_of_measurement": "W"}')
+    )
+    states = [first]
+    for idx in range(1, 99):
+        states.append(
+            {
+                STATE_KEY: "unknown" if idx == 50 else str(idx % 3),
+                LAST_CHANGED_KEY: (start + timedelta(seconds=idx)).isoformat(),
+            }
+        )
+    states.append(last)
+
+    result = downsample_states(states, 10)
+
+    assert len(result) <= 10
+    assert result[0] is first
+    assert result[-1] is last
+    assert states[50] in result
+
+
+def test_downsample_without_unit():
+    """Test the states of entities without a unit are not downsampled."""
+    start = dt_util.utcnow()
+    states = [
+        LazyState(MockRow(str(idx), start + timedelta(seconds=idx)))
+        for idx in range(100)
+    ]
+
+    assert downsample_states(states, 10) is states
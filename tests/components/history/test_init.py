@@ -613,6 +613,50 @@ async def test_fetch_period_api_with_minimal_response(hass, hass_client):
     assert response.status == 200
 
 
+async def test_fetch_period_api_with_max_points(hass, hass_client):
+    """Test the fetch period view downsamples numeric entities."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+
+    for idx in range(50):
+        power = "unavailable" if idx == 25 else str(1000 if idx == 10 else idx % 5)
+        hass.states.async_set("sensor.power", power, {"unit_of_measurement": "W"})
+        hass.states.async_set("sensor.mode", str(idx))
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    for params in ({"max_points": "10"}, {"max_points": "10", "minimal_response": ""}):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}", params=params
+        )
+        assert response.status == 200
+        response_json = {
+            states[0]["entity_id"]: states for states in await response.json()
+        }
+        power_states = response_json["sensor.power"]
+        mode_states = response_json["sensor.mode"]
+        assert len(power_states) <= 11
+        # The peak, the gap and the last state are kept
+        assert [state["state"] for state in power_states].count("1000") == 1
+        assert [state["state"] for state in power_states].count("unavailable") == 1
+        assert power_states[-1]["state"] == "4"
+        assert power_states[-1]["attributes"] == {"unit_of_measurement": "W"}
+        # Entities without a unit of measurement are not drawn as a line
+        assert len(mode_states) == 50
+
+    for max_points in ("2", "many"):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}",
+            params={"max_points": max_points},
+        )
+        assert response.status == 400
+
+
 async def test_fetch_period_api_with_no_timestamp(hass, hass_client):
     """Test the fetch period view for history with no timestamp."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -917,6 +961,36 @@ async def test_statistics_during_period(
         ]
     }
 
+    # The short term statistics of the next 5 minutes are compiled separately
+    five_minutes_later = now + timedelta(minutes=5)
+    hass.data[recorder.DATA_INSTANCE].do_adhoc_statistics(start=five_minutes_later)
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/statistics_during_period",
+            "start_time": now.isoformat(),
+            "statistic_ids": ["sensor.test"],
+            "period": "5minute",
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "sensor.test": [
+            {
+                "statistic_id": "sensor.test",
+                "start": five_minutes_later.isoformat(),
+                "mean": approx(value),
+                "min": approx(value),
+                "max": approx(value),
+                "state": None,
+                "sum": None,
+            }
+        ]
+    }
+
 
 async def test_statistics_during_period_bad_start_time(hass, hass_ws_client):
     """Test statistics_during_period."""
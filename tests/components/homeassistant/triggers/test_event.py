@@ -407,3 +407,34 @@ async def test_event_data_with_list(hass, calls):
     hass.bus.async_fire("test_event", {"some_attr": [1, 2, 3]})
     await hass.async_block_till_done()
     assert len(calls) == 1
+
+
+async def test_event_data_with_string_and_other_values(hass, calls):
+    """Test all the data is matched when the event bus filters on a string value."""
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: {
+                "trigger": {
+                    "platform": "event",
+                    "event_type": "test_event",
+                    "event_data": {"device_id": "abc", "type": "press", "count": 2},
+                },
+                "action": {"service": "test.automation"},
+            }
+        },
+    )
+
+    hass.bus.async_fire("test_event", {"device_id": "abc", "type": "press", "count": 2})
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    hass.bus.async_fire("test_event", {"device_id": "abc", "type": "hold", "count": 2})
+    hass.bus.async_fire("test_event", {"device_id": "def", "type": "press", "count": 2})
+    hass.bus.async_fire(
+        "test_event", {"device_id": ["abc"], "type": "press", "count": 2}
+    )
+    hass.bus.async_fire("test_event", {"type": "press", "count": 2})
+    await hass.async_block_till_done()
+    assert len(calls) == 1
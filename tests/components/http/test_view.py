@@ -1,6 +1,7 @@
 """Tests for Home Assistant View."""
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
+from aiohttp import web
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
     HTTPInternalServerError,
@@ -9,6 +10,7 @@ from aiohttp.web_exceptions import (
 import pytest
 import voluptuous as vol
 
+from homeassistant.components.http.const import KEY_HASS
 from homeassistant.components.http.view import (
     HomeAssistantView,
     request_handler_factory,
@@ -69,3 +71,61 @@ async def test_not_running(mock_request_with_stopping):
         Mock(requires_auth=False), AsyncMock(side_effect=Unauthorized)
     )(mock_request_with_stopping)
     assert response.status == 503
+
+
+async def test_json_stream(hass, aiohttp_client):
+    """Test streaming a JSON array in chunks."""
+    items = [{"idx": idx, "name": f"item {idx}"} for idx in range(100)]
+
+    async def handler(request):
+        return await HomeAssistantView.json_stream(request, lambda: iter(items))
+
+    app = web.Application()
+    app[KEY_HASS] = hass
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    with patch("homeassistant.components.http.view.JSON_STREAM_CHUNK_SIZE", 100):
+        response = await client.get("/")
+    assert response.status == 200
+    assert response.headers["Content-Type"].startswith("application/json")
+    assert response.headers["Transfer-Encoding"] == "chunked"
+    assert await response.json() == items
+
+    with patch("homeassistant.components.http.view.JSON_STREAM_CHUNK_SIZE", 100):
+        response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert await response.json() == items
+
+
+async def test_json_stream_empty(hass, aiohttp_client):
+    """Test streaming an empty JSON array."""
+
+    async def handler(request):
+        return await HomeAssistantView.json_stream(request, list)
+
+    app = web.Application()
+    app[KEY_HASS] = hass
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    response = await client.get("/")
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_json_stream_invalid_json(hass, aiohttp_client, caplog):
+    """Test an item that can not be serialized before anything was sent."""
+
+    async def handler(request):
+        return await HomeAssistantView.json_stream(
+            request, lambda: [{"value": float("NaN")}]
+        )
+
+    app = web.Application()
+    app[KEY_HASS] = hass
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    response = await client.get("/")
+    assert response.status == 500
+    assert "Unable to serialize to JSON" in caplog.text
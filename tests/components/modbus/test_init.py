@@ -12,11 +12,12 @@ This file is responsible for testing:
 
 It uses binary_sensors/sensors to do black box testing of the read calls.
 """
+import asyncio
 from datetime import timedelta
 import logging
 from unittest import mock
 
-from pymodbus.exceptions import ModbusException
+from pymodbus.exceptions import ModbusException, ModbusIOException
 from pymodbus.pdu import ExceptionResponse, IllegalFunctionRequest
 import pytest
 import voluptuous as vol
@@ -74,6 +75,7 @@ from homeassistant.const import (
     CONF_PORT,
     CONF_SCAN_INTERVAL,
     CONF_SENSORS,
+    CONF_SLAVE,
     CONF_STRUCTURE,
     CONF_TIMEOUT,
     CONF_TYPE,
@@ -596,3 +598,156 @@ async def test_delay(hass, mock_pymodbus):
         async_fire_time_changed(hass, now)
         await hass.async_block_till_done()
         assert hass.states.get(entity_id).state == STATE_ON
+
+
+def _simulate_holding_registers(mock_pymodbus, registers):
+    """Let the mocked pymodbus answer like a slave with the given registers."""
+
+    def read_holding_registers(address, count, unit=None):
+        """Return the registers or an exception if any of them is missing."""
+        addresses = range(address, address + count)
+        if any(addr not in registers.get(unit, {}) for addr in addresses):
+            return ExceptionResponse(0x03, 0x02)
+        return ReadResult([registers[unit][addr] for addr in addresses])
+
+    mock_pymodbus.read_holding_registers.side_effect = read_holding_registers
+
+
+async def _setup_and_scan_sensors(hass, sensors):
+    """Set up sensors polled every 10 seconds and let them scan once."""
+    config = {
+        DOMAIN: [
+            {
+                CONF_TYPE: TCP,
+                CONF_HOST: TEST_MODBUS_HOST,
+                CONF_PORT: TEST_PORT_TCP,
+                CONF_NAME: TEST_MODBUS_NAME,
+                CONF_SENSORS: [
+                    {
+                        CONF_NAME: f"sensor_{slave}_{address}",
+                        CONF_SLAVE: slave,
+                        CONF_ADDRESS: address,
+                        CONF_INPUT_TYPE: CALL_TYPE_REGISTER_HOLDING,
+                        CONF_SCAN_INTERVAL: 10,
+                    }
+                    for slave, address in sensors
+                ],
+            }
+        ]
+    }
+    now = dt_util.utcnow()
+    with mock.patch("homeassistant.helpers.event.dt_util.utcnow", return_value=now):
+        assert await async_setup_component(hass, DOMAIN, config) is True
+        await hass.async_block_till_done()
+    return await _scan_sensors(hass, now)
+
+
+async def _scan_sensors(hass, now):
+    """Let the sensors scan once."""
+    now = now + timedelta(seconds=11)
+    with mock.patch("homeassistant.helpers.event.dt_util.utcnow", return_value=now):
+        async_fire_time_changed(hass, now)
+        await hass.async_block_till_done()
+    return now
+
+
+async def test_read_nearby_registers_in_blocks(hass, mock_pymodbus):
+    """Run test for merging the reads of nearby registers."""
+    _simulate_holding_registers(
+        mock_pymodbus,
+        {
+            1: {100: 1, 101: 2, 102: 3, 103: 4, 104: 5, 300: 6},
+            2: {100: 7},
+        },
+    )
+    await _setup_and_scan_sensors(
+        hass, [(1, 100), (1, 101), (1, 104), (1, 300), (2, 100)]
+    )
+
+    assert sorted(mock_pymodbus.read_holding_registers.mock_calls) == [
+        mock.call(100, 1, unit=2),
+        mock.call(100, 5, unit=1),
+        mock.call(300, 1, unit=1),
+    ]
+    for (slave, address), value in (
+        ((1, 100), "1"),
+        ((1, 101), "2"),
+        ((1, 104), "5"),
+        ((1, 300), "6"),
+        ((2, 100), "7"),
+    ):
+        state = hass.states.get(f"{SENSOR_DOMAIN}.sensor_{slave}_{address}")
+        assert state.state == value
+
+    hub = hass.data[DOMAIN][TEST_MODBUS_NAME]
+    statistics = hub.statistics()
+    assert statistics["requests"] == 5
+    assert statistics["calls"] == 3
+    assert 0 <= statistics["bus_utilization"] <= 1
+
+
+async def test_read_registers_one_by_one_if_block_fails(hass, mock_pymodbus):
+    """Run test for falling back to single reads for blocks spanning gaps."""
+    _simulate_holding_registers(mock_pymodbus, {1: {100: 1, 104: 5}})
+    now = await _setup_and_scan_sensors(hass, [(1, 100), (1, 104)])
+
+    assert mock_pymodbus.read_holding_registers.mock_calls == [
+        mock.call(100, 5, unit=1),
+        mock.call(100, 1, unit=1),
+        mock.call(104, 1, unit=1),
+    ]
+    assert hass.states.get(f"{SENSOR_DOMAIN}.sensor_1_100").state == "1"
+    assert hass.states.get(f"{SENSOR_DOMAIN}.sensor_1_104").state == "5"
+
+    # Registers of the slave are no longer merged
+    mock_pymodbus.read_holding_registers.reset_mock()
+    await _scan_sensors(hass, now)
+    assert sorted(mock_pymodbus.read_holding_registers.mock_calls) == [
+        mock.call(100, 1, unit=1),
+        mock.call(104, 1, unit=1),
+    ]
+
+
+async def test_keep_reading_in_blocks_if_slave_does_not_answer(hass, mock_pymodbus):
+    """Run test for not reading one by one when the slave does not answer."""
+    mock_pymodbus.read_holding_registers.return_value = ModbusIOException(
+        "No Response received from the remote unit"
+    )
+    now = await _setup_and_scan_sensors(hass, [(1, 100), (1, 104)])
+
+    assert mock_pymodbus.read_holding_registers.mock_calls == [
+        mock.call(100, 5, unit=1),
+    ]
+    assert hass.states.get(f"{SENSOR_DOMAIN}.sensor_1_100").state == STATE_UNAVAILABLE
+    assert hass.states.get(f"{SENSOR_DOMAIN}.sensor_1_104").state == STATE_UNAVAILABLE
+
+    _simulate_holding_registers(mock_pymodbus, {1: {100: 1, 104: 5}})
+    mock_pymodbus.read_holding_registers.reset_mock()
+    await _scan_sensors(hass, now)
+    assert mock_pymodbus.read_holding_registers.mock_calls == [
+        mock.call(100, 5, unit=1),
+        mock.call(100, 1, unit=1),
+        mock.call(104, 1, unit=1),
+    ]
+
+
+async def test_read_error_raised_in_reads(hass, mock_pymodbus):
+    """Run test for errors of block reads reaching all reads that wait."""
+    _simulate_holding_registers(mock_pymodbus, {1: {100: 1, 101: 2}})
+    now = await _setup_and_scan_sensors(hass, [(1, 100), (1, 101)])
+    hub = hass.data[DOMAIN][TEST_MODBUS_NAME]
+
+    mock_pymodbus.read_holding_registers.side_effect = OSError("Bus error")
+    results = await asyncio.gather(
+        hub.async_pymodbus_call(1, 100, 1, CALL_TYPE_REGISTER_HOLDING),
+        hub.async_pymodbus_call(1, 101, 1, CALL_TYPE_REGISTER_HOLDING),
+        return_exceptions=True,
+    )
+    assert [str(result) for result in results] == ["Bus error", "Bus error"]
+    assert hub._read_task is None
+
+    # Later reads are not stuck behind the failed read
+    _simulate_holding_registers(mock_pymodbus, {1: {100: 3, 101: 4}})
+    await _scan_sensors(hass, now)
+    assert hass.states.get(f"{SENSOR_DOMAIN}.sensor_1_100").state == "3"
+    assert hass.states.get(f"{SENSOR_DOMAIN}.sensor_1_101").state == "4"
@@ -0,0 +1,25 @@
+"""Test Modbus system health."""
+from unittest.mock import Mock
+
+from homeassistant.components.modbus.const import MODBUS_DOMAIN as DOMAIN
+from homeassistant.setup import async_setup_component
+
+from tests.common import get_system_health_info
+
+
+async def test_system_health(hass):
+    """Test system health."""
+    hass.config.components.add(DOMAIN)
+    assert await async_setup_component(hass, "system_health", {})
+
+    hass.data[DOMAIN] = {
+        "modbus_hub": Mock(
+            statistics=Mock(
+                return_value={"requests": 80, "calls": 3, "bus_utilization": 0.125}
+            )
+        )
+    }
+
+    info = await get_system_health_info(hass, DOMAIN)
+
+    assert info == {"modbus_hub": "12.5% bus utilization, 3 calls for 80 requests"}
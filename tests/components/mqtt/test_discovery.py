@@ -35,6 +35,13 @@ def entity_reg(hass):
     return mock_registry(hass)
 
 
+def _subscribed_topics(mqtt_client_mock):
+    """Return the topics and qos of all SUBSCRIBE packets sent."""
+    return [
+        topic for call in mqtt_client_mock.subscribe.mock_calls for topic in call[1][0]
+    ]
+
+
 @pytest.mark.parametrize(
     "mqtt_config",
     [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_DISCOVERY: False}],
@@ -593,7 +600,7 @@ async def test_mqtt_integration_discovery_subscribe_unsubscribe(
         await async_start(hass, "homeassistant", entry)
         await hass.async_block_till_done()
 
-    mqtt_client_mock.subscribe.assert_any_call("comp/discovery/#", 0)
+    assert ("comp/discovery/#", 0) in _subscribed_topics(mqtt_client_mock)
     assert not mqtt_client_mock.unsubscribe.called
 
     class TestFlow(config_entries.ConfigFlow):
@@ -604,12 +611,12 @@ async def test_mqtt_integration_discovery_subscribe_unsubscribe(
             return self.async_abort(reason="already_configured")
 
     with patch.dict(config_entries.HANDLERS, {"comp": TestFlow}):
-        mqtt_client_mock.subscribe.assert_any_call("comp/discovery/#", 0)
+        assert ("comp/discovery/#", 0) in _subscribed_topics(mqtt_client_mock)
         assert not mqtt_client_mock.unsubscribe.called
 
         async_fire_mqtt_message(hass, "comp/discovery/bla/config", "")
         await hass.async_block_till_done()
-        mqtt_client_mock.unsubscribe.assert_called_once_with("comp/discovery/#")
+        mqtt_client_mock.unsubscribe.assert_called_once_with(["comp/discovery/#"])
         mqtt_client_mock.unsubscribe.reset_mock()
 
         async_fire_mqtt_message(hass, "comp/discovery/bla/config", "")
@@ -631,7 +638,7 @@ async def test_mqtt_discovery_unsubscribe_once(hass, mqtt_client_mock, mqtt_mock
         await async_start(hass, "homeassistant", entry)
         await hass.async_block_till_done()
 
-    mqtt_client_mock.subscribe.assert_any_call("comp/discovery/#", 0)
+    assert ("comp/discovery/#", 0) in _subscribed_topics(mqtt_client_mock)
     assert not mqtt_client_mock.unsubscribe.called
 
     class TestFlow(config_entries.ConfigFlow):
@@ -646,4 +653,4 @@ async def test_mqtt_discovery_unsubscribe_once(hass, mqtt_client_mock, mqtt_mock
         async_fire_mqtt_message(hass, "comp/discovery/bla/config", "")
         await hass.async_block_till_done()
         await hass.async_block_till_done()
-        mqtt_client_mock.unsubscribe.assert_called_once_with("comp/discovery/#")
+        mqtt_client_mock.unsubscribe.assert_called_once_with(["comp/discovery/#"])
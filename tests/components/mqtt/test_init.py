@@ -19,6 +19,7 @@ from homeassistant.const import (
     TEMP_CELSIUS,
 )
 from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
@@ -340,6 +341,46 @@ async def test_subscribe_topic(hass, mqtt_mock, calls, record_calls):
     assert len(calls) == 1
 
 
+async def test_receive_messages_in_batches(
+    hass, mqtt_client_mock, mqtt_mock, calls, record_calls
+):
+    """Test messages of the paho thread are handled in batches and in order."""
+    await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+
+    def receive_messages():
+        for idx in range(5):
+            mqtt_client_mock.on_message(
+                None,
+                None,
+                mqtt.models.ReceiveMessage(
+                    f"test-topic/{idx % 2}", b"%d" % idx, 0, False
+                ),
+            )
+
+    with patch.object(mqtt, "MESSAGE_BATCH_SIZE", 2), patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as mock_call_soon_threadsafe:
+        # Called like the paho thread would, the event loop can't
+        # handle the messages until they are all received
+        receive_messages()
+        await hass.async_block_till_done()
+        # One wakeup of the event loop for all messages
+        assert [
+            call.args[0].__name__ for call in mock_call_soon_threadsafe.mock_calls
+        ].count("_mqtt_handle_received_messages") == 1
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    assert [call[0].payload for call in calls] == ["0", "1", "2", "3", "4"]
+    assert [call[0].topic for call in calls] == [
+        "test-topic/0",
+        "test-topic/1",
+        "test-topic/0",
+        "test-topic/1",
+        "test-topic/0",
+    ]
+
+
 async def test_subscribe_deprecated(hass, mqtt_mock):
     """Test the subscription of a topic using deprecated callback signature."""
     calls = []
@@ -633,6 +674,81 @@ async def test_not_calling_unsubscribe_with_active_subscribers(
     assert not mqtt_client_mock.unsubscribe.called
 
 
+@pytest.mark.parametrize(
+    "mqtt_config",
+    [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_DISCOVERY: False}],
+)
+async def test_subscribe_and_unsubscribe_in_bulk(hass, mqtt_client_mock, mqtt_mock):
+    """Test topics subscribed to together are sent in a single packet."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    unsubs = await asyncio.gather(
+        mqtt.async_subscribe(hass, "test/state_1", None),
+        mqtt.async_subscribe(hass, "test/state_2", None, qos=1),
+        mqtt.async_subscribe(hass, "test/state_2", None, qos=2),
+        mqtt.async_subscribe(hass, "test/state_3", None),
+    )
+    assert mqtt_client_mock.subscribe.mock_calls == [
+        call([("test/state_1", 0), ("test/state_2", 2), ("test/state_3", 0)])
+    ]
+
+    for unsub in unsubs:
+        unsub()
+    await hass.async_block_till_done()
+    assert len(mqtt_client_mock.unsubscribe.mock_calls) == 1
+    assert sorted(mqtt_client_mock.unsubscribe.mock_calls[0][1][0]) == [
+        "test/state_1",
+        "test/state_2",
+        "test/state_3",
+    ]
+
+    # Resubscribing before the UNSUBSCRIBE is sent cancels it
+    unsub = await mqtt.async_subscribe(hass, "test/state_1", None)
+    mqtt_client_mock.reset_mock()
+    unsub()
+    await mqtt.async_subscribe(hass, "test/state_1", None)
+    await hass.async_block_till_done()
+    assert mqtt_client_mock.subscribe.mock_calls == [call([("test/state_1", 0)])]
+    assert not mqtt_client_mock.unsubscribe.called
+
+
+@pytest.mark.parametrize(
+    "mqtt_config",
+    [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_DISCOVERY: False}],
+)
+async def test_subscribe_in_chunks(hass, mqtt_client_mock, mqtt_mock):
+    """Test large numbers of topics are split over several packets."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    with patch.object(mqtt, "MAX_TOPICS_PER_PACKET", 2):
+        await asyncio.gather(
+            *(mqtt.async_subscribe(hass, f"test/state_{idx}", None) for idx in range(5))
+        )
+    assert [len(call[1][0]) for call in mqtt_client_mock.subscribe.mock_calls] == [
+        2,
+        2,
+        1,
+    ]
+
+
+async def test_subscribe_error(hass, mqtt_client_mock, mqtt_mock):
+    """Test an error sending a SUBSCRIBE is raised to all subscribers."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    mqtt_client_mock.subscribe.side_effect = None
+    mqtt_client_mock.subscribe.return_value = (4, None)
+    results = await asyncio.gather(
+        mqtt.async_subscribe(hass, "test/state_1", None),
+        mqtt.async_subscribe(hass, "test/state_2", None),
+        return_exceptions=True,
+    )
+    assert mqtt_client_mock.subscribe.call_count == 1
+    assert all(isinstance(result, HomeAssistantError) for result in results)
+
+
 @pytest.mark.parametrize(
     "mqtt_config",
     [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_DISCOVERY: False}],
@@ -670,9 +786,9 @@ async def test_restore_all_active_subscriptions_on_reconnect(
     await hass.async_block_till_done()
 
     expected = [
-        call("test/state", 2),
-        call("test/state", 0),
-        call("test/state", 1),
+        call([("test/state", 2)]),
+        call([("test/state", 0)]),
+        call([("test/state", 1)]),
     ]
     assert mqtt_client_mock.subscribe.mock_calls == expected
 
@@ -685,7 +801,7 @@ async def test_restore_all_active_subscriptions_on_reconnect(
         mqtt_mock._mqtt_on_connect(None, None, None, 0)
         await hass.async_block_till_done()
 
-    expected.append(call("test/state", 1))
+    expected.append(call([("test/state", 1)]))
     assert mqtt_client_mock.subscribe.mock_calls == expected
 
 
@@ -885,16 +1001,18 @@ async def test_mqtt_subscribes_topics_on_connect(hass, mqtt_client_mock, mqtt_mo
     await mqtt.async_subscribe(hass, "still/pending", None)
     await mqtt.async_subscribe(hass, "still/pending", None, 1)
 
-    hass.add_job = MagicMock()
+    assert mqtt_client_mock.subscribe.call_count == 0
+
     mqtt_mock._mqtt_on_connect(None, None, 0, 0)
 
     await hass.async_block_till_done()
 
     assert mqtt_client_mock.disconnect.call_count == 0
 
-    expected = {"topic/test": 0, "home/sensor": 2, "still/pending": 1}
-    calls = {call[1][1]: call[1][2] for call in hass.add_job.mock_calls}
-    assert calls == expected
+    # All topics are subscribed to with a single SUBSCRIBE
+    assert mqtt_client_mock.subscribe.mock_calls == [
+        call([("home/sensor", 2), ("still/pending", 1), ("topic/test", 0)])
+    ]
 
 
 async def test_setup_fails_without_config(hass):
@@ -0,0 +1,79 @@
+"""The tests for the MQTT subscription matcher."""
+from paho.mqtt.matcher import MQTTMatcher
+import pytest
+
+from homeassistant.components.mqtt.matcher import SubscriptionMatcher
+
+FILTERS = [
+    "#",
+    "+",
+    "+/+",
+    "/+",
+    "+/#",
+    "a",
+    "a/#",
+    "a/b",
+    "a/+",
+    "a/+/c",
+    "a/b/c",
+    "a/b/#",
+    "a/+/+",
+    "a//c",
+    "$SYS/#",
+    "$SYS/+",
+]
+
+TOPICS = ["a", "a/b", "a/b/c", "a/b/c/d", "a//c", "/a", "/", "b", "$SYS/load", "$SYS"]
+
+
+@pytest.mark.parametrize("topic", TOPICS)
+def test_match_like_paho(topic):
+    """Test topics are matched like the paho matcher does."""
+    matcher = SubscriptionMatcher()
+    paho_matcher = MQTTMatcher()
+    for topic_filter in FILTERS:
+        matcher.add(topic_filter, topic_filter)
+        paho_matcher[topic_filter] = topic_filter
+
+    assert sorted(matcher.match(topic)) == sorted(paho_matcher.iter_match(topic))
+
+
+def test_match_in_order_added():
+    """Test matches are returned in the order they were added."""
+    matcher = SubscriptionMatcher()
+    matcher.add("a/#", 1)
+    matcher.add("a/b", 2)
+    matcher.add("+/b", 3)
+    matcher.add("a/b", 4)
+
+    assert matcher.match("a/b") == [1, 2, 3, 4]
+    assert len(matcher) == 4
+    assert sorted(matcher) == [1, 2, 3, 4]
+
+
+def test_remove():
+    """Test removing values prunes the topic filters."""
+    matcher = SubscriptionMatcher()
+    matcher.add("a/b/c", 1)
+    matcher.add("a/b/c", 2)
+    matcher.add("a/+", 3)
+
+    matcher.remove("a/b/c", 1)
+    assert matcher.has_topic("a/b/c")
+    assert matcher.match("a/b/c") == [2]
+
+    matcher.remove("a/b/c", 2)
+    assert not matcher.has_topic("a/b/c")
+    assert not matcher.has_topic("a/b")
+    assert matcher.match("a/b/c") == []
+    assert matcher.match("a/b") == [3]
+    assert matcher._root.children["a"].children.keys() == {"+"}
+
+    with pytest.raises(KeyError):
+        matcher.remove("a/b/c", 2)
+    with pytest.raises(KeyError):
+        matcher.remove("a/+", 1)
+
+    matcher.remove("a/+", 3)
+    assert len(matcher) == 0
+    assert not matcher._root.children
@@ -1,6 +1,8 @@
 """The tests for the Prometheus exporter."""
+import asyncio
 from dataclasses import dataclass
 import datetime
+import threading
 import unittest.mock as mock
 
 import pytest
@@ -254,6 +256,40 @@ async def test_view_default_namespace(hass, hass_client):
     )
 
 
+async def test_view_shares_rendered_metrics(hass, hass_client):
+    """Test scrapes share the metrics rendered in the executor."""
+    client = await prometheus_client(hass, hass_client, "shared")
+    generate_latest = prometheus.prometheus_client.generate_latest
+    render_threads = []
+
+    def render():
+        """Render the metrics and record the thread."""
+        render_threads.append(threading.current_thread())
+        return generate_latest()
+
+    with mock.patch.object(prometheus.prometheus_client, "generate_latest", render):
+        first, second = await asyncio.gather(
+            client.get(prometheus.API_ENDPOINT), client.get(prometheus.API_ENDPOINT)
+        )
+        assert await first.text() == await second.text()
+        assert len(render_threads) == 1
+        assert render_threads[0] is not threading.main_thread()
+
+        state = hass.states.get("sensor.outside_temperature")
+        hass.states.async_set(state.entity_id, "17.2", state.attributes)
+        await hass.async_block_till_done()
+        with mock.patch.object(prometheus, "SNAPSHOT_MAX_AGE", -1):
+            resp = await client.get(prometheus.API_ENDPOINT)
+
+    assert len(render_threads) == 2
+    body = await resp.text()
+    assert (
+        'shared_sensor_temperature_celsius{domain="sensor",'
+        'entity="sensor.outside_temperature",'
+        'friendly_name="Outside Temperature"} 17.2' in body.split("\n")
+    )
+
+
 @pytest.fixture(name="mock_client")
 def mock_client_fixture():
     """Mock the prometheus client."""
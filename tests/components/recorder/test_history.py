@@ -7,6 +7,7 @@ from unittest.mock import patch, sentinel
 
 from homeassistant.components.recorder import history
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
@@ -130,6 +131,60 @@ def test_get_last_state_changes(hass_recorder):
     assert states == hist[entity_id]
 
 
+def test_get_state_values_during_period(hass_recorder):
+    """Test getting the state columns of entities in a period."""
+    hass = hass_recorder()
+    entity_id = "sensor.test"
+
+    def set_state(state, attributes):
+        """Set the state."""
+        hass.states.set(entity_id, state, attributes)
+        wait_recording_done(hass)
+
+    start = dt_util.utcnow()
+    point = start + timedelta(minutes=1)
+    point2 = point + timedelta(minutes=1)
+    point3 = point2 + timedelta(minutes=1)
+    end = point3 + timedelta(minutes=1)
+
+    with patch("homeassistant.components.recorder.dt_util.utcnow", return_value=start):
+        set_state("1", {"unit_of_measurement": "kW"})
+
+    with patch("homeassistant.components.recorder.dt_util.utcnow", return_value=point):
+        set_state("2", {"unit_of_measurement": "W"})
+
+    with patch("homeassistant.components.recorder.dt_util.utcnow", return_value=point2):
+        # Attribute only changes are not included
+        set_state("2", {"unit_of_measurement": "W", "friendly_name": "Test"})
+
+    with patch("homeassistant.components.recorder.dt_util.utcnow", return_value=point3):
+        set_state("3", {"unit_of_measurement": "W"})
+
+    with patch("homeassistant.components.recorder.dt_util.utcnow", return_value=end):
+        set_state("4", {"unit_of_measurement": "W"})
+
+    period_start = start + timedelta(seconds=30)
+    columns = history.get_state_values_during_period(
+        hass, period_start, end, [entity_id, "sensor.unknown"]
+    )
+
+    states, attributes, timestamps = columns[entity_id]
+    assert list(columns) == [entity_id]
+    assert states == ["1", "2", "3"]
+    assert attributes == [
+        {"unit_of_measurement": "kW"},
+        {"unit_of_measurement": "W"},
+        {"unit_of_measurement": "W"},
+    ]
+    # Rows with the same attributes share the parsed attributes
+    assert attributes[1] is attributes[2]
+    assert timestamps == [
+        period_start.timestamp(),
+        point.timestamp(),
+        point3.timestamp(),
+    ]
+
+
 def test_ensure_state_can_be_copied(hass_recorder):
     """Ensure a state can pass though copy().
 
@@ -173,6 +228,33 @@ def test_get_significant_states(hass_recorder):
     assert states == hist
 
 
+def test_iter_significant_states(hass_recorder):
+    """Test yielding the significant states per entity."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    start = zero + timedelta(seconds=1, milliseconds=500)
+    entity_ids = ["thermostat.test", "media_player.test2", "media_player.test"]
+
+    def iter_states(**kwargs):
+        with session_scope(hass=hass) as session:
+            return list(history.iter_significant_states(hass, session, **kwargs))
+
+    # Fetch the rows one by one to yield across several batches
+    with patch.object(history, "ITER_STATES_BATCH_SIZE", 1):
+        for minimal_response in (False, True):
+            hist = history.get_significant_states(
+                hass, start, four, minimal_response=minimal_response
+            )
+            assert iter_states(
+                start_time=start, end_time=four, minimal_response=minimal_response
+            ) == [hist[entity_id] for entity_id in sorted(hist)]
+
+        hist = history.get_significant_states(hass, start, four, entity_ids)
+        assert iter_states(start_time=start, end_time=four, entity_ids=entity_ids) == [
+            hist[entity_id] for entity_id in entity_ids
+        ]
+
+
 def test_get_significant_states_minimal_response(hass_recorder):
     """Test that only significant states are returned.
 
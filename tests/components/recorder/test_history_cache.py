@@ -0,0 +1,202 @@
+"""The tests for the recorder history cache."""
+# pylint: disable=protected-access,invalid-name
+from datetime import timedelta
+import json
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.history import Filters
+from homeassistant.components.recorder import (
+    DATA_INSTANCE,
+    PurgeEntitiesTask,
+    PurgeTask,
+    history,
+)
+from homeassistant.helpers.json import JSONEncoder
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+from .test_history import record_states
+
+
+def _significant_states_json(hass, *args, **kwargs):
+    """Return the significant states as decoded json, from the cache if possible."""
+    return json.loads(
+        json.dumps(
+            history.get_significant_states(hass, *args, **kwargs), cls=JSONEncoder
+        )
+    )
+
+
+def _significant_states_json_from_db(hass, *args, **kwargs):
+    """Return the significant states as decoded json, always from the database."""
+    with patch.object(hass.data[DATA_INSTANCE], "history_cache", None):
+        return _significant_states_json(hass, *args, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"minimal_response": True},
+        {"significant_changes_only": False},
+        {"include_start_time_state": False},
+        {"entity_ids": ["media_player.test", "thermostat.test"]},
+        {
+            "entity_ids": ["media_player.test", "thermostat.test"],
+            "minimal_response": True,
+        },
+    ],
+)
+def test_cache_matches_database(hass_recorder, kwargs):
+    """Test the cache answers the same as the database."""
+    hass = hass_recorder({"history_cache_max_states": 1000})
+    cache = hass.data[DATA_INSTANCE].history_cache
+    zero, four, _ = record_states(hass)
+    one_and_half = zero + timedelta(seconds=1.5)
+    three = zero + timedelta(seconds=3)
+
+    for start_time, end_time in ((zero, four), (one_and_half, four), (zero, three)):
+        assert _significant_states_json(
+            hass, start_time, end_time, **kwargs
+        ) == _significant_states_json_from_db(hass, start_time, end_time, **kwargs)
+
+    assert cache.hits == 3
+    assert cache.misses == 0
+    assert cache.hit_rate == 1
+
+
+def test_cache_does_not_touch_the_database(hass_recorder):
+    """Test a period inside the cache window is answered without a query."""
+    hass = hass_recorder({"history_cache_max_states": 1000})
+    zero, four, states = record_states(hass)
+
+    with patch(
+        "homeassistant.components.recorder.history.execute",
+        side_effect=AssertionError("Database queried"),
+    ):
+        hist = history.get_significant_states(hass, zero, four)
+
+    assert states == hist
+
+
+def test_cache_misses_before_the_window(hass_recorder):
+    """Test periods starting before the cache window go to the database."""
+    hass = hass_recorder({"history_cache_max_states": 1000})
+    cache = hass.data[DATA_INSTANCE].history_cache
+    zero, four, states = record_states(hass)
+
+    hist = history.get_significant_states(
+        hass, cache.window_start - timedelta(seconds=1), four
+    )
+
+    assert states == hist
+    assert cache.hits == 0
+    assert cache.misses == 1
+
+
+def test_cache_single_entity_without_start_state(hass_recorder):
+    """Test the start state of a single entity is looked up in the database."""
+    hass = hass_recorder({"history_cache_max_states": 1000})
+    cache = hass.data[DATA_INSTANCE].history_cache
+    zero, four, _ = record_states(hass)
+
+    kwargs = {"entity_ids": ["media_player.test2"]}
+    assert _significant_states_json(
+        hass, zero, four, **kwargs
+    ) == _significant_states_json_from_db(hass, zero, four, **kwargs)
+    assert cache.misses == 1
+
+    # Once the entity has a state before the period it is found in the cache
+    assert _significant_states_json(
+        hass, zero + timedelta(seconds=1.5), four, **kwargs
+    ) == _significant_states_json_from_db(
+        hass, zero + timedelta(seconds=1.5), four, **kwargs
+    )
+    assert cache.hits == 1
+
+
+def test_cache_applies_history_filters(hass_recorder):
+    """Test the history include and exclude filters are applied."""
+    hass = hass_recorder({"history_cache_max_states": 1000})
+    zero, four, _ = record_states(hass)
+
+    filters = Filters()
+    filters.included_domains = ["media_player", "thermostat"]
+    filters.excluded_entities = ["media_player.test2"]
+    filters.excluded_entity_globs = ["thermostat.*2"]
+
+    result = _significant_states_json(hass, zero, four, filters=filters)
+    assert result == _significant_states_json_from_db(hass, zero, four, filters=filters)
+    assert set(result) == {
+        "media_player.test",
+        "media_player.test3",
+        "thermostat.test",
+    }
+
+
+def test_cache_eviction(hass_recorder):
+    """Test the oldest states are evicted when the cache is full."""
+    hass = hass_recorder({"history_cache_max_states": 20})
+    instance = hass.data[DATA_INSTANCE]
+    cache = instance.history_cache
+    start = dt_util.utcnow()
+
+    for idx in range(30):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow",
+            return_value=start + timedelta(seconds=idx),
+        ):
+            hass.states.set(f"sensor.test_{idx % 3}", str(idx))
+            wait_recording_done(hass)
+
+    assert cache.info()["states"] <= 20
+    assert cache.window_start > start
+    assert cache.hits == 0
+
+    # The period starts in the window so the last state before
+    # the window is still needed as the start state
+    window_start = cache.window_start
+    assert _significant_states_json(
+        hass, window_start + timedelta(seconds=0.5), None
+    ) == _significant_states_json_from_db(
+        hass, window_start + timedelta(seconds=0.5), None
+    )
+    assert cache.hits == 1
+
+    assert history.get_significant_states(hass, start, None)
+    assert cache.misses == 1
+
+
+def test_cache_purge(hass_recorder):
+    """Test purged states are dropped from the cache."""
+    hass = hass_recorder({"history_cache_max_states": 1000})
+    instance = hass.data[DATA_INSTANCE]
+    cache = instance.history_cache
+    zero, four, _ = record_states(hass)
+    two = zero + timedelta(seconds=2)
+
+    instance.queue.put(PurgeTask(two, False, False))
+    wait_recording_done(hass)
+
+    assert cache.window_start == two
+    two_and_half = zero + timedelta(seconds=2.5)
+    assert _significant_states_json(
+        hass, two_and_half, four
+    ) == _significant_states_json_from_db(hass, two_and_half, four)
+
+    instance.queue.put(
+        PurgeEntitiesTask(lambda entity_id: entity_id == "thermostat.test")
+    )
+    wait_recording_done(hass)
+    assert "thermostat.test" not in history.get_significant_states(
+        hass, two_and_half, four
+    )
+    assert cache.misses == 0
+
+
+def test_cache_disabled_by_default(hass_recorder):
+    """Test the cache is opt-in."""
+    hass = hass_recorder()
+    assert hass.data[DATA_INSTANCE].history_cache is None
@@ -5,9 +5,9 @@ import sqlite3
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import event as sqlalchemy_event
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 
-from homeassistant.components import recorder
 from homeassistant.components.recorder import (
     CONF_AUTO_PURGE,
     CONF_DB_URL,
@@ -28,8 +28,10 @@ from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     StatisticsRuns,
+    StatisticsShortTermRuns,
     process_timestamp,
 )
 from homeassistant.components.recorder.util import session_scope
@@ -37,6 +39,7 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
+    EVENT_TIME_CHANGED,
     MATCH_ALL,
     STATE_LOCKED,
     STATE_UNLOCKED,
@@ -46,6 +49,7 @@ from homeassistant.setup import async_setup_component, setup_component
 from homeassistant.util import dt as dt_util
 
 from .common import (
+    async_recorder_block_till_done,
     async_wait_recording_done,
     async_wait_recording_done_without_instance,
     corrupt_db_file,
@@ -73,6 +77,7 @@ def _default_recorder(hass):
         db_retry_wait=3,
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_t=[],
+        history_cache_max_states=0,
     )
 
 
@@ -147,30 +152,139 @@ async def test_saving_state(
     assert state == _state_empty_context(hass, entity_id)
 
 
+async def test_saving_state_shares_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states with identical attributes share one attributes row."""
+    instance = await async_setup_recorder_instance(hass)
+
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.async_set("test.one", "on", attributes)
+    hass.states.async_set("test.two", "on", attributes)
+    await async_wait_recording_done(hass, instance)
+    # The second batch resolves the attributes from the cache
+    hass.states.async_set("test.one", "off", attributes)
+    hass.states.async_set("test.three", "on", {"other": True})
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert len(db_states) == 4
+        assert all(db_state.attributes is None for db_state in db_states)
+        assert (
+            db_states[0].attributes_id
+            == db_states[1].attributes_id
+            == db_states[2].attributes_id
+        )
+        assert db_states[3].attributes_id != db_states[0].attributes_id
+        assert session.query(StateAttributes).count() == 2
+        assert db_states[2].to_native() == _state_empty_context(hass, "test.one")
+        assert db_states[3].to_native() == _state_empty_context(hass, "test.three")
+
+    assert len(instance._state_attributes_ids) == 2
+
+
 async def test_saving_many_states(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
-    """Test we expire after many commits."""
+    """Test states are linked to the previous state across commits."""
     instance = await async_setup_recorder_instance(hass)
 
     entity_id = "test.recorder"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    with patch.object(
-        hass.data[DATA_INSTANCE].event_session, "expire_all"
-    ) as expire_all, patch.object(recorder, "EXPIRE_AFTER_COMMITS", 2):
-        for _ in range(3):
-            hass.states.async_set(entity_id, "on", attributes)
-            await async_wait_recording_done(hass, instance)
-            hass.states.async_set(entity_id, "off", attributes)
-            await async_wait_recording_done(hass, instance)
-
-    assert expire_all.called
+    for _ in range(3):
+        hass.states.async_set(entity_id, "on", attributes)
+        await async_wait_recording_done(hass, instance)
+        hass.states.async_set(entity_id, "off", attributes)
+        hass.bus.async_fire("test_event", {"some": "data"})
+        await async_wait_recording_done(hass, instance)
 
     with session_scope(hass=hass) as session:
-        db_states = list(session.query(States))
+        db_states = list(session.query(States).order_by(States.state_id))
         assert len(db_states) == 6
         assert db_states[0].event_id > 0
+        assert db_states[0].old_state_id is None
+        for prev_state, db_state in zip(db_states, db_states[1:]):
+            assert db_state.old_state_id == prev_state.state_id
+        assert (
+            session.query(Events).filter(Events.event_type == "test_event").count() == 3
+        )
+
+
+async def test_saving_many_states_in_one_commit(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states and events written in a single commit."""
+    instance = await async_setup_recorder_instance(hass)
+
+    for idx in range(10):
+        hass.states.async_set("test.one", str(idx), {"same": True})
+        hass.states.async_set("test.two", str(idx), {"idx": idx})
+        hass.bus.async_fire("test_event", {"idx": idx})
+    hass.states.async_remove("test.one")
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        one_states = list(
+            session.query(States)
+            .filter(States.entity_id == "test.one")
+            .order_by(States.state_id)
+        )
+        assert len(one_states) == 11
+        assert one_states[-1].state is None
+        for prev_state, db_state in zip(one_states, one_states[1:]):
+            assert db_state.old_state_id == prev_state.state_id
+        assert len({db_state.attributes_id for db_state in one_states[:-1]}) == 1
+        assert session.query(StateAttributes).count() == 12
+        assert (
+            session.query(Events).filter(Events.event_type == "test_event").count()
+            == 10
+        )
+
+    assert "test.one" not in instance._old_states
+    assert "test.two" in instance._old_states
+
+
+async def test_saving_states_batched(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the states of a commit are written with one insert per table."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass, instance)
+    inserts = []
+
+    def _count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            inserts.append(statement.split()[2])
+
+    sqlalchemy_event.listen(instance.engine, "before_cursor_execute", _count_inserts)
+    for idx in range(50):
+        hass.states.async_set(f"test.entity_{idx}", "on", {"idx": idx})
+    hass.states.async_set("test.entity_0", "off", {"idx": 0})
+    await async_wait_recording_done(hass, instance)
+    sqlalchemy_event.remove(instance.engine, "before_cursor_execute", _count_inserts)
+
+    # The states of test.entity_0 need a second round to link the old state
+    assert sorted(inserts) == ["events", "state_attributes", "states", "states"]
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States, Events).join(Events))
+        assert len(db_states) == 51
+        for db_state, db_event in db_states:
+            assert db_event.time_fired == db_state.last_updated
+            assert db_state.to_native().attributes == {
+                "idx": int(db_state.entity_id.split("_")[-1])
+            }
+        entity_0 = sorted(
+            (
+                db_state
+                for db_state, _ in db_states
+                if db_state.entity_id == "test.entity_0"
+            ),
+            key=lambda db_state: db_state.state_id,
+        )
+        assert entity_0[1].old_state_id == entity_0[0].state_id
 
 
 async def test_saving_state_with_intermixed_time_changes(
@@ -199,6 +313,39 @@ async def test_saving_state_with_intermixed_time_changes(
         assert db_states[0].event_id > 0
 
 
+async def test_periodic_commit_and_keepalive(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the commit and keep alive are scheduled without time changed events."""
+    instance = await async_setup_recorder_instance(hass)
+    assert not hass.bus.async_has_listeners(EVENT_TIME_CHANGED)
+
+    hass.states.async_set("test.recorder", "on")
+    await hass.async_block_till_done()
+
+    with patch.object(
+        instance,
+        "_commit_event_session_or_retry",
+        wraps=instance._commit_event_session_or_retry,
+    ) as commit_mock, patch.object(
+        instance, "_send_keep_alive", wraps=instance._send_keep_alive
+    ) as keep_alive_mock:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await async_recorder_block_till_done(hass, instance)
+        assert commit_mock.call_count == 1
+        assert keep_alive_mock.call_count == 0
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=KEEPALIVE_TIME)
+        )
+        await async_recorder_block_till_done(hass, instance)
+        assert commit_mock.call_count == 2
+        assert keep_alive_mock.call_count == 1
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 1
+
+
 def test_saving_state_with_exception(hass, hass_recorder, caplog):
     """Test saving and restoring a state."""
     hass = hass_recorder()
@@ -207,17 +354,18 @@ def test_saving_state_with_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    instance = hass.data[DATA_INSTANCE]
+    write_pending_rows = instance._write_pending_rows
+
+    def _throw_if_state_pending(*args, **kwargs):
+        if instance._pending_states:
+            raise OperationalError("insert the state", "fake params", "forced to fail")
+        return write_pending_rows()
 
     with patch("time.sleep"), patch.object(
-        hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        instance,
+        "_write_pending_rows",
+        side_effect=_throw_if_state_pending,
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -245,17 +393,18 @@ def test_saving_state_with_sqlalchemy_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise SQLAlchemyError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    instance = hass.data[DATA_INSTANCE]
+    write_pending_rows = instance._write_pending_rows
+
+    def _throw_if_state_pending(*args, **kwargs):
+        if instance._pending_states:
+            raise SQLAlchemyError("insert the state", "fake params", "forced to fail")
+        return write_pending_rows()
 
     with patch("time.sleep"), patch.object(
-        hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        instance,
+        "_write_pending_rows",
+        side_effect=_throw_if_state_pending,
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -700,41 +849,41 @@ def test_auto_statistics(hass_recorder):
     tz = dt_util.get_time_zone("Europe/Copenhagen")
     dt_util.set_default_time_zone(tz)
 
-    # Statistics is scheduled to happen at *:12am every hour. Exercise this behavior by
+    # Statistics is scheduled to happen every 5 minutes. Exercise this behavior by
     # firing time changed events and advancing the clock around this time. Pick an
     # arbitrary year in the future to avoid boundary conditions relative to the current
     # date.
     #
-    # The clock is started at 4:15am then advanced forward below
+    # The clock is started at 4:16am then advanced forward below
     now = dt_util.utcnow()
-    test_time = datetime(now.year + 2, 1, 1, 4, 15, 0, tzinfo=tz)
+    test_time = datetime(now.year + 2, 1, 1, 4, 16, 0, tzinfo=tz)
     run_tasks_at_time(hass, test_time)
 
     with patch(
         "homeassistant.components.recorder.statistics.compile_statistics",
         return_value=True,
     ) as compile_statistics:
-        # Advance one hour, and the statistics task should run
-        test_time = test_time + timedelta(hours=1)
+        # Advance 5 minutes, and the statistics task should run
+        test_time = test_time + timedelta(minutes=5)
         run_tasks_at_time(hass, test_time)
         assert len(compile_statistics.mock_calls) == 1
 
         compile_statistics.reset_mock()
 
-        # Advance one hour, and the statistics task should run again
-        test_time = test_time + timedelta(hours=1)
+        # Advance 5 minutes, and the statistics task should run again
+        test_time = test_time + timedelta(minutes=5)
         run_tasks_at_time(hass, test_time)
         assert len(compile_statistics.mock_calls) == 1
 
         compile_statistics.reset_mock()
 
-        # Advance less than one full hour. The task should not run.
-        test_time = test_time + timedelta(minutes=50)
+        # Advance less than 5 minutes. The task should not run.
+        test_time = test_time + timedelta(minutes=3)
         run_tasks_at_time(hass, test_time)
         assert len(compile_statistics.mock_calls) == 0
 
-        # Advance to the next hour, and the statistics task should run again
-        test_time = test_time + timedelta(hours=1)
+        # Advance 5 minutes, and the statistics task should run again
+        test_time = test_time + timedelta(minutes=5)
         run_tasks_at_time(hass, test_time)
         assert len(compile_statistics.mock_calls) == 1
 
@@ -742,7 +891,7 @@ def test_auto_statistics(hass_recorder):
 
 
 def test_statistics_runs_initiated(hass_recorder):
-    """Test statistics_runs is initiated when DB is created."""
+    """Test statistics_short_term_runs is initiated when DB is created."""
     now = dt_util.utcnow()
     with patch("homeassistant.components.recorder.dt_util.utcnow", return_value=now):
         hass = hass_recorder()
@@ -750,12 +899,13 @@ def test_statistics_runs_initiated(hass_recorder):
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            statistics_runs = list(session.query(StatisticsRuns))
+            assert not list(session.query(StatisticsRuns))
+            statistics_runs = list(session.query(StatisticsShortTermRuns))
             assert len(statistics_runs) == 1
             last_run = process_timestamp(statistics_runs[0].start)
             assert process_timestamp(last_run) == now.replace(
-                minute=0, second=0, microsecond=0
-            ) - timedelta(hours=1)
+                minute=now.minute - now.minute % 5, second=0, microsecond=0
+            ) - timedelta(minutes=5)
 
 
 def test_compile_missing_statistics(tmpdir):
@@ -773,10 +923,10 @@ def test_compile_missing_statistics(tmpdir):
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            statistics_runs = list(session.query(StatisticsRuns))
+            statistics_runs = list(session.query(StatisticsShortTermRuns))
             assert len(statistics_runs) == 1
             last_run = process_timestamp(statistics_runs[0].start)
-            assert last_run == now - timedelta(hours=1)
+            assert last_run == now - timedelta(minutes=5)
 
         wait_recording_done(hass)
         wait_recording_done(hass)
@@ -794,10 +944,16 @@ def test_compile_missing_statistics(tmpdir):
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            statistics_runs = list(session.query(StatisticsRuns))
-            assert len(statistics_runs) == 2
+            statistics_runs = list(session.query(StatisticsShortTermRuns))
+            assert len(statistics_runs) == 13  # 12 5-minute runs
             last_run = process_timestamp(statistics_runs[1].start)
             assert last_run == now
+            last_run = process_timestamp(statistics_runs[12].start)
+            assert last_run == now + timedelta(minutes=55)
+            # The hour was summarized from its 5-minute runs
+            statistics_runs = list(session.query(StatisticsRuns))
+            assert len(statistics_runs) == 1
+            assert process_timestamp(statistics_runs[0].start) == now
 
         wait_recording_done(hass)
         wait_recording_done(hass)
@@ -9,6 +9,7 @@ from homeassistant.components.recorder.models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -40,6 +41,25 @@ def test_from_event_to_db_state():
     assert state == States.from_event(event).to_native()
 
 
+def test_from_event_to_db_state_attributes():
+    """Test converting event to db state attributes."""
+    attrs = {"this_attr": True}
+    state = ha.State("sensor.temperature", "18", attrs)
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    db_attrs = StateAttributes.from_event(event)
+    assert db_attrs.to_native() == attrs
+    assert db_attrs.hash == StateAttributes.hash_shared_attrs('{"this_attr":true}')
+
+    db_state = States.from_event(event)
+    assert db_state.attributes is None
+    db_state.state_attributes = db_attrs
+    assert db_state.to_native().attributes == attrs
+
+
 def test_from_event_to_delete_state():
     """Test converting deleting state event to db state."""
     event = ha.Event(
@@ -10,7 +10,14 @@ from sqlalchemy.orm.session import Session
 from homeassistant.components import recorder
 from homeassistant.components.recorder import PurgeTask
 from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    StatisticsMeta,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED
@@ -61,6 +68,39 @@ async def test_purge_old_states(
         assert states.count() == 2
 
 
+async def test_purge_old_states_with_shared_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting old states removes attributes no longer used."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states_with_shared_attributes(hass, instance)
+    instance._state_attributes_ids["old"] = 1
+    instance._state_attributes_ids["shared"] = 2
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        state_attributes = session.query(StateAttributes)
+        assert states.count() == 6
+        assert state_attributes.count() == 2
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+        assert states.count() == 2
+        assert state_attributes.count() == 1
+        assert state_attributes.first().shared_attrs == '{"shared":true}'
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert finished
+        assert states.count() == 2
+        assert state_attributes.count() == 1
+
+    assert "old" not in instance._state_attributes_ids
+    assert instance._state_attributes_ids["shared"] == 2
+
+
 async def test_purge_old_states_encouters_database_corruption(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -179,6 +219,31 @@ async def test_purge_old_events(
         assert events.count() == 2
 
 
+async def test_purge_old_short_term_statistics(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting old short term statistics."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_short_term_statistics(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        statistics = session.query(StatisticsShortTerm)
+        assert statistics.count() == 6
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+
+        # run purge_old_data()
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+        assert statistics.count() == 2
+
+        # we should only have 2 statistics left
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert finished
+        assert statistics.count() == 2
+
+
 async def test_purge_old_recorder_runs(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -913,6 +978,55 @@ async def _add_test_states(hass: HomeAssistant, instance: recorder.Recorder):
             old_state_id = state.state_id
 
 
+async def _add_test_states_with_shared_attributes(
+    hass: HomeAssistant, instance: recorder.Recorder
+):
+    """Add states to the db that reference the state_attributes table."""
+    utcnow = dt_util.utcnow()
+    five_days_ago = utcnow - timedelta(days=5)
+
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass, instance)
+
+    with recorder.session_scope(hass=hass) as session:
+        old_attributes = StateAttributes(
+            attributes_id=1, shared_attrs='{"old":true}', hash=1
+        )
+        shared_attributes = StateAttributes(
+            attributes_id=2, shared_attrs='{"shared":true}', hash=2
+        )
+        session.add_all((old_attributes, shared_attributes))
+        for event_id in range(6):
+            if event_id < 4:
+                timestamp = five_days_ago
+                attributes_id = 1 if event_id < 2 else 2
+            else:
+                timestamp = utcnow
+                attributes_id = 2
+
+            event = Events(
+                event_type="state_changed",
+                event_data="{}",
+                origin="LOCAL",
+                created=timestamp,
+                time_fired=timestamp,
+            )
+            session.add(event)
+            session.flush()
+            session.add(
+                States(
+                    entity_id="test.recorder2",
+                    domain="sensor",
+                    state="on",
+                    last_changed=timestamp,
+                    last_updated=timestamp,
+                    created=timestamp,
+                    event_id=event.event_id,
+                    attributes_id=attributes_id,
+                )
+            )
+
+
 async def _add_test_events(hass: HomeAssistant, instance: recorder.Recorder):
     """Add a few events for testing."""
     utcnow = dt_util.utcnow()
@@ -946,6 +1060,40 @@ async def _add_test_events(hass: HomeAssistant, instance: recorder.Recorder):
             )
 
 
+async def _add_test_short_term_statistics(
+    hass: HomeAssistant, instance: recorder.Recorder
+):
+    """Add a few short term statistics for testing."""
+    utcnow = dt_util.utcnow()
+    five_days_ago = utcnow - timedelta(days=5)
+    eleven_days_ago = utcnow - timedelta(days=11)
+
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass, instance)
+
+    with recorder.session_scope(hass=hass) as session:
+        metadata = StatisticsMeta.from_meta(
+            "recorder", "sensor.test", "°C", has_mean=True, has_sum=False
+        )
+        session.add(metadata)
+        session.flush()
+        for stat_id in range(6):
+            if stat_id < 2:
+                timestamp = eleven_days_ago
+            elif stat_id < 4:
+                timestamp = five_days_ago
+            else:
+                timestamp = utcnow
+
+            session.add(
+                StatisticsShortTerm.from_stats(
+                    metadata.id,
+                    timestamp + timedelta(minutes=5 * stat_id),
+                    {"mean": stat_id, "min": stat_id, "max": stat_id},
+                )
+            )
+
+
 async def _add_test_recorder_runs(hass: HomeAssistant, instance: recorder.Recorder):
     """Add a few recorder_runs for testing."""
     utcnow = dt_util.utcnow()
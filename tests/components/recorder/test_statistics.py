@@ -9,6 +9,7 @@ from homeassistant.components.recorder import history
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
 from homeassistant.components.recorder.statistics import (
+    get_last_short_term_statistics,
     get_last_statistics,
     statistics_during_period,
 )
@@ -92,6 +93,114 @@ def test_compile_hourly_statistics(hass_recorder):
     assert stats == {}
 
 
+def test_compile_short_term_statistics_and_rollup(hass_recorder):
+    """Test 5-minute statistics are compiled and summarized every hour."""
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    zero = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    zero -= timedelta(hours=2)
+
+    def compile_statistics(hass, start, end):
+        """Return statistics numbered by the 5-minute period."""
+        assert end - start == timedelta(minutes=5)
+        idx = (start - zero) // timedelta(minutes=5)
+        return {
+            "sensor.test1": {
+                "meta": {
+                    "unit_of_measurement": TEMP_CELSIUS,
+                    "has_mean": True,
+                    "has_sum": True,
+                },
+                "stat": {
+                    "mean": idx,
+                    "min": idx - 1,
+                    "max": idx + 1,
+                    "state": idx,
+                    "sum": idx * 2,
+                },
+            }
+        }
+
+    with patch(
+        "homeassistant.components.sensor.recorder.compile_statistics",
+        side_effect=compile_statistics,
+    ):
+        for idx in range(11):
+            recorder.do_adhoc_statistics(start=zero + timedelta(minutes=5 * idx))
+        wait_recording_done(hass)
+
+        # The hour is summarized once its last 5-minute period is compiled
+        assert statistics_during_period(hass, zero) == {}
+        stats = statistics_during_period(hass, zero, period="5minute")
+        assert len(stats["sensor.test1"]) == 11
+
+        recorder.do_adhoc_statistics(start=zero + timedelta(minutes=55))
+        wait_recording_done(hass)
+
+    expected_short_term = {
+        "statistic_id": "sensor.test1",
+        "start": process_timestamp_to_utc_isoformat(zero + timedelta(minutes=55)),
+        "mean": approx(11.0),
+        "min": approx(10.0),
+        "max": approx(12.0),
+        "state": approx(11.0),
+        "sum": approx(22.0),
+    }
+    stats = get_last_short_term_statistics(hass, 1, "sensor.test1")
+    assert stats == {"sensor.test1": [expected_short_term]}
+
+    expected_hourly = {
+        "statistic_id": "sensor.test1",
+        "start": process_timestamp_to_utc_isoformat(zero),
+        "mean": approx(5.5),
+        "min": approx(-1.0),
+        "max": approx(12.0),
+        "state": approx(11.0),
+        "sum": approx(22.0),
+    }
+    stats = statistics_during_period(hass, zero)
+    assert stats == {"sensor.test1": [expected_hourly]}
+    stats = get_last_statistics(hass, 1, "sensor.test1")
+    assert stats == {"sensor.test1": [expected_hourly]}
+
+
+def test_compile_statistics_runs_per_period(hass_recorder):
+    """Test compiling a period does not mark the other period compiled."""
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    zero = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    zero -= timedelta(hours=1)
+
+    def compile_statistics(hass, start, end):
+        """Return the same statistics for any period."""
+        return {
+            "sensor.test1": {
+                "meta": {
+                    "unit_of_measurement": TEMP_CELSIUS,
+                    "has_mean": True,
+                    "has_sum": False,
+                },
+                "stat": {"mean": 1.0, "min": 0.0, "max": 2.0},
+            }
+        }
+
+    with patch(
+        "homeassistant.components.sensor.recorder.compile_statistics",
+        side_effect=compile_statistics,
+    ):
+        recorder.do_adhoc_statistics(period="hourly", start=zero)
+        recorder.do_adhoc_statistics(start=zero)
+        recorder.do_adhoc_statistics(period="hourly", start=zero)
+        recorder.do_adhoc_statistics(start=zero)
+        wait_recording_done(hass)
+
+    assert len(statistics_during_period(hass, zero)["sensor.test1"]) == 1
+    stats = statistics_during_period(hass, zero, period="5minute")
+    assert len(stats["sensor.test1"]) == 1
+
+
 def test_rename_entity(hass_recorder):
     """Test statistics is migrated when entity_id is changed."""
     hass = hass_recorder()
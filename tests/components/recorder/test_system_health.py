@@ -0,0 +1,51 @@
+"""Tests for the recorder system health."""
+from datetime import timedelta
+
+from homeassistant.components.recorder import history
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.common import get_system_health_info
+
+
+async def test_recorder_system_health(hass, async_setup_recorder_instance):
+    """Test the history cache is reported to system health."""
+    instance = await async_setup_recorder_instance(
+        hass, {"history_cache_max_states": 100}
+    )
+    assert await async_setup_component(hass, "system_health", {})
+
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.test", "1", {"unit": "W"})
+    hass.states.async_set("sensor.test", "2", {"unit": "W"})
+    hass.states.async_set("sensor.other", "on")
+    await async_wait_recording_done(hass, instance)
+
+    await hass.async_add_executor_job(
+        history.get_significant_states, hass, start + timedelta(microseconds=1)
+    )
+    await hass.async_add_executor_job(
+        history.get_significant_states, hass, start - timedelta(days=1)
+    )
+
+    info = await get_system_health_info(hass, "recorder")
+    assert info == {
+        "history_cache_states": "3/100",
+        "history_cache_entities": 2,
+        "history_cache_attributes": 2,
+        "history_cache_hits": 1,
+        "history_cache_misses": 1,
+        "history_cache_hit_rate": "50.0%",
+    }
+
+
+async def test_recorder_system_health_without_cache(
+    hass, async_setup_recorder_instance
+):
+    """Test nothing is reported without the history cache."""
+    await async_setup_recorder_instance(hass)
+    assert await async_setup_component(hass, "system_health", {})
+
+    assert await get_system_health_info(hass, "recorder") == {}
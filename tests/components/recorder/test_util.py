@@ -174,6 +174,27 @@ def test_basic_sanity_check(hass_recorder):
         util.basic_sanity_check(cursor)
 
 
+def test_basic_sanity_check_before_short_term_statistics(hass_recorder):
+    """Test the basic sanity checks pass before the short-term statistics tables."""
+    hass = hass_recorder()
+
+    cursor = hass.data[DATA_INSTANCE].engine.raw_connection().cursor()
+    cursor.execute("DROP TABLE statistics_short_term;")
+    cursor.execute("DROP TABLE statistics_short_term_runs;")
+
+    assert util.basic_sanity_check(cursor) is True
+
+
+def test_basic_sanity_check_before_state_attributes(hass_recorder):
+    """Test the basic sanity checks pass before the state attributes table."""
+    hass = hass_recorder()
+
+    cursor = hass.data[DATA_INSTANCE].engine.raw_connection().cursor()
+    cursor.execute("DROP TABLE state_attributes;")
+
+    assert util.basic_sanity_check(cursor) is True
+
+
 def test_combined_checks(hass_recorder, caplog):
     """Run Checks on the open database."""
     hass = hass_recorder()
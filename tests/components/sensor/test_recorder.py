@@ -6,13 +6,19 @@ from unittest.mock import patch
 import pytest
 from pytest import approx
 
-from homeassistant.components.recorder import history
+from homeassistant.components.recorder import history, migration
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
+from homeassistant.components.recorder.models import (
+    StatisticsShortTermRuns,
+    process_timestamp,
+    process_timestamp_to_utc_isoformat,
+)
 from homeassistant.components.recorder.statistics import (
     list_statistic_ids,
     statistics_during_period,
 )
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.components.sensor.recorder import _time_weighted_average
 from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.setup import setup_component
 import homeassistant.util.dt as dt_util
@@ -309,6 +315,47 @@ def test_compile_hourly_sum_statistics_total_increasing(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+def test_sum_continues_after_short_term_statistics_migration(hass_recorder):
+    """Test 5-minute sums continue the hourly sums compiled before the upgrade."""
+    zero = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    zero -= timedelta(hours=3)
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    attributes = {
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "unit_of_measurement": "kWh",
+    }
+    seq = [10, 15, 20, 10, 30, 40, 50, 60, 70]
+    record_meter_states(hass, zero, "sensor.test1", attributes, seq)
+
+    # The first hour was compiled from the states before the upgrade
+    recorder.do_adhoc_statistics(period="hourly", start=zero)
+    wait_recording_done(hass)
+    with session_scope(hass=hass) as session:
+        session.query(StatisticsShortTermRuns).delete()
+        migration._apply_update(recorder.engine, session, 21, 20)
+    with session_scope(hass=hass) as session:
+        runs = [
+            process_timestamp(run.start)
+            for run in session.query(StatisticsShortTermRuns)
+        ]
+    assert runs == [zero + timedelta(minutes=55)]
+
+    # The 5-minute statistics continue with the next hour
+    hour = zero + timedelta(hours=1)
+    for idx in range(12):
+        recorder.do_adhoc_statistics(start=hour + timedelta(minutes=5 * idx))
+    wait_recording_done(hass)
+
+    stats = statistics_during_period(hass, zero)
+    assert [(stat["state"], stat["sum"]) for stat in stats["sensor.test1"]] == [
+        (approx(20.0), approx(10.0)),
+        (approx(40.0), approx(50.0)),
+    ]
+
+
 def test_compile_hourly_energy_statistics_unsupported(hass_recorder, caplog):
     """Test compiling hourly statistics."""
     zero = dt_util.utcnow()
@@ -685,6 +732,33 @@ def test_compile_hourly_statistics_fails(hass_recorder, caplog):
     assert "Error while processing event StatisticsTask" in caplog.text
 
 
+def test_time_weighted_average():
+    """Test the time weighted average of states in a period."""
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    end = start + timedelta(minutes=5)
+
+    def timestamp(offset):
+        return (start + offset).timestamp()
+
+    # The last known state before the period counts from the start of the period
+    values = [10, 20, 40]
+    timestamps = [
+        timestamp(timedelta(minutes=-30)),
+        timestamp(timedelta(minutes=1)),
+        timestamp(timedelta(minutes=4)),
+    ]
+    assert _time_weighted_average(values, timestamps, start, end) == approx(
+        (10 * 60 + 20 * 180 + 40 * 60) / 300
+    )
+
+    # Without a known state the period starts at the first state change
+    values = [20, 40]
+    timestamps = [timestamp(timedelta(minutes=1)), timestamp(timedelta(minutes=4))]
+    assert _time_weighted_average(values, timestamps, start, end) == approx(
+        (20 * 180 + 40 * 60) / 240
+    )
+
+
 @pytest.mark.parametrize(
     "device_class,unit,native_unit,statistic_type",
     [
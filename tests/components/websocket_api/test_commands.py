@@ -600,6 +600,132 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribe entities sends a snapshot and then state diffs."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.other": True}}}
+    )
+    hass.states.async_set("light.permitted", "off", {"color": "red"})
+    hass.states.async_set("light.not_permitted", "off")
+    permitted = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "a": {"color": "red"},
+                "c": permitted.context.id,
+                "lc": permitted.last_changed.timestamp(),
+                "s": "off",
+            }
+        }
+    }
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.permitted", "on", {"brightness": 255})
+    permitted = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"brightness": 255},
+                    "c": permitted.context.id,
+                    "lc": permitted.last_changed.timestamp(),
+                    "s": "on",
+                },
+                "-": {"a": ["color"]},
+            }
+        }
+    }
+
+    # Only the last updated time changes when the state stays the same
+    hass.states.async_set("light.permitted", "on", {"brightness": 128})
+    permitted = hass.states.get("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"brightness": 128},
+                    "c": permitted.context.id,
+                    "lu": permitted.last_updated.timestamp(),
+                }
+            }
+        }
+    }
+
+    hass.states.async_set("light.other", "on")
+    other = hass.states.get("light.other")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "a": {
+            "light.other": {
+                "a": {},
+                "c": other.context.id,
+                "lc": other.last_changed.timestamp(),
+                "s": "on",
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+
+async def test_subscribe_entities_with_entity_ids(hass, websocket_client):
+    """Test subscribe entities limited to some entities."""
+    hass.states.async_set("light.wanted", "off")
+    hass.states.async_set("light.unwanted", "off")
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "subscribe_entities", "entity_ids": ["light.wanted"]}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.wanted"]
+
+    hass.states.async_set("light.unwanted", "on")
+    hass.states.async_set("light.wanted", "on")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.wanted": {
+                "+": {
+                    "c": hass.states.get("light.wanted").context.id,
+                    "lc": hass.states.get("light.wanted").last_changed.timestamp(),
+                    "s": "on",
+                }
+            }
+        }
+    }
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
@@ -1173,6 +1299,45 @@ async def test_subscribe_unsubscribe_bootstrap_integrations(
     assert msg["event"] == message
 
 
+async def test_entity_polling_stats(hass, websocket_client, hass_admin_user):
+    """Test fetching the polling statistics of the entity platforms."""
+    platform = MockEntityPlatform(hass)
+    await platform.async_add_entities(
+        [
+            MockEntity(name="Entity 1", should_poll=True),
+            MockEntity(name="Entity 2", should_poll=True),
+        ]
+    )
+    await MockEntityPlatform(hass, platform_name="push").async_add_entities(
+        [MockEntity(name="Entity 3", should_poll=False)]
+    )
+    await platform._update_entity_states(None)
+
+    await websocket_client.send_json({"id": 5, "type": "entity/polling_stats"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert msg["result"] == [
+        {
+            "domain": "test_domain",
+            "platform": "test_platform",
+            "config_entry_id": None,
+            "scan_interval": 15.0,
+            "entities": 2,
+            "intervals": 1,
+            "polls": 2,
+            "failures": 0,
+            "overruns": 0,
+            "backoffs": 0,
+            "last_latency": ANY,
+            "mean_latency": ANY,
+            "max_latency": ANY,
+        }
+    ]
+
+
 async def test_integration_setup_info(hass, websocket_client, hass_admin_user):
     """Test subscribe/unsubscribe bootstrap_integrations."""
     hass.data[DATA_SETUP_TIME] = {
@@ -80,3 +80,46 @@ async def test_non_json_message(hass, websocket_client, caplog):
         f"Unable to serialize to JSON. Bad data found at $.result[0](State: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
         in caplog.text
     )
+
+
+async def test_coalesce_messages(hass, websocket_client):
+    """Test pending messages are sent in one frame if the client supports it."""
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 1
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 2, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 2
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    msgs = await websocket_client.receive_json()
+    assert [msg["event"]["data"]["idx"] for msg in msgs] == [0, 1, 2]
+
+
+async def test_no_coalesce_messages_by_default(hass, websocket_client):
+    """Test messages are sent in separate frames by default."""
+    await websocket_client.send_json(
+        {"id": 1, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    for idx in range(3):
+        msg = await websocket_client.receive_json()
+        assert msg["event"]["data"]["idx"] == idx
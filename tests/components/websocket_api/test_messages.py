@@ -1,4 +1,5 @@
 """Test Websocket API messages module."""
+import json
 
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
@@ -78,18 +79,68 @@ async def test_cached_event_message_with_different_idens(hass):
     assert cache_info.currsize == 1
 
 
+async def test_cached_event_message_reuses_state_json(hass):
+    """Test the event message is built from the JSON of the states."""
+    lru_event_cache.cache_clear()
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"brightness": 144})
+    await hass.async_block_till_done()
+
+    msg = cached_event_message(3, events[0])
+    assert events[0].data["new_state"].as_json() in msg
+    assert json.loads(msg) == {
+        "id": 3,
+        "type": "event",
+        "event": json.loads(message_to_json(events[0].as_dict()))
+        | {
+            "data": {
+                "entity_id": "light.window",
+                "old_state": None,
+                "new_state": events[0].data["new_state"].as_dict(),
+            }
+        },
+    }
+
+
+async def test_cached_event_message_not_allows_nan(hass, caplog):
+    """Test an event with NaN in the data is sent as an error."""
+    lru_event_cache.cache_clear()
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"brightness": float("nan")})
+    await hass.async_block_till_done()
+
+    msg = json.loads(cached_event_message(3, events[0]))
+    assert msg["id"] == 3
+    assert msg["success"] is False
+    assert "Unable to serialize to JSON" in caplog.text
+
+
 async def test_message_to_json(caplog):
     """Test we can serialize websocket messages."""
 
     json_str = message_to_json({"id": 1, "message": "xyz"})
 
-    assert json_str == '{"id": 1, "message": "xyz"}'
+    assert json_str == '{"id":1,"message":"xyz"}'
 
     json_str2 = message_to_json({"id": 1, "message": _Unserializeable()})
 
     assert (
         json_str2
-        == '{"id": 1, "type": "result", "success": false, "error": {"code": "unknown_error", "message": "Invalid JSON in response"}}'
+        == '{"id":1,"type":"result","success":false,"error":{"code":"unknown_error","message":"Invalid JSON in response"}}'
     )
     assert "Unable to serialize to JSON" in caplog.text
 
@@ -389,6 +389,46 @@ async def test_removing_area_id(registry):
     assert entry_w_area != entry_wo_area
 
 
+async def test_entries_index(registry):
+    """Test the devices by area and config entry follow the updates."""
+    entry = registry.async_get_or_create(
+        config_entry_id="123",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+        identifiers={("bridgeid", "0123")},
+    )
+    entry = registry.async_get_or_create(
+        config_entry_id="456", identifiers={("bridgeid", "0123")}
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="123", identifiers={("bridgeid", "4567")}
+    )
+
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [
+        entry,
+        entry2,
+    ]
+    assert device_registry.async_entries_for_config_entry(registry, "456") == [entry]
+
+    entry = registry.async_update_device(entry.id, area_id="12345A")
+    entry2 = registry.async_update_device(entry2.id, area_id="12345A")
+    assert device_registry.async_entries_for_area(registry, "12345A") == [
+        entry,
+        entry2,
+    ]
+
+    entry = registry.async_update_device(entry.id, remove_config_entry_id="123")
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [entry2]
+    assert device_registry.async_entries_for_config_entry(registry, "456") == [entry]
+
+    registry.async_remove_device(entry2.id)
+    assert device_registry.async_entries_for_config_entry(registry, "123") == []
+    assert device_registry.async_entries_for_area(registry, "12345A") == [entry]
+
+    registry.async_clear_area_id("12345A")
+    assert device_registry.async_entries_for_area(registry, "12345A") == []
+    assert registry._registered_index.area_id == {}
+
+
 async def test_deleted_device_removing_area_id(registry):
     """Make sure we can clear area id of deleted device."""
     entry = registry.async_get_or_create(
@@ -788,3 +788,65 @@ async def test_float_conversion(hass):
     state = hass.states.get("hello.world")
     assert state is not None
     assert state.state == "3.6"
+
+
+async def test_static_properties(hass):
+    """Test the attributes of static properties are only assembled when needed."""
+    entry = entity_registry.RegistryEntry(
+        entity_id="hello.world",
+        unique_id="test-unique-id",
+        platform="test-platform",
+    )
+    registry = mock_registry(hass, {"hello.world": entry})
+
+    class StaticEntity(entity.Entity):
+        """Entity with static properties."""
+
+        _static_properties = frozenset({"capability_attributes", "icon", "name"})
+        _attr_icon = "mdi:static"
+        _attr_unit_of_measurement = "W"
+
+        @property
+        def capability_attributes(self):
+            """Return the capability attributes."""
+            return {"max": self._attr_state * 10}
+
+    ent = StaticEntity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent.registry_entry = entry
+    ent._attr_state = 1
+
+    with patch.object(
+        StaticEntity, "name", PropertyMock(return_value="Static")
+    ) as mock_name:
+        ent.async_write_ha_state()
+        ent._attr_state = 2
+        ent._attr_icon = "mdi:changed"
+        ent._attr_unit_of_measurement = "kW"
+        ent.async_write_ha_state()
+
+        assert len(mock_name.mock_calls) == 1
+        state = hass.states.get("hello.world")
+        assert state.state == "2"
+        assert state.attributes == {
+            "max": 10,
+            "friendly_name": "Static",
+            "icon": "mdi:static",
+            "unit_of_measurement": "kW",
+        }
+
+        ent.async_invalidate_static_attributes()
+        ent.async_write_ha_state()
+        assert len(mock_name.mock_calls) == 2
+        assert hass.states.get("hello.world").attributes == {
+            "max": 20,
+            "friendly_name": "Static",
+            "icon": "mdi:changed",
+            "unit_of_measurement": "kW",
+        }
+
+        ent.registry_entry = registry.async_update_entity("hello.world", name="Renamed")
+        ent.async_write_ha_state()
+        assert len(mock_name.mock_calls) == 2
+        assert hass.states.get("hello.world").attributes["friendly_name"] == "Renamed"
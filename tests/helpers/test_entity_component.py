@@ -104,7 +104,7 @@ async def test_setup_does_discovery(mock_setup_component, mock_setup, hass):
     assert ("platform_test", {}, {"msg": "discovery_info"}) == mock_setup.call_args[0]
 
 
-@patch("homeassistant.helpers.entity_platform.async_track_time_interval")
+@patch("homeassistant.helpers.entity_platform.async_track_point_in_utc_time")
 async def test_set_scan_interval_via_config(mock_track, hass):
     """Test the setting of the scan interval via configuration."""
 
@@ -122,7 +122,9 @@ async def test_set_scan_interval_via_config(mock_track, hass):
 
     await hass.async_block_till_done()
     assert mock_track.called
-    assert timedelta(seconds=30) == mock_track.call_args[0][2]
+    # All entities are polled together at the end of the first scan interval
+    first_poll = mock_track.call_args[0][2] - dt_util.utcnow()
+    assert timedelta(seconds=29) < first_poll <= timedelta(seconds=30)
 
 
 async def test_set_entity_namespace_via_config(hass):
@@ -2,7 +2,7 @@
 import asyncio
 from datetime import timedelta
 import logging
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -150,7 +150,7 @@ async def test_update_state_adds_entities_with_update_before_add_false(hass):
     assert not ent.update.called
 
 
-@patch("homeassistant.helpers.entity_platform.async_track_time_interval")
+@patch("homeassistant.helpers.entity_platform.async_track_point_in_utc_time")
 async def test_set_scan_interval_via_platform(mock_track, hass):
     """Test the setting of the scan interval via platform."""
 
@@ -169,7 +169,9 @@ async def test_set_scan_interval_via_platform(mock_track, hass):
 
     await hass.async_block_till_done()
     assert mock_track.called
-    assert timedelta(seconds=30) == mock_track.call_args[0][2]
+    # All entities are polled together at the end of the first scan interval
+    first_poll = mock_track.call_args[0][2] - dt_util.utcnow()
+    assert timedelta(seconds=29) < first_poll <= timedelta(seconds=30)
 
 
 async def test_adding_entities_with_generator_and_thread_callback(hass):
@@ -1131,3 +1133,97 @@ class SlowEntity(MockEntity):
         """Make sure control is returned to the event loop on add."""
         await asyncio.sleep(0.1)
         await super().async_added_to_hass()
+
+
+async def test_polling_backs_off_failing_and_slow_entities(hass):
+    """Test entities that keep failing or are still updating are skipped."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    fail_ent = MockEntity(should_poll=True)
+    fail_ent.async_update = AsyncMock(side_effect=AssertionError("Fake error"))
+    slow_ent = MockEntity(should_poll=True)
+    slow_ent.async_update = AsyncMock()
+    ok_ent = MockEntity(should_poll=True)
+    ok_ent.async_update = AsyncMock()
+
+    await component.async_add_entities([fail_ent, slow_ent, ok_ent])
+    platform = component._platforms[DOMAIN]
+
+    # The update of slow_ent is still running
+    slow_ent._update_staged = True
+
+    now = dt_util.utcnow()
+    polled = []
+    overrun = []
+    for interval in range(1, 10):
+        async_fire_time_changed(hass, now + timedelta(seconds=20 * interval))
+        await hass.async_block_till_done()
+        polled.append(fail_ent.async_update.call_count)
+        overrun.append(platform.polling_stats.overruns)
+
+    # Polled every interval until it failed three times in a row,
+    # then every 2nd and then every 4th interval
+    assert polled == [1, 2, 3, 3, 4, 4, 4, 4, 5]
+    # Overruns back off the same way
+    assert overrun == [1, 2, 3, 3, 4, 4, 4, 4, 5]
+    assert slow_ent.async_update.call_count == 0
+    assert ok_ent.async_update.call_count == 9
+
+    stats = platform.polling_stats.as_dict()
+    # The first interval polls all slots together, then the slots of
+    # ok_ent and fail_ent are polled on their own
+    assert stats["intervals"] == 1 + 8 + 4
+    assert stats["polls"] == 9 + 5
+    assert stats["failures"] == 5
+    assert stats["overruns"] == 5
+    assert stats["backoffs"] == 4 + 4
+    assert stats["max_latency"] >= stats["mean_latency"] > 0
+
+    # The update finished, the entity is polled again after 7 more intervals
+    slow_ent._update_staged = False
+    polled = []
+    for interval in range(10, 18):
+        async_fire_time_changed(hass, now + timedelta(seconds=20 * interval))
+        await hass.async_block_till_done()
+        polled.append(slow_ent.async_update.call_count)
+    assert polled == [0, 0, 0, 0, 0, 0, 0, 1]
+
+
+async def test_polling_spreads_entities_over_the_scan_interval(hass):
+    """Test the entities of a platform are polled in slots over the interval."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    slots = entity_platform.POLL_SLOTS
+    entities = [MockEntity(should_poll=True) for _ in range(slots)]
+    for entity in entities:
+        entity.async_update = AsyncMock()
+
+    await component.async_add_entities(entities)
+    platform = component._platforms[DOMAIN]
+    now = dt_util.utcnow()
+
+    def call_counts():
+        return [entity.async_update.call_count for entity in entities]
+
+    # All entities are polled at the end of the first scan interval
+    async_fire_time_changed(hass, now + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert call_counts() == [1] * slots
+
+    # Then each slot is polled at its own phase in the interval
+    half = slots // 2
+    async_fire_time_changed(
+        hass, now + timedelta(seconds=20 * (2 - platform._poll_phase(half)))
+    )
+    await hass.async_block_till_done()
+    assert call_counts() == [1] * half + [2] * (slots - half)
+
+    # Every entity is polled once in each scan interval
+    async_fire_time_changed(hass, now + timedelta(seconds=40))
+    await hass.async_block_till_done()
+    assert call_counts() == [2] * slots
+
+    platform.async_unsub_polling()
+    async_fire_time_changed(hass, now + timedelta(seconds=60))
+    await hass.async_block_till_done()
+    assert call_counts() == [2] * slots
@@ -198,6 +198,14 @@ async def test_loading_saving_data(hass, registry):
     assert new_entry2.original_name == "Original Name"
     assert new_entry2.original_icon == "hass:original-icon"
 
+    assert er.async_entries_for_device(
+        registry2, "mock-dev-id", include_disabled_entities=True
+    ) == [new_entry2]
+    assert er.async_entries_for_area(registry2, "mock-area-id") == [new_entry2]
+    assert er.async_entries_for_config_entry(registry2, mock_config.entry_id) == [
+        new_entry2
+    ]
+
 
 def test_generate_entity_considers_registered_entities(registry):
     """Test that we don't create entity id that are already registered."""
@@ -352,6 +360,50 @@ async def test_removing_area_id(registry):
     assert entry_w_area != entry_wo_area
 
 
+async def test_entries_index(registry):
+    """Test the entries by device, area and config entry follow the updates."""
+    mock_config = MockConfigEntry(domain="light", entry_id="mock-id-1")
+    entry1 = registry.async_get_or_create(
+        "light",
+        "hue",
+        "1234",
+        config_entry=mock_config,
+        device_id="mock-dev-id",
+        area_id="mock-area-id",
+    )
+    entry2 = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=mock_config, device_id="mock-dev-id"
+    )
+
+    assert er.async_entries_for_device(registry, "mock-dev-id") == [entry1, entry2]
+    assert er.async_entries_for_area(registry, "mock-area-id") == [entry1]
+    assert er.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry1,
+        entry2,
+    ]
+
+    entry1 = registry.async_update_entity(entry1.entity_id, area_id="other-area-id")
+    entry2 = registry.async_update_entity(
+        entry2.entity_id, new_entity_id="light.renamed"
+    )
+
+    assert er.async_entries_for_area(registry, "mock-area-id") == []
+    assert er.async_entries_for_area(registry, "other-area-id") == [entry1]
+    assert er.async_entries_for_device(registry, "mock-dev-id") == [entry1, entry2]
+    assert registry._entries_index.area_id.keys() == {"other-area-id"}
+
+    registry.async_remove(entry1.entity_id)
+
+    assert er.async_entries_for_area(registry, "other-area-id") == []
+    assert er.async_entries_for_device(registry, "mock-dev-id") == [entry2]
+    assert er.async_entries_for_config_entry(registry, "mock-id-1") == [entry2]
+
+    registry.async_clear_config_entry("mock-id-1")
+
+    assert er.async_entries_for_device(registry, "mock-dev-id") == []
+    assert registry._entries_index == ({}, {}, {})
+
+
 @pytest.mark.parametrize("load_registries", [False])
 async def test_migration(hass):
     """Test migration from old data to new."""
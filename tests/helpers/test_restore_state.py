@@ -375,3 +375,40 @@ async def test_restoring_invalid_entity_id(hass, hass_storage):
 
     state = await entity.async_get_last_state()
     assert state is None
+
+
+async def test_dump_keeps_last_seen_of_unchanged_states(hass):
+    """Test unchanged states keep their last_seen until it is refreshed."""
+    states = [State("input_boolean.b1", "on"), State("input_boolean.b2", "on")]
+    for state in states:
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = state.entity_id
+        await entity.async_internal_added_to_hass()
+
+    data = await RestoreStateData.async_get_instance(hass)
+    now = dt_util.utcnow()
+    with patch.object(hass.states, "async_all", return_value=states), patch(
+        "homeassistant.helpers.restore_state.dt_util.utcnow", return_value=now
+    ):
+        first_dump = data.async_get_stored_states()
+
+    states[1] = State("input_boolean.b2", "off")
+    with patch.object(hass.states, "async_all", return_value=states), patch(
+        "homeassistant.helpers.restore_state.dt_util.utcnow",
+        return_value=now + timedelta(minutes=15),
+    ):
+        second_dump = data.async_get_stored_states()
+
+    assert second_dump[0] is first_dump[0]
+    assert second_dump[0].last_seen == now
+    assert second_dump[1].last_seen == now + timedelta(minutes=15)
+
+    with patch.object(hass.states, "async_all", return_value=states), patch(
+        "homeassistant.helpers.restore_state.dt_util.utcnow",
+        return_value=now + timedelta(hours=1, minutes=1),
+    ):
+        third_dump = data.async_get_stored_states()
+
+    assert third_dump[0].last_seen == now + timedelta(hours=1, minutes=1)
+    assert third_dump[1] is second_dump[1]
@@ -2,6 +2,8 @@
 import asyncio
 from datetime import timedelta
 import json
+from operator import itemgetter
+import os
 from unittest.mock import Mock, patch
 
 import pytest
@@ -12,6 +14,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import CoreState
 from homeassistant.helpers import storage
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt
 
 from tests.common import async_fire_time_changed
@@ -20,6 +23,12 @@ MOCK_VERSION = 1
 MOCK_KEY = "storage-test"
 MOCK_DATA = {"hello": "world"}
 MOCK_DATA2 = {"goodbye": "cruel world"}
+MOCK_ITEMS = [{"id": str(idx), "value": idx} for idx in range(20)]
+
+# The hass fixture mocks writing and loading
+_write_data = storage.Store._write_data
+_async_load = storage.Store._async_load
+_async_remove = storage.Store.async_remove
 
 
 @pytest.fixture
@@ -279,3 +288,184 @@ async def test_migrator_transforming_config(hass, store, hass_storage):
         "version": MOCK_VERSION,
         "data": data,
     }
+
+
+@pytest.fixture
+def journal_store(hass, tmp_path):
+    """Fixture of a journaled store writing to files."""
+    hass.config.config_dir = str(tmp_path)
+    with patch.object(storage.Store, "_write_data", _write_data), patch.object(
+        storage.Store, "_async_load", _async_load
+    ), patch.object(storage.Store, "async_remove", _async_remove):
+        yield storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal_key=itemgetter("id"))
+
+
+async def _async_load_fresh(store):
+    """Load the files with a new store."""
+    return await storage.Store(
+        store.hass, MOCK_VERSION, MOCK_KEY, journal_key=itemgetter("id")
+    ).async_load()
+
+
+def _read_journal(store):
+    """Return the records of the journal."""
+    with open(store.journal_path) as fdesc:
+        return [json.loads(line) for line in fdesc]
+
+
+async def test_journal_appends_changes(hass, journal_store):
+    """Test a journaled store only appends the changed items."""
+    await journal_store.async_save({"items": MOCK_ITEMS, "other": 1})
+    snapshot = json.loads(open(journal_store.path).read())
+    assert snapshot["data"] == {"items": MOCK_ITEMS, "other": 1}
+    assert snapshot["journal"]
+
+    items = [*MOCK_ITEMS[1:5], {"id": "5", "value": "new"}, *MOCK_ITEMS[6:]]
+    items.append({"id": "20", "value": 20})
+    await journal_store.async_save({"items": items, "other": 2})
+
+    assert json.loads(open(journal_store.path).read()) == snapshot
+    assert _read_journal(journal_store) == [
+        {
+            "journal": snapshot["journal"],
+            "changes": [
+                ["items", "5", {"id": "5", "value": "new"}],
+                ["items", "20", {"id": "20", "value": 20}],
+                ["other", None, 2],
+                ["items", "0"],
+            ],
+        }
+    ]
+
+    # Nothing is written without changes
+    await journal_store.async_save({"items": items, "other": 2})
+    assert len(_read_journal(journal_store)) == 1
+
+    # Loading compacts the journal into the file
+    assert await _async_load_fresh(journal_store) == {"items": items, "other": 2}
+    assert not os.path.exists(journal_store.journal_path)
+    snapshot = json.loads(open(journal_store.path).read())
+    assert snapshot["data"] == {"items": items, "other": 2}
+
+
+async def test_journal_unchanged_after_restart(hass, tmp_path):
+    """Test data that serializes the same is not written again after a restart."""
+    hass.config.config_dir = str(tmp_path)
+    items = [
+        {"id": "1", "time": dt.utcnow(), "pair": ("a", "b")},
+        {"id": "2", "time": dt.utcnow(), "pair": ("c", "d")},
+    ]
+    with patch.object(storage.Store, "_write_data", _write_data), patch.object(
+        storage.Store, "_async_load", _async_load
+    ):
+        store = storage.Store(
+            hass,
+            MOCK_VERSION,
+            MOCK_KEY,
+            encoder=JSONEncoder,
+            journal_key=itemgetter("id"),
+        )
+        await store.async_save(items)
+        snapshot = open(store.path).read()
+
+        store = storage.Store(
+            hass,
+            MOCK_VERSION,
+            MOCK_KEY,
+            encoder=JSONEncoder,
+            journal_key=itemgetter("id"),
+        )
+        await store.async_load()
+        await store.async_save(items)
+        assert not os.path.exists(store.journal_path)
+        assert open(store.path).read() == snapshot
+
+        await store.async_save([items[0], {**items[1], "pair": ("c", "e")}])
+        assert _read_journal(store)[0]["changes"] == [
+            [
+                None,
+                "2",
+                {
+                    **json.loads(json.dumps(items[1], cls=JSONEncoder)),
+                    "pair": ["c", "e"],
+                },
+            ]
+        ]
+
+
+async def test_journal_list_data(hass, tmp_path):
+    """Test journaling a list of items."""
+    hass.config.config_dir = str(tmp_path)
+    with patch.object(storage.Store, "_write_data", _write_data), patch.object(
+        storage.Store, "_async_load", _async_load
+    ):
+        store = storage.Store(
+            hass, MOCK_VERSION, MOCK_KEY, journal_key=itemgetter("id")
+        )
+        await store.async_save(MOCK_ITEMS)
+        await store.async_save(MOCK_ITEMS[:-1])
+        assert _read_journal(store)[0]["changes"] == [[None, "19"]]
+        assert await _async_load_fresh(store) == MOCK_ITEMS[:-1]
+
+
+async def test_journal_compaction(hass, journal_store):
+    """Test the journal is compacted when it grows large and on the final write."""
+    await journal_store.async_save({"items": MOCK_ITEMS})
+    journal_id = json.loads(open(journal_store.path).read())["journal"]
+
+    for value in range(30):
+        items = [{"id": "0", "value": value}, *MOCK_ITEMS[1:]]
+        await journal_store.async_save({"items": items})
+    snapshot = json.loads(open(journal_store.path).read())
+    assert snapshot["journal"] != journal_id
+    assert snapshot["data"]["items"][0]["value"] < 29
+    assert await _async_load_fresh(journal_store) == {"items": items}
+
+    # The layout of the data changed
+    await journal_store.async_save({"items": items, "other": []})
+    assert not os.path.exists(journal_store.journal_path)
+
+    await journal_store.async_save({"items": MOCK_ITEMS, "other": []})
+    assert os.path.exists(journal_store.journal_path)
+
+    hass.state = CoreState.final_write
+    await journal_store.async_save({"items": items, "other": []})
+    assert not os.path.exists(journal_store.journal_path)
+    assert json.loads(open(journal_store.path).read())["data"] == {
+        "items": items,
+        "other": [],
+    }
+
+    # The final write compacts without a pending save
+    hass.state = CoreState.running
+    await journal_store.async_save({"items": MOCK_ITEMS, "other": []})
+    assert os.path.exists(journal_store.journal_path)
+    hass.state = CoreState.final_write
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert not os.path.exists(journal_store.journal_path)
+    assert json.loads(open(journal_store.path).read())["data"] == {
+        "items": MOCK_ITEMS,
+        "other": [],
+    }
+
+
+async def test_journal_interrupted(hass, journal_store, caplog):
+    """Test an incomplete journal record and a left over journal are ignored."""
+    await journal_store.async_save(MOCK_ITEMS)
+    await journal_store.async_save(MOCK_ITEMS[1:])
+    with open(journal_store.journal_path, "a") as fdesc:
+        fdesc.write('{"journal": "other", "changes": [[null, "1"]]}\n')
+        fdesc.write('{"journal": "')
+
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal_key=itemgetter("id"))
+    assert await store.async_load() == MOCK_ITEMS[1:]
+    assert "Ignoring the incomplete end of the journal" in caplog.text
+    assert not os.path.exists(store.journal_path)
+
+    await store.async_save(MOCK_ITEMS[2:])
+    assert await _async_load_fresh(store) == MOCK_ITEMS[2:]
+
+    await store.async_remove()
+    assert not os.path.exists(store.path)
+    assert await _async_load_fresh(store) is None
@@ -1,5 +1,6 @@
 """Test Home Assistant template helper methods."""
 from datetime import datetime
+import marshal
 import math
 import random
 from unittest.mock import patch
@@ -11,6 +12,7 @@ from homeassistant.components import group
 from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
     LENGTH_METERS,
     MASS_GRAMS,
     PRESSURE_PA,
@@ -2315,35 +2317,113 @@ def test_urlencode(hass):
     assert tpl.async_render() == "the%20quick%20brown%20fox%20%3D%20true"
 
 
-async def test_cache_garbage_collection():
-    """Test caching a template."""
+async def test_cache_eviction():
+    """Test compiled templates are kept until the cache is full."""
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
-    tpl = template.Template(
-        (template_string),
-    )
+    tpl = template.Template(template_string)
     tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    code = template._NO_HASS_ENV.template_cache.get(template_string)
+    assert code is not None
 
-    tpl2 = template.Template(
-        (template_string),
-    )
+    # The compiled template outlives the template
+    del tpl
+    tpl2 = template.Template(template_string)
     tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    assert tpl2._compiled_code is code
 
-    del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
-    del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    for idx in range(template.TEMPLATE_CACHE_SIZE):
+        template.Template(f"{{{{ {idx} }}}}").ensure_valid()
+    assert not template._NO_HASS_ENV.template_cache.get(template_string)
+    assert len(template._NO_HASS_ENV.template_cache) == template.TEMPLATE_CACHE_SIZE
+
+
+async def test_code_cache(hass, tmp_path):
+    """Test the generated code of templates is kept between restarts."""
+    hass.config.config_dir = str(tmp_path)
+    template_string = "{{ states('sensor.test') | int + 1 }}"
+
+    await template.async_load_code_cache(hass)
+    tpl = template.Template(template_string, hass)
+    tpl.ensure_valid()
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert (tmp_path / ".storage" / template.CODE_CACHE_FILE).exists()
+
+    # Simulate a restart
+    hass.data.pop("template.environment")
+    await template.async_load_code_cache(hass)
+    with patch(
+        "jinja2.sandbox.ImmutableSandboxedEnvironment.compile",
+        side_effect=AssertionError("Template compiled"),
+    ):
+        tpl = template.Template(template_string, hass)
+        hass.states.async_set("sensor.test", "41")
+        assert tpl.async_render() == 42
+
+    # The generated code depends on the available filters
+    hass.data.pop("template.environment")
+    with patch.object(template.TemplateEnvironment, "fingerprint", "other"):
+        template.Template(template_string, hass).ensure_valid()
+    assert ("other", template_string) in hass.data["template.code_cache"]._used
+
+
+async def test_code_cache_bounded(hass, tmp_path):
+    """Test only the most recently used generated code is kept."""
+    hass.config.config_dir = str(tmp_path)
+    await template.async_load_code_cache(hass)
+    code_cache = hass.data["template.code_cache"]
+    code = compile("1", "<template>", "eval")
+
+    for idx in range(template.TEMPLATE_CACHE_SIZE + 1):
+        code_cache.set("x", str(idx), code)
+    assert code_cache.get("x", "0") is None
+    assert code_cache.get("x", "1") is code
+    code_cache.set("x", "new", code)
+    assert code_cache.get("x", "1") is code
+    assert code_cache.get("x", "2") is None
+
+    await hass.async_add_executor_job(code_cache.save)
+    path = tmp_path / ".storage" / template.CODE_CACHE_FILE
+    _, codes = marshal.loads(path.read_bytes())
+    assert len(codes) == template.TEMPLATE_CACHE_SIZE
+
+
+async def test_code_cache_limited_and_normal(hass, tmp_path):
+    """Test limited and normal environments do not share their generated code."""
+    hass.config.config_dir = str(tmp_path)
+    await template.async_load_code_cache(hass)
+    hass.states.async_set("sensor.test", "on")
+    template_string = "{{ ['sensor.test'] | expand | map(attribute='state') | list }}"
+
+    limited_env = template.TemplateEnvironment(hass, limited=True)
+    with pytest.raises(TemplateError):
+        limited_env.from_string(template_string).render()
+    normal_env = template.TemplateEnvironment(hass)
+    assert normal_env.from_string(template_string).render() == "['on']"
+
+    assert limited_env.fingerprint != normal_env.fingerprint
+    strict_env = template.TemplateEnvironment(hass, strict=True)
+    assert strict_env.fingerprint not in (
+        limited_env.fingerprint,
+        normal_env.fingerprint,
+    )
+
+
+async def test_code_cache_other_version(hass, tmp_path):
+    """Test the code cache of another Jinja version is ignored."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / ".storage").mkdir()
+    path = tmp_path / ".storage" / template.CODE_CACHE_FILE
+    path.write_bytes(marshal.dumps((("0.0", b"\0\0\0\0"), {("x", "y"): None})))
+
+    await template.async_load_code_cache(hass)
+    assert hass.data["template.code_cache"].get("x", "y") is None
+
+    path.write_bytes(b"garbage")
+    await template.async_load_code_cache(hass)
+    assert hass.data["template.code_cache"].get("x", "y") is None
 
 
 def test_is_template_string():
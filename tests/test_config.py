@@ -1017,7 +1017,8 @@ async def test_component_config_exceptions(hass, caplog):
             {},
             integration=Mock(
                 domain="test_domain",
-                get_platform=Mock(
+                async_get_component=AsyncMock(),
+                async_get_platform=AsyncMock(
                     return_value=Mock(
                         async_validate_config=AsyncMock(
                             side_effect=ValueError("broken")
@@ -1039,8 +1040,8 @@ async def test_component_config_exceptions(hass, caplog):
             {},
             integration=Mock(
                 domain="test_domain",
-                get_platform=Mock(return_value=None),
-                get_component=Mock(
+                async_get_platform=AsyncMock(return_value=None),
+                async_get_component=AsyncMock(
                     return_value=Mock(
                         CONFIG_SCHEMA=Mock(side_effect=ValueError("broken"))
                     )
@@ -1060,8 +1061,8 @@ async def test_component_config_exceptions(hass, caplog):
             {"test_domain": {"platform": "test_platform"}},
             integration=Mock(
                 domain="test_domain",
-                get_platform=Mock(return_value=None),
-                get_component=Mock(
+                async_get_platform=AsyncMock(return_value=None),
+                async_get_component=AsyncMock(
                     return_value=Mock(
                         spec=["PLATFORM_SCHEMA_BASE"],
                         PLATFORM_SCHEMA_BASE=Mock(side_effect=ValueError("broken")),
@@ -1082,7 +1083,7 @@ async def test_component_config_exceptions(hass, caplog):
     with patch(
         "homeassistant.config.async_get_integration_with_requirements",
         return_value=Mock(  # integration that owns platform
-            get_platform=Mock(
+            async_get_platform=AsyncMock(
                 return_value=Mock(  # platform
                     PLATFORM_SCHEMA=Mock(side_effect=ValueError("broken"))
                 )
@@ -1095,8 +1096,8 @@ async def test_component_config_exceptions(hass, caplog):
                 {"test_domain": {"platform": "test_platform"}},
                 integration=Mock(
                     domain="test_domain",
-                    get_platform=Mock(return_value=None),
-                    get_component=Mock(
+                    async_get_platform=AsyncMock(return_value=None),
+                    async_get_component=AsyncMock(
                         return_value=Mock(spec=["PLATFORM_SCHEMA_BASE"])
                     ),
                 ),
@@ -1118,7 +1119,8 @@ async def test_component_config_exceptions(hass, caplog):
             integration=Mock(
                 pkg_path="homeassistant.components.test_domain",
                 domain="test_domain",
-                get_platform=Mock(
+                async_get_component=AsyncMock(),
+                async_get_platform=AsyncMock(
                     side_effect=ImportError(
                         "ModuleNotFoundError: No module named 'not_installed_something'",
                         name="not_installed_something",
@@ -1142,7 +1144,7 @@ async def test_component_config_exceptions(hass, caplog):
             integration=Mock(
                 pkg_path="homeassistant.components.test_domain",
                 domain="test_domain",
-                get_component=Mock(
+                async_get_component=AsyncMock(
                     side_effect=FileNotFoundError(
                         "No such file or directory: b'liblibc.a'"
                     )
@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -383,6 +384,56 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_json():
+    """Test a State as JSON."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog", "weight": 1.5},
+        last_updated=last_time,
+        last_changed=last_time,
+    )
+    assert json.loads(state.as_json()) == state.as_dict()
+    assert json.loads(state.attributes_json()) == {"pig": "dog", "weight": 1.5}
+    # 2nd time to verify cache
+    assert state.as_json() is state.as_json()
+
+
+def test_state_as_json_not_allows_nan():
+    """Test a State with NaN attributes is not serialized and not cached."""
+    state = ha.State("happy.happy", "on", {"weight": float("nan")})
+    with pytest.raises(ValueError):
+        state.as_json()
+    with pytest.raises(ValueError):
+        state.as_json()
+
+
+def test_event_as_json():
+    """Test an Event as JSON reuses the JSON of the states in the data."""
+    old_state = ha.State("light.kitchen", "off")
+    new_state = ha.State("light.kitchen", "on", {"brightness": 144})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "light.kitchen", "old_state": old_state, "new_state": new_state},
+    )
+    expected = {
+        **event.as_dict(),
+        "data": {
+            "entity_id": "light.kitchen",
+            "old_state": old_state.as_dict(),
+            "new_state": new_state.as_dict(),
+        },
+    }
+    assert json.loads(event.as_json()) == expected
+    assert new_state.as_json() in event.as_json()
+    # 2nd time to verify cache
+    assert event.as_json() is event.as_json()
+
+    event = ha.Event("some_type", {"some": "attr"})
+    assert json.loads(event.as_json()) == event.as_dict()
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -431,6 +482,116 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_data_filtered_listener(hass):
+    """Test we can prefilter events on a value of the event data."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    old_count = len(hass.bus.async_listeners())
+    unsub = hass.bus.async_listen(
+        "test",
+        listener,
+        event_filter=ha.EventDataFilter("entity_id", {"light.kitchen", "light.bed"}),
+    )
+    assert hass.bus.async_listeners()["test"] == 1
+
+    hass.bus.async_fire("test", {"entity_id": "light.hall"})
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("test", {"entity_id": {"unhashable": True}})
+    hass.bus.async_fire("other", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire(
+        "test", {"entity_id": ["light.hall", "light.bed", "light.kitchen"]}
+    )
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    unsub()
+    assert len(hass.bus.async_listeners()) == old_count
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
+async def test_eventbus_data_filtered_match_all_listener(hass):
+    """Test data filters with MATCH_ALL and mixed with other listeners."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.event_type)
+
+    unsub_all = hass.bus.async_listen(
+        MATCH_ALL, listener, event_filter=ha.EventDataFilter("domain", "light")
+    )
+    unsub_test = hass.bus.async_listen("test", listener)
+
+    hass.bus.async_fire("test", {"domain": "light"})
+    hass.bus.async_fire("test", {"domain": "switch"})
+    hass.bus.async_fire("other", {"domain": "light"})
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE, {"domain": "light"})
+    await hass.async_block_till_done()
+
+    assert sorted(calls) == ["other", "test", "test", "test"]
+
+    unsub_all()
+    unsub_test()
+
+
+async def test_eventbus_data_filtered_listener_order(hass):
+    """Test listeners with data filters run in the order of registration."""
+    calls = []
+
+    def make_listener(name):
+        """Make a mock listener."""
+
+        @ha.callback
+        def listener(event):
+            """Mock listener."""
+            calls.append(name)
+
+        return listener
+
+    hass.bus.async_listen("test", make_listener("plain"))
+    hass.bus.async_listen(
+        "test",
+        make_listener("entity"),
+        event_filter=ha.EventDataFilter("entity_id", ["light.hall", "light.bed"]),
+    )
+    hass.bus.async_listen(
+        "test",
+        make_listener("filtered"),
+        event_filter=ha.callback(lambda event: True),
+    )
+    hass.bus.async_listen(
+        "test",
+        make_listener("domain"),
+        event_filter=ha.EventDataFilter("domain", "light"),
+    )
+    hass.bus.async_listen(MATCH_ALL, make_listener("all"))
+    hass.bus.async_listen(
+        MATCH_ALL,
+        make_listener("all_entity"),
+        event_filter=ha.EventDataFilter("entity_id", "light.hall"),
+    )
+
+    hass.bus.async_fire(
+        "test", {"entity_id": ["light.hall", "light.bed"], "domain": "light"}
+    )
+    await hass.async_block_till_done()
+
+    assert calls == ["all", "all_entity", "plain", "entity", "filtered", "domain"]
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -728,6 +889,46 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_shares_unchanged_attributes(hass):
+    """Test the attributes are shared with the previous state."""
+    hass.states.async_set("light.bowl", "on", {"options": ["a", "b"], "size": 1})
+    old_state = hass.states.get("light.bowl")
+    old_state.attributes_json()
+
+    hass.states.async_set("light.bowl", "off", {"options": ["a", "b"], "size": 1})
+    state = hass.states.get("light.bowl")
+    assert state.attributes is old_state.attributes
+    assert state.attributes_json() is old_state.attributes_json()
+
+    hass.states.async_set("light.bowl", "on", {"options": ["a", "b"], "size": 2})
+    new_state = hass.states.get("light.bowl")
+    assert new_state.attributes == {"options": ["a", "b"], "size": 2}
+    assert new_state.attributes["options"] is old_state.attributes["options"]
+    assert json.loads(new_state.attributes_json()) == {"options": ["a", "b"], "size": 2}
+
+
+async def test_statemachine_interns_attributes(hass):
+    """Test attribute keys and strings are shared between entities."""
+    name = "".join(["Bowl", " light"])
+    hass.states.async_set("light.bowl", "on", {"friendly_name": name})
+    name = "".join(["Bowl", " light"])
+    hass.states.async_set("light.bowl_2", "on", {"friendly_name": name})
+
+    assert (
+        hass.states.get("light.bowl").attributes["friendly_name"]
+        is hass.states.get("light.bowl_2").attributes["friendly_name"]
+    )
+
+
+async def test_statemachine_copies_attributes(hass):
+    """Test changing the attributes after setting them does not change the state."""
+    attributes = {"size": 1}
+    hass.states.async_set("light.bowl", "on", attributes)
+    attributes["size"] = 2
+
+    assert hass.states.get("light.bowl").attributes == {"size": 1}
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1098,6 +1299,62 @@ def test_create_timer(mock_monotonic, loop):
     assert event_data[ATTR_NOW] == datetime(2018, 12, 31, 3, 4, 6, 100000)
 
 
+@patch("homeassistant.core.monotonic")
+def test_timer_skips_time_changed_without_listeners(mock_monotonic, loop):
+    """Test the timer only fires time changed events if someone listens."""
+    hass = MagicMock()
+    hass.bus.async_has_listeners.return_value = False
+    funcs = []
+    orig_callback = ha.callback
+
+    def mock_callback(func):
+        funcs.append(func)
+        return orig_callback(func)
+
+    mock_monotonic.side_effect = 10.2, 10.8, 11.3
+
+    with patch.object(ha, "callback", mock_callback), patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 5, 333333),
+    ):
+        ha._async_create_timer(hass)
+
+    delay, callback, target = hass.loop.call_later.mock_calls[0][1]
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 6, 100000),
+    ):
+        callback(target)
+
+    hass.bus.async_has_listeners.assert_called_once_with(EVENT_TIME_CHANGED)
+    assert len(hass.bus.async_fire.mock_calls) == 0
+    assert len(hass.loop.call_later.mock_calls) == 2
+
+
+async def test_eventbus_has_listeners(hass):
+    """Test checking for listeners of a specific event type."""
+    assert not hass.bus.async_has_listeners("test_event")
+
+    unsub_match_all = hass.bus.async_listen(MATCH_ALL, ha.callback(lambda _: None))
+    assert not hass.bus.async_has_listeners("test_event")
+
+    unsub = hass.bus.async_listen("test_event", ha.callback(lambda _: None))
+    assert hass.bus.async_has_listeners("test_event")
+    unsub()
+    assert not hass.bus.async_has_listeners("test_event")
+
+    unsub = hass.bus.async_listen(
+        "test_event",
+        ha.callback(lambda _: None),
+        event_filter=ha.EventDataFilter("key", "value"),
+    )
+    assert hass.bus.async_has_listeners("test_event")
+    unsub()
+    assert not hass.bus.async_has_listeners("test_event")
+    unsub_match_all()
+
+
 @patch("homeassistant.core.monotonic")
 def test_timer_out_of_sync(mock_monotonic, loop):
     """Test create timer."""
@@ -160,6 +160,22 @@ async def test_get_integration(hass):
     assert hue_light == integration.get_platform("light")
 
 
+async def test_get_integration_in_executor(hass):
+    """Test importing an integration and its platforms in the executor."""
+    integration = await loader.async_get_integration(hass, "hue")
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_executor:
+        assert await integration.async_get_component() is hue
+        assert await integration.async_get_platform("light") is hue_light
+        assert await integration.async_get_component() is hue
+        assert await integration.async_get_platform("light") is hue_light
+
+    # Modules are imported once and found in the cache after that
+    assert len(mock_executor.mock_calls) == 2
+    assert set(hass.data[loader.DATA_IMPORT_TIME]) == {"hue", "hue.light"}
+
+
 async def test_get_integration_legacy(hass, enable_custom_integrations):
     """Test resolving integration."""
     integration = await loader.async_get_integration(hass, "test_embedded")
@@ -9,7 +9,7 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 import voluptuous as vol
 
-from homeassistant import config_entries, setup
+from homeassistant import config_entries, loader, setup
 import homeassistant.config as config_util
 from homeassistant.const import EVENT_COMPONENT_LOADED, EVENT_HOMEASSISTANT_START
 from homeassistant.core import callback
@@ -708,3 +708,29 @@ async def test_async_start_setup_platforms(hass):
     assert "august" not in hass.data[setup.DATA_SETUP_STARTED]
     assert isinstance(hass.data[setup.DATA_SETUP_TIME]["august"], datetime.timedelta)
     assert "sensor" not in hass.data[setup.DATA_SETUP_TIME]
+
+
+async def test_async_get_startup_timeline(hass):
+    """Test the import and setup times are combined per integration."""
+    hass.data[loader.DATA_IMPORT_TIME] = {"august": 0.5, "august.sensor": 0.25}
+    hass.data[setup.DATA_SETUP_TIME] = {
+        "august": datetime.timedelta(seconds=1),
+        "hue": datetime.timedelta(seconds=2),
+    }
+
+    timeline = setup.async_get_startup_timeline(hass)
+
+    assert timeline == {
+        "hue": {"import": 0, "setup": 2},
+        "august": {"import": 0.75, "setup": 1},
+    }
+    assert list(timeline) == ["hue", "august"]
+
+
+async def test_setup_integration_imported_in_event_loop(
+    hass, enable_custom_integrations
+):
+    """Test an integration failing to import in the executor is imported in the loop."""
+    assert await setup.async_setup_component(hass, "test_loop_import", {})
+    assert "test_loop_import" in hass.config.components
+    assert "test_loop_import" in hass.data[loader.DATA_IMPORT_TIME]
@@ -0,0 +1,13 @@
+"""Provide a mock component that can only be imported in the event loop."""
+import asyncio
+
+# Fails outside the event loop, like asyncio primitives created at
+# import time before Python 3.10
+asyncio.get_running_loop()
+
+DOMAIN = "test_loop_import"
+
+
+async def async_setup(hass, config):
+    """Mock a successful setup."""
+    return True
@@ -1,21 +1,24 @@
 """Test Home Assistant json utility functions."""
-from datetime import datetime
+from datetime import datetime, timezone
 from functools import partial
-from json import JSONEncoder, dumps
+from json import JSONEncoder, dumps, loads
 import math
 import os
 import sys
 from tempfile import mkdtemp
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import JSONEncoder as HAJSONEncoder
 from homeassistant.util.json import (
     SerializationError,
     find_paths_unserializable_data,
+    json_dumps,
+    json_loads,
     load_json,
     save_json,
 )
@@ -178,3 +181,74 @@ def test_find_unserializable_data():
         )
         == {"$(BadData).bla": bad_data}
     )
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request):
+    """Run the test with and without orjson."""
+    if request.param == "orjson":
+        yield
+        return
+    with patch("homeassistant.util.json.orjson", None):
+        yield
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"a": 1, "b": [1.5, "two", None, True]},
+        {"unicode": "\u00fc\u20ac", "escape": '"\\\n'},
+        {1: "int key", None: "none key"},
+        {"big": 2 ** 70},
+        {"nan": float("nan"), "inf": math.inf},
+        {
+            "datetime": datetime(2021, 7, 1, 12, 30, 5, 123, tzinfo=timezone.utc),
+            "set": {1},
+            "state": State("light.kitchen", "on"),
+        },
+    ],
+)
+def test_json_dumps(json_backend, data):
+    """Test json_dumps decodes to the same data as json.dumps."""
+    assert loads(json_dumps(data, encoder=HAJSONEncoder)) == loads(
+        dumps(data, cls=HAJSONEncoder)
+    )
+
+
+@pytest.mark.parametrize("fragment", [True, False])
+def test_json_dumps_states_with_orjson(fragment):
+    """Test json_dumps serializes states and events with orjson."""
+    state = State("light.kitchen", "on", {"brightness": 255})
+    event = Event("test_event", {"state": state})
+    with patch("homeassistant.util.json.ORJSON_FRAGMENT", fragment), patch(
+        "homeassistant.util.json.json.dumps", side_effect=AssertionError
+    ):
+        dumped = json_dumps({"state": state, "events": [event]})
+    assert loads(dumped) == {
+        "state": loads(state.as_json()),
+        "events": [loads(event.as_json())],
+    }
+
+
+def test_json_dumps_errors(json_backend):
+    """Test json_dumps raises the same errors as json.dumps."""
+    with pytest.raises(ValueError):
+        json_dumps({"nan": float("nan")}, allow_nan=False)
+    with pytest.raises(ValueError):
+        json_dumps([{"inf": [math.inf]}], allow_nan=False)
+    with pytest.raises(TypeError):
+        json_dumps({"object": object()}, encoder=HAJSONEncoder)
+    with pytest.raises(TypeError):
+        json_dumps({"datetime": datetime(2021, 7, 1)})
+
+
+def test_json_loads(json_backend):
+    """Test json_loads parses what json.loads parses."""
+    assert json_loads('{"a": [1, 2.5, "\\u00fc", null]}') == {
+        "a": [1, 2.5, "\u00fc", None]
+    }
+    assert json_loads(b'{"a": 1}') == {"a": 1}
+    nan = json_loads('{"a": NaN}')["a"]
+    assert math.isnan(nan)
+    with pytest.raises(ValueError):
+        json_loads(TEST_BAD_SERIALIED)
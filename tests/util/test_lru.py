@@ -0,0 +1,37 @@
+"""Test Home Assistant LRU utility."""
+from homeassistant.util.lru import LRU
+
+
+def test_lru_evicts_least_recently_used():
+    """Test the oldest key is dropped once the LRU is full."""
+    lru = LRU(2)
+    lru["a"] = 1
+    lru["b"] = 2
+    assert lru["a"] == 1
+
+    lru["c"] = 3
+    assert list(lru) == ["a", "c"]
+    assert "b" not in lru
+
+
+def test_lru_get_marks_recently_used():
+    """Test get refreshes a key and returns the default when missing."""
+    lru = LRU(2)
+    lru["a"] = 1
+    lru["b"] = 2
+    assert lru.get("a") == 1
+    assert lru.get("missing") is None
+    assert lru.get("missing", 5) == 5
+
+    lru["c"] = 3
+    assert list(lru) == ["a", "c"]
+
+
+def test_lru_overwrite_does_not_grow():
+    """Test overwriting a key keeps the size bounded."""
+    lru = LRU(2)
+    lru["a"] = 1
+    lru["a"] = 2
+    lru["b"] = 3
+    assert len(lru) == 2
+    assert lru["a"] == 2